@@ -5,3 +5,7 @@ app = Flask(__name__)
 app.config.from_object(Config)
 
 from app import routes
+
+if app.config['WARM_UP']:
+    from app.views import warm_up
+    warm_up()
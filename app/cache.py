@@ -0,0 +1,138 @@
+""" Bounded LRU cache of solutions keyed by the canonical form of the puzzles. """
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from .codec import PayloadError, parse, serialize
+from .solver.canonical import apply, canonical_form, restore
+
+
+class SolutionCache:
+    """ Class to cache solutions of puzzles, shared by every puzzle equivalent
+    under digit relabeling, row/column permutations within bands and transposition.
+    Solutions are stored in canonical form and mapped back through the inverse transform.
+    Misses are looked up in the on-disk solution store, if there is one, before solving.
+
+    Attributes
+    ----------
+    maxsize : int
+        Maximum number of cached solutions, 0 disables the cache.
+    ttl : float
+        Seconds after which a cached solution expires, 0 keeps them until evicted.
+    hits : int
+        Number of lookups served from the cache.
+    misses : int
+        Number of lookups not found in the cache.
+    entries : OrderedDict
+        Cached entries in least recently used first order.
+    store : SolutionStore or LazyStore
+        On-disk store of known 9x9 solutions, None if there is none.
+    clock : callable
+        Function returning the current time in seconds, time.monotonic by default.
+
+    Methods
+    -------
+    key(self, submitted, engine)
+        Returns the cache key and transform of a payload.
+    get(self, entry)
+        Returns the cached response for a key, mapped back to the payload.
+    put(self, entry, response)
+        Caches a solved response.
+    solve(self, submitted, engine, solver)
+        Returns the cached response or solves the payload and caches it.
+    stats(self)
+        Returns the cache size and counters.
+
+    """
+    def __init__(self, maxsize: int = 1024, ttl: float = 0, store=None, clock=monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.store = store
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.entries = OrderedDict()
+        self.lock = Lock()
+
+    def key(self, submitted: str, engine: str) -> tuple or None:
+        """ Method to compute the cache key of a payload.
+            Returns the key, the transform to the canonical form and the board size,
+            or None if the payload is not a well formed board. """
+        if not (self.maxsize or self.store) or not isinstance(submitted, str):
+            return None
+        try:
+            cells, size, box_size = parse(submitted)
+        except PayloadError:
+            return None
+        if size > 9:
+            return None
+        form, transform = canonical_form(list(cells), size, box_size)
+        return (engine, form), transform, size
+
+    def get(self, entry: tuple) -> dict or None:
+        """ Method to return the cached response for a key, with the solution mapped
+            back to the submitted board, or None on a miss.
+            Solutions found in the solution store are cached without solver statistics. """
+        key, transform, size = entry
+        with self.lock:
+            cached = self.entries.get(key)
+            if cached is not None and self.ttl and self.clock() - cached[0] > self.ttl:
+                del self.entries[key]
+                cached = None
+            if cached is None:
+                self.misses += 1
+            else:
+                self.entries.move_to_end(key)
+                self.hits += 1
+        if cached is None:
+            solution = self.store.get(key[1]) if self.store is not None and size == 9 else None
+            if solution is None:
+                return None
+            cached = (self.clock(), {"solved": solution, "iterations": 0, "passes": 0, "rules": {}})
+            self.insert(key, cached[1])
+        response = dict(cached[1])
+        response["solved"] = serialize(restore(response["solved"], size, transform))
+        return response
+
+    def put(self, entry: tuple, response: dict):
+        """ Method to cache a solved response, with the solution in canonical form.
+            Solver statistics are left out, they only describe the run that solved it. """
+        key, transform, size = entry
+        solution = list(parse(response["solved"])[0])
+        cached = {name: value for name, value in response.items()
+                  if name not in ("original", "debug")}
+        cached["solved"] = apply(solution, size, transform)
+        self.insert(key, cached)
+
+    def insert(self, key: tuple, cached: dict):
+        """ Method to add a response in canonical form, evicting the least recently used. """
+        with self.lock:
+            self.entries[key] = (self.clock(), cached)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def solve(self, submitted: str, engine: str, solver) -> tuple[dict, int]:
+        """ Method to return the cached response for a payload,
+            or solve it with the given solver and cache the result. """
+        entry = self.key(submitted, engine)
+        if entry is not None:
+            response = self.get(entry)
+            if response is not None:
+                return {"original": submitted, **response}, 200
+        response, status = solver(submitted, engine)
+        if entry is not None and status == 200:
+            self.put(entry, response)
+        return response, status
+
+    def stats(self) -> dict:
+        """ Method to return the cache size and counters. """
+        with self.lock:
+            stats = {
+                "size": len(self.entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+        stats["store"] = self.store.stats() if self.store is not None else None
+        return stats
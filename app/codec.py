@@ -0,0 +1,86 @@
+""" Single pass parsing, validation and serialization of board payloads.
+Boards are given as strings with one character per cell, 0 or . for blanks and
+base-36 digits for values above 9, or as lists of integers, flat or as rows. """
+from math import isqrt
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BLANKS = '0.'
+MAX_SIZE = 25
+INVALID = 255
+
+# Byte value of every character, INVALID for characters which are not cell values
+TABLE = bytes(DIGITS.index(chr(byte).lower()) if chr(byte).lower() in DIGITS[1:]
+              else 0 if chr(byte) in BLANKS else INVALID
+              for byte in range(256))
+
+
+class PayloadError(ValueError):
+    """ Exception raised for payloads which are not a well formed board. """
+
+
+def board_size(cells: int) -> tuple[int, int]:
+    """ Function to return the size and box size of a board with the given number of cells.
+        Raises PayloadError unless it is the square of a square, up to MAX_SIZE. """
+    size = isqrt(cells)
+    box_size = isqrt(size)
+    if not cells or size * size != cells or box_size * box_size != size or size > MAX_SIZE:
+        raise PayloadError("Invalid input length or non square board size.")
+    return size, box_size
+
+
+def parse(payload) -> tuple[bytearray, int, int]:
+    """ Function to parse and validate a payload in a single pass, before any Board is built.
+        Strings are mapped to cell values with one translate call, lists are checked item by item.
+        Raises PayloadError for malformed payloads.
+
+        Returns
+        -------
+        tuple[bytearray, int, int]
+            Row major cells, size and box size of the board.
+
+        """
+    if isinstance(payload, str):
+        size, box_size = board_size(len(payload))
+        if not payload.isascii():
+            raise PayloadError("Invalid characters in payload.")
+        cells = bytearray(payload.encode().translate(TABLE))
+    elif isinstance(payload, list):
+        if payload and all(isinstance(row, list) for row in payload):
+            payload = [number for row in payload for number in row]
+        size, box_size = board_size(len(payload))
+        if not all(type(number) is int and 0 <= number <= size  # pylint: disable=unidiomatic-typecheck
+                   for number in payload):
+            raise PayloadError("Invalid cell values in payload.")
+        cells = bytearray(payload)
+    else:
+        raise PayloadError("Payload must be a string or a list of integers.")
+    if max(cells) > size:
+        raise PayloadError("Invalid characters in payload.")
+    return cells, size, box_size
+
+
+def parse_marks(marks, size: int) -> list[int]:
+    """ Function to parse pencil marks, a list with the candidate values of every cell,
+        into candidate bitsets. An empty list leaves the candidates of a cell unrestricted.
+        Raises PayloadError for malformed marks. """
+    if not isinstance(marks, list) or len(marks) != size * size \
+            or not all(isinstance(values, list) for values in marks):
+        raise PayloadError("Pencil marks must be a list of candidate values for every cell.")
+    full = ((1 << (size + 1)) - 1) ^ 1
+    bitsets = []
+    for values in marks:
+        bits = 0
+        for number in values:
+            if type(number) is not int or not 1 <= number <= size:  # pylint: disable=unidiomatic-typecheck
+                raise PayloadError("Invalid candidate values in pencil marks.")
+            bits |= 1 << number
+        bitsets.append(bits or full)
+    return bitsets
+
+
+def serialize(cells, as_list: bool = False) -> str or list[int]:
+    """ Function to turn row major cells into a payload with one join,
+        a list of integers if as_list is set. """
+    if as_list:
+        return list(cells)
+    return ''.join(map(DIGITS.__getitem__, cells))
@@ -0,0 +1,315 @@
+""" Asynchronous solver jobs, run by local worker threads with a pluggable result store. """
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Lock
+from time import time
+from uuid import uuid4
+from .solver.budget import Budget, SearchCancelled
+
+FINISHED = ('done', 'failed', 'cancelled')
+
+
+class MemoryStore:
+    """ Class to keep jobs in a dictionary, they are lost on restart.
+
+    Methods
+    -------
+    save(self, job)
+        Stores a new job.
+    get(self, job_id)
+        Returns a job or None.
+    update(self, job_id, **fields)
+        Updates fields of a job.
+    delete(self, job_id)
+        Removes a job.
+    unfinished(self)
+        Returns the jobs which are queued or running.
+    purge(self, before)
+        Removes the finished jobs last updated before the given time.
+
+    """
+    def __init__(self):
+        self.jobs = {}
+        self.lock = Lock()
+
+    def save(self, job: dict):
+        """ Method to store a new job. """
+        with self.lock:
+            self.jobs[job["id"]] = dict(job)
+
+    def get(self, job_id: str) -> dict or None:
+        """ Method to return a copy of a job, or None if there is no such job. """
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def update(self, job_id: str, **fields):
+        """ Method to update fields of a job. """
+        with self.lock:
+            if job_id in self.jobs:
+                self.jobs[job_id].update(fields, updated=time())
+
+    def delete(self, job_id: str):
+        """ Method to remove a job. """
+        with self.lock:
+            self.jobs.pop(job_id, None)
+
+    def unfinished(self) -> list[dict]:
+        """ Method to return the jobs which are queued or running. """
+        with self.lock:
+            return [dict(job) for job in self.jobs.values() if job["status"] not in FINISHED]
+
+    def purge(self, before: float):
+        """ Method to remove the finished jobs last updated before the given time. """
+        with self.lock:
+            for job_id in [job_id for job_id, job in self.jobs.items()
+                           if job["status"] in FINISHED and job["updated"] < before]:
+                del self.jobs[job_id]
+
+
+class SQLiteStore(MemoryStore):
+    """ Class to keep jobs in an SQLite database, so they survive restarts.
+    Requests and results are stored as JSON.
+
+    Attributes
+    ----------
+    path : str
+        Path of the database file.
+
+    """
+    COLUMNS = ('id', 'status', 'request', 'result', 'status_code', 'iterations',
+               'created', 'updated')
+
+    def __init__(self, path: str):  # pylint: disable=super-init-not-called
+        self.path = path
+        self.lock = Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, status TEXT, "
+                "request TEXT, result TEXT, status_code INTEGER, iterations INTEGER, "
+                "created REAL, updated REAL)")
+
+    def load(self, row: tuple) -> dict:
+        """ Method to turn a database row into a job. """
+        job = dict(zip(self.COLUMNS, row))
+        job["request"] = json.loads(job["request"])
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
+
+    def save(self, job: dict):
+        """ Method to store a new job. """
+        values = dict(job, request=json.dumps(job["request"]),
+                      result=json.dumps(job["result"]) if job["result"] is not None else None)
+        with self.lock, self.connection:
+            self.connection.execute(
+                f"INSERT INTO jobs ({', '.join(self.COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(self.COLUMNS))})",
+                [values[column] for column in self.COLUMNS])
+
+    def get(self, job_id: str) -> dict or None:
+        """ Method to return a job, or None if there is no such job. """
+        with self.lock:
+            row = self.connection.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self.load(row) if row is not None else None
+
+    def update(self, job_id: str, **fields):
+        """ Method to update fields of a job. """
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"])
+        fields["updated"] = time()
+        with self.lock, self.connection:
+            self.connection.execute(
+                f"UPDATE jobs SET {', '.join(f'{name} = ?' for name in fields)} WHERE id = ?",
+                [*fields.values(), job_id])
+
+    def delete(self, job_id: str):
+        """ Method to remove a job. """
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def unfinished(self) -> list[dict]:
+        """ Method to return the jobs which are queued or running. """
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM jobs WHERE status NOT IN (?, ?, ?) "
+                "ORDER BY created", FINISHED).fetchall()
+        return [self.load(row) for row in rows]
+
+    def purge(self, before: float):
+        """ Method to remove the finished jobs last updated before the given time. """
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM jobs WHERE status IN (?, ?, ?) AND updated < ?",
+                                    (*FINISHED, before))
+
+
+def create_store(path: str = None) -> MemoryStore:
+    """ Function to create the job store, SQLite if a database path is given, else in memory. """
+    return SQLiteStore(path) if path else MemoryStore()
+
+
+class JobQueue:
+    """ Class to run solver jobs in a lazily started pool of worker threads.
+    Threads let a job report the iterations of its running solver and be cancelled,
+    they hold the GIL while solving, so the number of workers should stay small.
+    Jobs left unfinished in a persistent store are queued again on start.
+
+    Attributes
+    ----------
+    store : MemoryStore
+        Store keeping the jobs and their results.
+    workers : int
+        Number of worker threads.
+    solve : callable
+        Function solving a payload with an engine and a cancellable Budget,
+        returning the response and its status code.
+    max_iterations : int
+        Iteration limit of every solver run, None for no limit.
+    timeout : float
+        Time limit of every solver run in seconds, None for no limit.
+    ttl : float
+        Seconds finished jobs are kept for, 0 keeps them until deleted.
+    active : dict[str, dict]
+        Cancellation flag, finished iterations and running budget of the jobs being run.
+
+    Methods
+    -------
+    submit(self, request)
+        Stores and queues a job, returning it.
+    describe(self, job_id)
+        Returns the status, progress and result of a job.
+    cancel(self, job_id)
+        Cancels a queued or running job, or removes a finished one.
+    shutdown(self)
+        Cancels the running jobs and stops the worker threads.
+
+    """
+    def __init__(self, store: MemoryStore, workers: int, solve,
+                 max_iterations: int = None, timeout: float = None, ttl: float = 0):
+        self.store = store
+        self.workers = workers
+        self.solve = solve
+        self.max_iterations = max_iterations
+        self.timeout = timeout
+        self.ttl = ttl
+        self.active = {}
+        self.lock = Lock()
+        self.executor = None
+        for job in store.unfinished():
+            self.store.update(job["id"], status='queued')
+            self.enqueue(job["id"])
+
+    def enqueue(self, job_id: str):
+        """ Method to queue a stored job on the worker threads. """
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                   thread_name_prefix='job')
+            self.active[job_id] = {"cancelled": Event(), "iterations": 0, "budget": None}
+        self.executor.submit(self.run, job_id)
+
+    def submit(self, request: dict) -> dict:
+        """ Method to store and queue a job for a request holding a payload or a list of payloads,
+            the engine and the limits. Returns the stored job. """
+        now = time()
+        if self.ttl:
+            self.store.purge(now - self.ttl)
+        job = {
+            "id": uuid4().hex,
+            "status": 'queued',
+            "request": request,
+            "result": None,
+            "status_code": None,
+            "iterations": 0,
+            "created": now,
+            "updated": now
+        }
+        self.store.save(job)
+        self.enqueue(job["id"])
+        return job
+
+    def run(self, job_id: str):
+        """ Method run by a worker thread, solving every payload of a job in turn. """
+        state = self.active.get(job_id)
+        job = self.store.get(job_id)
+        if state is None or job is None or state["cancelled"].is_set():
+            self.active.pop(job_id, None)
+            return
+        self.store.update(job_id, status='running')
+        request = job["request"]
+        payloads = request.get("payloads", [request.get("payload")])
+        results = []
+        try:
+            for submitted in payloads:
+                budget = Budget(self.max_iterations, self.timeout, state["cancelled"])
+                state["budget"] = budget
+                response, status = self.solve(submitted, request.get("engine", "auto"),
+                                              budget)
+                state["iterations"] += budget.iterations
+                state["budget"] = None
+                response["status"] = status
+                results.append(response)
+        except SearchCancelled:
+            self.store.update(job_id, status='cancelled', iterations=state["iterations"])
+        except Exception as error:  # pylint: disable=broad-except
+            self.store.update(job_id, status='failed', result={"error": str(error)},
+                              iterations=state["iterations"])
+        else:
+            if "payloads" in request:
+                result, status_code = {"results": results}, 200
+            else:
+                result = results[0]
+                status_code = result.pop("status")
+            self.store.update(job_id, status='done', result=result, status_code=status_code,
+                              iterations=state["iterations"])
+        finally:
+            self.active.pop(job_id, None)
+
+    def describe(self, job_id: str) -> dict or None:
+        """ Method to return the status, the iterations so far and the result of a job,
+            or None if there is no such job. """
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        iterations = job["iterations"]
+        state = self.active.get(job_id)
+        if state is not None and job["status"] not in FINISHED:
+            budget = state["budget"]
+            iterations = state["iterations"] + (budget.iterations if budget is not None else 0)
+        response = {
+            "id": job["id"],
+            "status": job["status"],
+            "iterations": iterations,
+            "created": job["created"],
+            "updated": job["updated"]
+        }
+        if job["status"] in ('done', 'failed'):
+            response["result"] = job["result"]
+            response["status_code"] = job["status_code"]
+        return response
+
+    def cancel(self, job_id: str) -> dict or None:
+        """ Method to cancel a queued or running job, or remove a finished one.
+            Returns the job as described before cancelling, or None if there is no such job. """
+        response = self.describe(job_id)
+        if response is None:
+            return None
+        if response["status"] in FINISHED:
+            self.store.delete(job_id)
+            return response
+        state = self.active.get(job_id)
+        if state is not None:
+            state["cancelled"].set()
+        if response["status"] == 'queued':
+            self.store.update(job_id, status='cancelled')
+        return response
+
+    def shutdown(self):
+        """ Method to cancel the running jobs and stop the worker threads. """
+        for state in list(self.active.values()):
+            state["cancelled"].set()
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
@@ -0,0 +1,179 @@
+""" Counters and histograms rendered in the Prometheus text exposition format. """
+from bisect import bisect_left
+from threading import Lock
+
+DURATION_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10)
+COUNT_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000, 1000000)
+
+
+def format_labels(names: tuple[str], values: tuple, extra: str = '') -> str:
+    """ Helper function to format label names and values as a Prometheus label set. """
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    """ Class to count events, by label values.
+
+    Attributes
+    ----------
+    name : str
+        Metric name.
+    documentation : str
+        Help text of the metric.
+    labels : tuple[str]
+        Label names.
+    values : dict[tuple, float]
+        Count of every label value combination.
+
+    """
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.values = {}
+        self.lock = Lock()
+
+    def inc(self, *label_values, amount: float = 1):
+        """ Method to increase the count of the given label values. """
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def samples(self) -> list[str]:
+        """ Method to return the samples of the metric in exposition format. """
+        with self.lock:
+            return [f'{self.name}{format_labels(self.labels, key)} {value}'
+                    for key, value in sorted(self.values.items())]
+
+
+class Histogram:
+    """ Class to count observations in cumulative buckets, by label values.
+
+    Attributes
+    ----------
+    name : str
+        Metric name.
+    documentation : str
+        Help text of the metric.
+    buckets : tuple[float]
+        Upper bounds of the buckets, an implicit +Inf bucket is added.
+    labels : tuple[str]
+        Label names.
+    values : dict[tuple, list]
+        Bucket counts, sum and count of every label value combination.
+
+    """
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, buckets: tuple[float],
+                 labels: tuple[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self.labels = labels
+        self.values = {}
+        self.lock = Lock()
+
+    def observe(self, value: float, *label_values):
+        """ Method to record an observation for the given label values. """
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            state = self.values.get(label_values)
+            if state is None:
+                state = self.values[label_values] = [[0] * (len(self.buckets) + 1), 0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def samples(self) -> list[str]:
+        """ Method to return the samples of the metric in exposition format. """
+        lines = []
+        with self.lock:
+            for key, (counts, total, count) in sorted(self.values.items()):
+                cumulative = 0
+                for bound, bucket in zip(self.buckets + ('+Inf',), counts):
+                    cumulative += bucket
+                    labels = format_labels(self.labels, key, f'le="{bound}"')
+                    lines.append(f'{self.name}_bucket{labels} {cumulative}')
+                labels = format_labels(self.labels, key)
+                lines.append(f'{self.name}_sum{labels} {total}')
+                lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+class Registry:
+    """ Class to hold metrics and render them together.
+
+    Methods
+    -------
+    counter(self, name, documentation, labels)
+        Creates and registers a Counter.
+    histogram(self, name, documentation, buckets, labels)
+        Creates and registers a Histogram.
+    render(self)
+        Returns every metric in Prometheus text exposition format.
+
+    """
+    def __init__(self):
+        self.metrics = []
+
+    def counter(self, name: str, documentation: str, labels: tuple[str] = ()) -> Counter:
+        """ Method to create and register a Counter. """
+        metric = Counter(name, documentation, labels)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, buckets: tuple[float],
+                  labels: tuple[str] = ()) -> Histogram:
+        """ Method to create and register a Histogram. """
+        metric = Histogram(name, documentation, buckets, labels)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """ Method to return every metric in Prometheus text exposition format. """
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+requests_total = registry.counter(
+    'sudoku_requests_total', 'Requests handled, by endpoint and status.', ('endpoint', 'status'))
+request_duration = registry.histogram(
+    'sudoku_request_duration_seconds', 'Request latency, by endpoint.',
+    DURATION_BUCKETS, ('endpoint',))
+stage_duration = registry.histogram(
+    'sudoku_stage_duration_seconds', 'Time spent in each solving stage.',
+    DURATION_BUCKETS, ('stage',))
+search_iterations = registry.histogram(
+    'sudoku_search_iterations', 'Search iterations per solved puzzle.', COUNT_BUCKETS)
+search_depth = registry.histogram(
+    'sudoku_search_depth', 'Maximum search depth per solved puzzle.', COUNT_BUCKETS)
+propagation_passes = registry.histogram(
+    'sudoku_propagation_passes', 'Propagation passes per solved puzzle.', COUNT_BUCKETS)
+candidates_pruned = registry.histogram(
+    'sudoku_candidates_pruned', 'Candidates eliminated by propagation per solved puzzle.',
+    COUNT_BUCKETS)
+
+
+def observe_solve(response: dict) -> dict or None:
+    """ Function to record the solver statistics of a response.
+        Removes them from the response and returns them, None if there are none. """
+    debug = response.pop("debug", None)
+    if debug is None:
+        return None
+    for stage, seconds in debug["timings"].items():
+        stage_duration.observe(seconds, stage)
+    search_iterations.observe(response["iterations"])
+    search_depth.observe(debug["max_depth"])
+    propagation_passes.observe(debug["passes"])
+    candidates_pruned.observe(debug["pruned"])
+    return debug
@@ -0,0 +1,106 @@
+""" Pool of pre-generated puzzles, refilled by a background thread. """
+from collections import deque
+from threading import Event, Lock, Thread
+from time import perf_counter
+from .utils import generate_sudoku
+
+
+class PuzzlePool:
+    """ Class to keep pre-generated puzzles for every requested size and difficulty.
+    A background thread refills a pool up to its depth whenever it drops below the
+    low-water mark, so requests only pop a ready puzzle. Pools are created on first request,
+    only for the pooled sizes: a 25x25 puzzle takes seconds to generate, refilling a pool of them
+    would keep the background thread holding the GIL for minutes.
+
+    Attributes
+    ----------
+    depth : int
+        Number of puzzles kept in every pool, 0 disables pooling.
+    low_water : int
+        Number of puzzles below which a pool is refilled.
+    generate : callable
+        Function generating a puzzle for a size and difficulty.
+    sizes : tuple[int]
+        Board sizes which are pooled, other sizes are always generated on request.
+    puzzles : dict[tuple[int, str], deque]
+        Ready puzzles by size and difficulty.
+    generated : int
+        Number of puzzles generated by the background thread.
+    generation_time : float
+        Seconds spent generating puzzles in the background thread.
+
+    Methods
+    -------
+    pop(self, size, difficulty)
+        Returns a ready puzzle or None if the pool is empty or the size is not pooled.
+    refill(self)
+        Fills the pools below the low-water mark up to their depth.
+    stats(self)
+        Returns the depth of every pool and the refill rate.
+
+    """
+    def __init__(self, depth: int = 10, low_water: int = 3, generate=generate_sudoku,
+                 sizes: tuple[int] = (9,)):
+        self.depth = depth
+        self.low_water = low_water
+        self.generate = generate
+        self.sizes = sizes
+        self.puzzles = {}
+        self.generated = 0
+        self.generation_time = 0.0
+        self.lock = Lock()
+        self.wakeup = Event()
+        self.thread = None
+
+    def pop(self, size: int, difficulty: str or None) -> tuple or None:
+        """ Method to return a ready puzzle for the size and difficulty, or None if there is none
+            or the size is not pooled.
+            Wakes up the background thread if the pool dropped below the low-water mark. """
+        if not self.depth or size not in self.sizes:
+            return None
+        with self.lock:
+            pool = self.puzzles.setdefault((size, difficulty), deque())
+            puzzle = pool.popleft() if pool else None
+            low = len(pool) < self.low_water
+            if low and self.thread is None:
+                self.thread = Thread(target=self.run, name='puzzle-pool', daemon=True)
+                self.thread.start()
+        if low:
+            self.wakeup.set()
+        return puzzle
+
+    def run(self):
+        """ Method run by the background thread, refilling the pools when woken up. """
+        while True:
+            self.wakeup.wait()
+            self.wakeup.clear()
+            self.refill()
+
+    def refill(self):
+        """ Method to fill the pools below the low-water mark up to their depth. """
+        with self.lock:
+            keys = [key for key, pool in self.puzzles.items() if len(pool) < self.low_water]
+        for key in keys:
+            while len(self.puzzles[key]) < self.depth:
+                start = perf_counter()
+                puzzle = self.generate(*key)
+                with self.lock:
+                    self.puzzles[key].append(puzzle)
+                    self.generated += 1
+                    self.generation_time += perf_counter() - start
+
+    def stats(self) -> dict:
+        """ Method to return the depth of every pool and the refill rate in puzzles per second. """
+        with self.lock:
+            return {
+                "depth": self.depth,
+                "low_water": self.low_water,
+                "sizes": list(self.sizes),
+                "pools": [
+                    {"size": size, "difficulty": difficulty, "ready": len(pool)}
+                    for (size, difficulty), pool in self.puzzles.items()
+                ],
+                "generated": self.generated,
+                "refill_rate": (self.generated / self.generation_time
+                                if self.generation_time else 0.0)
+            }
@@ -1,8 +1,53 @@
-""" Routes for the Sudoku Solver API. """
-from math import sqrt
-from flask import abort, escape, render_template, request
+""" Routes for the Sudoku Solver API.
+Only the request hooks, the documentation and the metrics are defined here, the other views
+are imported from app.views on their first request, so cold starts do not load the solver. """
+from time import perf_counter
+from flask import Response, g, render_template, request
+from werkzeug.utils import cached_property, import_string
 from app import app, errors
-from app.utils import parse_payload, generate_sudoku
+from app.metrics import registry, request_duration, requests_total
+
+
+class LazyView:
+    """ Class to stand in for a view function, importing it on the first call.
+
+    Attributes
+    ----------
+    import_name : str
+        Dotted path of the view function.
+
+    """
+    def __init__(self, import_name: str):
+        self.import_name = import_name
+        self.__name__ = import_name.rsplit('.', 1)[-1]
+
+    @cached_property
+    def view(self):
+        """ The view function, imported on first access. """
+        return import_string(self.import_name)
+
+    def __call__(self, *args, **kwargs):
+        return self.view(*args, **kwargs)
+
+
+def lazy_route(rule: str, endpoint: str, **options):
+    """ Helper to route a rule to a view of app.views, imported on the first request. """
+    app.add_url_rule(rule, endpoint, LazyView(f'app.views.{endpoint}'), **options)
+
+
+@app.before_request
+def start_timer():
+    """ Record the start time of the request. """
+    g.request_start = perf_counter()
+
+
+@app.after_request
+def record_request(response):
+    """ Count the request by endpoint and status code and record its latency. """
+    endpoint = request.endpoint or 'unmatched'
+    requests_total.inc(endpoint, str(response.status_code))
+    request_duration.observe(perf_counter() - g.request_start, endpoint)
+    return response
 
 
 @app.route('/')
@@ -11,87 +56,22 @@ def root():
     return render_template('index.html', title='SudokuAPI Documentation')
 
 
-@app.route('/v1/solve', methods=["POST"])
-def solve():
-    """ Route to return solved Sudoku puzzle. """
-    data = request.get_json(silent=True)
-    if not request.json or 'payload' not in request.json:
-        abort(400)
-
-    submitted = escape(data["payload"])
-    if not sqrt(len(submitted)).is_integer():
-        response = {
-            "error": "Invalid input length or non square board size.",
-            "original": submitted,
-            "solvable": False
-        }
-        return response, 400
-
-    challenge = parse_payload(submitted)
-    solvable = challenge.check_solvable()
-    if not solvable:
-        response = {
-            "error": "Invalid clues.",
-            "original": submitted,
-            "solvable": solvable
-        }
-        return response, 400
-
-    passes = challenge.preprocess_board()
-    challenge.solve()
-    solution = ''
-    for row in challenge.board:
-        for number in row:
-            solution += str(number)
-    response = {
-        "original": submitted,
-        "solved": solution,
-        "iterations": challenge.iterations,
-        "passes": passes
-    }
-    return response
+lazy_route('/v1/solve', 'solve', methods=["POST"])
+lazy_route('/v1/solve/batch', 'solve_batch', methods=["POST"])
+lazy_route('/v1/cache', 'cache_stats', methods=["GET"])
+lazy_route('/v1/solve/bulk', 'solve_bulk', methods=["POST"])
+lazy_route('/v1/solve/stream', 'solve_stream', methods=["POST"])
+lazy_route('/v1/jobs', 'create_job', methods=["POST"])
+lazy_route('/v1/jobs/<job_id>', 'get_job', methods=["GET"])
+lazy_route('/v1/jobs/<job_id>', 'delete_job', methods=["DELETE"])
+lazy_route('/v1/check', 'check', methods=["POST"])
+lazy_route('/v1/grade', 'grade', methods=["POST"])
+lazy_route('/v1/hint', 'hint', methods=["POST"])
+lazy_route('/v1/generate', 'generate', methods=["GET"])
+lazy_route('/v1/generate/pool', 'generate_pool', methods=["GET"])
 
 
-@app.route('/v1/check', methods=["POST"])
-def check():
-    """ Route to check if a board seems to be solvable or not. - To be improved! """
-    data = request.get_json(silent=True)
-    if not request.json or 'payload' not in request.json:
-        abort(400)
-
-    submitted = escape(data['payload'])
-    if not sqrt(len(submitted)).is_integer():
-        response = {
-            "original": submitted,
-            "solvable": False,
-            "reason": "Invalid input length or non square board size."
-        }
-        return response
-
-    challenge = parse_payload(submitted)
-    solvable = challenge.check_solvable()
-    if solvable:
-        response = {
-            "original": submitted,
-            "solvable": solvable,
-            "reason": "Looks good."
-        }
-    else:
-        response = {
-            "original": submitted,
-            "solvable": solvable,
-            "reason": "Invalid clues."
-        }
-    return response
-
-
-@app.route('/v1/generate', methods=["GET"])
-def generate():
-    """ Route to return a random Sudoku puzzle. """
-    size = 9
-    challenge, iterations = generate_sudoku(size)
-    response = {
-        "sudoku": challenge,
-        "iterations": iterations,
-    }
-    return response
+@app.route('/metrics', methods=["GET"])
+def metrics():
+    """ Route to return the request and solver metrics in Prometheus text format. """
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,78 @@
+""" Iteration and wall-clock limits for solver runs. """
+from time import perf_counter
+
+CLOCK_INTERVAL = 256
+
+
+class BudgetExceeded(Exception):
+    """ Exception raised when a solver run used up its budget.
+
+    Attributes
+    ----------
+    iterations : int
+        Number of iterations spent.
+    elapsed : float
+        Seconds elapsed since the budget was created.
+
+    """
+    def __init__(self, iterations: int, elapsed: float):
+        super().__init__(f"Budget exhausted after {iterations} iterations in {elapsed:.3f}s.")
+        self.iterations = iterations
+        self.elapsed = elapsed
+
+
+class SearchCancelled(Exception):
+    """ Exception raised when a solver run is cancelled through its budget. """
+
+
+class Budget:
+    """ Class to limit the iterations and wall-clock time of a solver run.
+    Solvers spend an iteration for every search node, the clock and the cancellation flag
+    are only read when the iterations cross a multiple of CLOCK_INTERVAL to keep the check cheap.
+
+    Attributes
+    ----------
+    max_iterations : int
+        Number of iterations allowed, None for no limit.
+    timeout : float
+        Seconds allowed, None for no limit.
+    cancelled : Event
+        Flag stopping the run once set, anything with an is_set method, None if not cancellable.
+    iterations : int
+        Number of iterations spent.
+    start : float
+        Time the budget was created at.
+
+    Methods
+    -------
+    spend(self, iterations)
+        Spends iterations, raising BudgetExceeded once the budget is used up
+        or SearchCancelled once the run is cancelled.
+    elapsed(self)
+        Returns the seconds elapsed since the budget was created.
+
+    """
+    def __init__(self, max_iterations: int = None, timeout: float = None, cancelled=None):
+        self.max_iterations = max_iterations
+        self.timeout = timeout
+        self.cancelled = cancelled
+        self.iterations = 0
+        self.start = perf_counter()
+
+    def spend(self, iterations: int = 1):
+        """ Method to spend iterations, raising BudgetExceeded once the budget is used up
+            and SearchCancelled once the run is cancelled.
+            Spending 0 iterations only checks the clock and the cancellation flag. """
+        spent = self.iterations
+        self.iterations += iterations
+        if self.max_iterations is not None and self.iterations >= self.max_iterations:
+            raise BudgetExceeded(self.iterations, self.elapsed())
+        if iterations == 0 or self.iterations // CLOCK_INTERVAL != spent // CLOCK_INTERVAL:
+            if self.timeout is not None and self.elapsed() > self.timeout:
+                raise BudgetExceeded(self.iterations, self.elapsed())
+            if self.cancelled is not None and self.cancelled.is_set():
+                raise SearchCancelled()
+
+    def elapsed(self) -> float:
+        """ Method to return the seconds elapsed since the budget was created. """
+        return perf_counter() - self.start
@@ -0,0 +1,121 @@
+""" Canonical form of Sudoku boards under digit relabeling, row and column
+permutations within bands and stacks, and transposition. """
+from collections import namedtuple
+from itertools import permutations, product
+from math import factorial
+
+TIE_LIMIT = 64
+
+Transform = namedtuple('Transform', ['rows', 'cols', 'transposed', 'labels'])
+Transform.__doc__ = """ Transform mapping a board to its canonical form.
+
+    Attributes
+    ----------
+    rows : tuple[int]
+        Source row of every canonical row.
+    cols : tuple[int]
+        Source column of every canonical column.
+    transposed : bool
+        True if the board is transposed before the rows and columns are reordered.
+    labels : list[int]
+        Canonical value of every source value.
+
+    """
+
+
+def transpose(cells: list[int], size: int) -> list[int]:
+    """ Function to transpose a row major list of cells. """
+    return [cells[j * size + i] for i in range(size) for j in range(size)]
+
+
+def unit_orders(cells: list[int], size: int, box_size: int, by_rows: bool) -> list[tuple[int]]:
+    """ Function to list the candidate row (or column) orders of a board.
+        Rows are sorted within their band by keys which do not change under relabeling
+        and permutations: their clue count and the clue counts of the columns they hit.
+        Rows with equal keys are tried in every order while the number of orders stays
+        below TIE_LIMIT, otherwise their original order is kept. """
+    def line(index: int, other: int) -> int:
+        return cells[index * size + other] if by_rows else cells[other * size + index]
+
+    counts = [sum(1 for other in range(size) if line(index, other)) for index in range(size)]
+    other_counts = [sum(1 for index in range(size) if line(index, other)) for other in range(size)]
+    keys = [(counts[index],
+             sorted(other_counts[other] for other in range(size) if line(index, other)))
+            for index in range(size)]
+
+    bands = []
+    total = 1
+    for band in range(0, size, box_size):
+        ordered = sorted(range(band, band + box_size), key=keys.__getitem__, reverse=True)
+        groups = [[ordered[0]]]
+        for index in ordered[1:]:
+            if keys[index] == keys[groups[-1][0]]:
+                groups[-1].append(index)
+            else:
+                groups.append([index])
+        bands.append(groups)
+        for group in groups:
+            total *= factorial(len(group))
+
+    if total > TIE_LIMIT:
+        return [tuple(index for groups in bands for group in groups for index in group)]
+    alternatives = product(*(permutations(group) for groups in bands for group in groups))
+    return [tuple(index for group in alternative for index in group)
+            for alternative in alternatives]
+
+
+def relabel(cells: list[int], size: int,
+            rows: tuple[int], cols: tuple[int]) -> tuple[tuple, list[int]]:
+    """ Function to reorder a board and relabel its values in order of first appearance.
+        Returns the relabeled cells and the canonical value of every source value. """
+    labels = [0] * (size + 1)
+    label = 1
+    out = []
+    for row in rows:
+        base = row * size
+        for col in cols:
+            value = cells[base + col]
+            if value and not labels[value]:
+                labels[value] = label
+                label += 1
+            out.append(labels[value])
+    for value in range(1, size + 1):
+        if not labels[value]:
+            labels[value] = label
+            label += 1
+    return tuple(out), labels
+
+
+def canonical_form(cells: list[int], size: int, box_size: int) -> tuple[tuple, Transform]:
+    """ Function to compute the canonical form of a board given as a row major list of cells.
+        Equivalent boards usually share their canonical form, the form is always
+        the board itself after the returned transform, so it is safe to use as a cache key. """
+    best = None
+    for transposed in (False, True):
+        grid = transpose(cells, size) if transposed else cells
+        col_orders = unit_orders(grid, size, box_size, False)
+        for rows in unit_orders(grid, size, box_size, True):
+            for cols in col_orders:
+                form, labels = relabel(grid, size, rows, cols)
+                if best is None or form < best[0]:
+                    best = form, Transform(rows, cols, transposed, labels)
+    return best
+
+
+def apply(cells: list[int], size: int, transform: Transform) -> list[int]:
+    """ Function to map a board, e.g. a solution, to canonical form through the transform. """
+    grid = transpose(cells, size) if transform.transposed else cells
+    return [transform.labels[grid[row * size + col]]
+            for row in transform.rows for col in transform.cols]
+
+
+def restore(cells: list[int], size: int, transform: Transform) -> list[int]:
+    """ Function to map a canonical board, e.g. a solution, back through the inverse transform. """
+    values = [0] * (size + 1)
+    for value, label in enumerate(transform.labels):
+        values[label] = value
+    grid = [0] * (size * size)
+    for i, row in enumerate(transform.rows):
+        for j, col in enumerate(transform.cols):
+            grid[row * size + col] = values[cells[i * size + j]]
+    return transpose(grid, size) if transform.transposed else grid
@@ -0,0 +1,254 @@
+""" Dancing Links (Algorithm X) exact cover solver for Sudoku boards. """
+from .sudoku_solver import Board
+
+
+class ExactCover:
+    """ Class to represent a sparse exact cover matrix as a toroidal doubly linked list,
+    searched with Knuth's Algorithm X.
+
+    Nodes are stored in parallel lists indexed by node number, node 0 is the root header,
+    nodes 1..columns are the column headers, the rest are the matrix entries.
+
+    Attributes
+    ----------
+    left, right, up, down : list[int]
+        Links of every node.
+    column : list[int]
+        Column header of every node.
+    row : list
+        Row identifier of every node.
+    sizes : list[int]
+        Number of nodes in every column.
+    iterations : int
+        Number of search nodes visited.
+    max_depth : int
+        Deepest level reached by the search.
+    max_iterations : int
+        Number of search nodes after which the search gives up, None for no limit.
+    exhausted : bool
+        True if the search gave up because max_iterations was reached.
+    budget : Budget
+        Iteration and time limit shared with other solver runs, None for no limit.
+
+    Methods
+    -------
+    add_row(self, row_id, columns)
+        Adds a row covering the given columns.
+    cover(self, col)
+        Removes a column and all rows intersecting it from the matrix.
+    uncover(self, col)
+        Restores a column removed by cover.
+    search(self)
+        Returns the row identifiers of an exact cover or None.
+    solutions(self)
+        Yields the row identifiers of every exact cover.
+
+    """
+    def __init__(self, columns: int):
+        headers = range(columns + 1)
+        self.left = [i - 1 for i in headers]
+        self.left[0] = columns
+        self.right = [i + 1 for i in headers]
+        self.right[columns] = 0
+        self.up = list(headers)
+        self.down = list(headers)
+        self.column = list(headers)
+        self.row = [None] * (columns + 1)
+        self.sizes = [0] * (columns + 1)
+        self.iterations = 0
+        self.max_depth = 0
+        self.max_iterations = None
+        self.exhausted = False
+        self.budget = None
+
+    def add_row(self, row_id, columns: list[int]):
+        """ Method to add a row covering the given (1 based) columns. """
+        first = len(self.column)
+        for i, col in enumerate(columns):
+            node = first + i
+            self.left.append(node - 1 if i else first + len(columns) - 1)
+            self.right.append(node + 1 if i < len(columns) - 1 else first)
+            self.up.append(self.up[col])
+            self.down.append(col)
+            self.down[self.up[col]] = node
+            self.up[col] = node
+            self.column.append(col)
+            self.row.append(row_id)
+            self.sizes[col] += 1
+
+    def cover(self, col: int):
+        """ Method to remove a column and all rows intersecting it from the matrix. """
+        left, right, up, down, column, sizes = \
+            self.left, self.right, self.up, self.down, self.column, self.sizes
+        right[left[col]] = right[col]
+        left[right[col]] = left[col]
+        i = down[col]
+        while i != col:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                sizes[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def uncover(self, col: int):
+        """ Method to restore a column removed by cover. """
+        left, right, up, down, column, sizes = \
+            self.left, self.right, self.up, self.down, self.column, self.sizes
+        i = up[col]
+        while i != col:
+            j = left[i]
+            while j != i:
+                sizes[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[col]] = col
+        left[right[col]] = col
+
+    def choose_column(self) -> int:
+        """ Method to pick the column with the fewest nodes. """
+        right, sizes = self.right, self.sizes
+        best = right[0]
+        col = right[best]
+        while col != 0 and sizes[best] > 1:
+            if sizes[col] < sizes[best]:
+                best = col
+            col = right[col]
+        return best
+
+    def select(self, node: int):
+        """ Method to cover the other columns of the row of the given node. """
+        j = self.right[node]
+        while j != node:
+            self.cover(self.column[j])
+            j = self.right[j]
+
+    def deselect(self, node: int):
+        """ Method to undo select for the given node. """
+        j = self.left[node]
+        while j != node:
+            self.uncover(self.column[j])
+            j = self.left[j]
+
+    def search(self) -> list or None:
+        """ Method to find an exact cover with Algorithm X.
+
+            Returns
+            -------
+            list
+                Row identifiers of the rows forming the exact cover.
+            None
+                If the matrix has no exact cover.
+
+            """
+        return next(self.solutions(), None)
+
+    def solutions(self):
+        """ Generator yielding the row identifiers of every exact cover, found with Algorithm X.
+            The search uses an explicit stack, so its depth is not bound by the recursion limit. """
+        right, down, column = self.right, self.down, self.column
+        path = []
+        while True:
+            if right[0] == 0:
+                yield [self.row[node] for node in path]
+                if not path:
+                    return
+                # Continue with the next alternative of the last choice
+                node = path.pop()
+                self.deselect(node)
+                col = column[node]
+                node = down[node]
+            else:
+                if self.max_iterations is not None and self.iterations >= self.max_iterations:
+                    self.exhausted = True
+                    return
+                self.iterations += 1
+                if self.budget is not None:
+                    self.budget.spend()
+                if len(path) > self.max_depth:
+                    self.max_depth = len(path)
+                col = self.choose_column()
+                self.cover(col)
+                node = down[col]
+            while node == col:
+                # Column exhausted, backtrack to the previous choice
+                self.uncover(col)
+                if not path:
+                    return
+                node = path.pop()
+                self.deselect(node)
+                col = column[node]
+                node = down[node]
+            path.append(node)
+            self.select(node)
+
+
+def create_matrix(board: Board) -> ExactCover:
+    """ Function to build the exact cover matrix of a Board.
+        Columns are the cell, row-value, column-value and box-value constraints,
+        rows are the candidate placements allowed by the clues. """
+    size = board.size
+    cells = size * size
+    matrix = ExactCover(4 * cells)
+    clues = []
+    boxes = board.geometry.boxes
+    for cell, number in enumerate(board.cells):
+        i, j = divmod(cell, size)
+        box = boxes[cell]
+        if number != 0:
+            values = [number]
+            clues.append(len(matrix.column))
+        else:
+            candidates = board.candidates((i, j))
+            values = [num for num in range(board.dimensions[0], board.dimensions[1])
+                      if candidates >> num & 1]
+        for num in values:
+            matrix.add_row((i, j, num), [
+                1 + cell,
+                1 + cells + i * size + num - 1,
+                1 + 2 * cells + j * size + num - 1,
+                1 + 3 * cells + box * size + num - 1,
+            ])
+    for node in clues:
+        # Clues are part of every solution, remove them before searching
+        matrix.cover(matrix.column[node])
+        matrix.select(node)
+    return matrix
+
+
+def solve(board: Board) -> bool:
+    """ Function to solve Board in place with Dancing Links.
+        Returns True if solved, False otherwise. """
+    matrix = create_matrix(board)
+    matrix.budget = board.budget
+    try:
+        solution = matrix.search()
+    finally:
+        board.iterations += matrix.iterations
+        board.max_depth = max(board.max_depth, matrix.max_depth)
+    if solution is None:
+        return False
+    for i, j, num in solution:
+        if board.cells[i * board.size + j] == 0:
+            board.place(num, (i, j))
+    return True
+
+
+def count_solutions(board: Board, limit: int = 2, budget: int = None) -> int or None:
+    """ Function to count the solutions of Board, stopping once limit is reached.
+        Returns None if the search visited budget nodes before reaching a verdict. """
+    matrix = create_matrix(board)
+    matrix.max_iterations = budget
+    matrix.budget = board.budget
+    count = 0
+    try:
+        for _ in matrix.solutions():
+            count += 1
+            if count >= limit:
+                break
+    finally:
+        board.iterations += matrix.iterations
+    return None if matrix.exhausted else count
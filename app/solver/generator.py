@@ -0,0 +1,159 @@
+""" Sudoku puzzle generator with unique solutions and difficulty targeting. """
+from random import sample, shuffle
+from . import dlx
+from .budget import Budget
+from .geometry import geometry
+from .propagation import Propagator
+from .sudoku_solver import Board
+
+DIFFICULTIES = ('easy', 'medium', 'hard', 'expert')
+ATTEMPTS = 20
+COUNT_NODES = 256
+
+# Default clue range of every supported board size
+CLUES = {4: (4, 8), 9: (17, 30), 16: (56, 112), 25: (151, 313)}
+
+
+def create_board(cells: list[int], size: int, box_size: int, budget: Budget = None) -> Board:
+    """ Function to create a Board from a row major list of cells, sharing the given budget. """
+    board = Board(cells, size, box_size, (1, size + 1))
+    board.budget = budget
+    return board
+
+
+def fill_board(size: int, box_size: int, budget: Budget = None) -> list[int]:
+    """ Function to create a random solved board.
+        The boxes on the diagonal do not share units, so they are filled
+        with random permutations, Dancing Links completes the rest. """
+    cells = [0] * (size * size)
+    units = geometry(size, box_size).units
+    for box in range(box_size):
+        values = sample(range(1, size + 1), size)
+        for cell, value in zip(units[2 * size + box * box_size + box], values):
+            cells[cell] = value
+    board = create_board(cells, size, box_size, budget)
+    dlx.solve(board)
+    return list(board.cells)
+
+
+def count_solutions(cells: list[int], size: int, box_size: int,
+                    limit: int = 2, budget: Budget = None) -> int:
+    """ Function to count the solutions of a board, stopping once limit is reached. """
+    return dlx.count_solutions(create_board(cells, size, box_size, budget), limit)
+
+
+def grade(cells: list[int], size: int, box_size: int, budget: Budget = None) -> str:
+    """ Function to grade a board by the hardest propagation rule needed to solve it.
+        Boards which cannot be solved by propagation alone are graded expert. """
+    return grade_board(create_board(cells, size, box_size, budget))
+
+
+def grade_board(board: Board) -> str:
+    """ Function to grade a Board, propagation fills it in place. """
+    propagator = Propagator(board)
+    propagator.run()
+    return rules_level(board, propagator)
+
+
+def rules_level(board: Board, propagator: Propagator) -> str:
+    """ Helper function to grade a Board by the rules its propagation needed. """
+    if 0 in board.cells:
+        return 'expert'
+    if propagator.rules['naked_pair'] or propagator.rules['naked_triple']:
+        return 'hard'
+    if propagator.rules['hidden_single']:
+        return 'medium'
+    return 'easy'
+
+
+def count_budget(size: int, difficulty: str = None) -> int or None:
+    """ Helper function to return the search node budget of a uniqueness check while removing
+        clues. Below expert no search is needed, boards which propagation cannot solve are
+        graded expert and rejected anyway. Boards larger than 9x9 give up on checks of more
+        than COUNT_NODES nodes and keep the clue, a few hard counts would take most of the time. """
+    if difficulty and difficulty != 'expert':
+        return 0
+    return None if size <= 9 else COUNT_NODES
+
+
+def unique_level(board: Board, nodes: int = None) -> str or None:
+    """ Function to grade a Board if it has a unique solution, None otherwise or if counting
+        its solutions takes more than nodes search nodes. Propagation fills the board in place
+        first, a board solved by propagation alone is unique and the count only has to search
+        the cells propagation left open. """
+    propagator = Propagator(board)
+    propagator.run()
+    if propagator.contradiction:
+        return None
+    if 0 in board.cells and (nodes == 0 or dlx.count_solutions(board, 2, nodes) != 1):
+        return None
+    return rules_level(board, propagator)
+
+
+def remove_clues(cells: list[int], size: int, box_size: int, difficulty: str or None,
+                 min_clues: int, budget: Budget = None,
+                 max_clues: int = None) -> tuple[list[int], str]:
+    """ Function to remove clues from a solved board one at a time in random order,
+        keeping a removal only if the solution stays unique
+        and the board does not get harder than the requested difficulty.
+        Boards larger than 9x9 stop once the clues are within max_clues, every uniqueness check
+        costs more the fewer clues are left, the attempts of generate target the difficulty.
+        A single Board is reused, restored from a snapshot after every check. """
+    board = create_board(cells, size, box_size, budget)
+    nodes = count_budget(size, difficulty)
+    clues = len(cells)
+    level = 'easy'
+    positions = list(range(len(cells)))
+    shuffle(positions)
+    for position in positions:
+        if clues <= min_clues or size > 9 and max_clues is not None and clues <= max_clues:
+            break
+        pos = divmod(position, size)
+        value = board.cells[position]
+        board.remove(pos)
+        state = board.snapshot()
+        new_level = unique_level(board, nodes)
+        board.restore(state)
+        if new_level is None or difficulty \
+                and DIFFICULTIES.index(new_level) > DIFFICULTIES.index(difficulty):
+            board.place(value, pos)
+            continue
+        clues -= 1
+        level = new_level
+    return list(board.cells), level
+
+
+def generate(size: int, box_size: int, difficulty: str = None,
+             min_clues: int = None, max_clues: int = None,
+             attempts: int = None, budget: Budget = None) -> tuple[list[int], int, str]:
+    """ Function to generate a puzzle with a unique solution.
+        A new solved board is tried at most attempts times, until a puzzle with
+        the requested difficulty and a clue count within range is found,
+        otherwise the closest attempt is returned.
+        The clue range defaults to the one of the board size, the attempts are scaled
+        down from ATTEMPTS by the number of cells for boards larger than 9x9.
+        Raises BudgetExceeded if the budget is used up.
+
+        Returns
+        -------
+        tuple[list[int], int, str]
+            Row major cells of the puzzle, attempts used and difficulty of the puzzle.
+
+        """
+    default_min, default_max = CLUES.get(size, (0, size * size))
+    min_clues = default_min if min_clues is None else min_clues
+    max_clues = default_max if max_clues is None else max_clues
+    if attempts is None:
+        attempts = max(1, ATTEMPTS * 81 // max(81, size * size))
+    best = None
+    for attempt in range(1, attempts + 1):
+        puzzle, level = remove_clues(fill_board(size, box_size, budget), size, box_size,
+                                     difficulty, min_clues, budget, max_clues)
+        clues = sum(1 for value in puzzle if value)
+        distance = (abs(DIFFICULTIES.index(level) - DIFFICULTIES.index(difficulty))
+                    if difficulty else 0, max(0, clues - max_clues))
+        if best is None or distance < best[0]:
+            best = distance, puzzle, level
+        if distance == (0, 0):
+            return puzzle, attempt, level
+    return best[1], attempts, best[2]
@@ -0,0 +1,40 @@
+""" Peer and unit index tables of Sudoku boards, computed once per board geometry. """
+from collections import namedtuple
+from functools import lru_cache
+
+Geometry = namedtuple('Geometry', ['size', 'box_size', 'units', 'cell_units', 'peers', 'boxes'])
+Geometry.__doc__ = """ Index tables of a board geometry, cells are numbered in row major order.
+
+    Attributes
+    ----------
+    size : int
+        Size of the board.
+    box_size : int
+        Size of the box.
+    units : tuple[tuple[int]]
+        Cells of every row, then every column, then every box.
+    cell_units : tuple[tuple[int, int, int]]
+        Row, column and box unit of every cell.
+    peers : tuple[tuple[int]]
+        Cells sharing a unit with every cell, in ascending order.
+    boxes : tuple[int]
+        Box index of every cell.
+
+    """
+
+
+@lru_cache(maxsize=None)
+def geometry(size: int, box_size: int) -> Geometry:
+    """ Function to return the index tables of a size*size board with box_size*box_size boxes.
+        The tables are built on the first call and shared by every later caller. """
+    boxes = tuple((cell // size // box_size) * box_size + cell % size // box_size
+                  for cell in range(size * size))
+    units = [tuple(i * size + j for j in range(size)) for i in range(size)]
+    units += [tuple(i * size + j for i in range(size)) for j in range(size)]
+    units += [tuple(cell for cell in range(size * size) if boxes[cell] == box)
+              for box in range(size)]
+    cell_units = tuple((cell // size, size + cell % size, 2 * size + boxes[cell])
+                       for cell in range(size * size))
+    peers = tuple(tuple(sorted(set().union(*(units[unit] for unit in cell_unit)) - {cell}))
+                  for cell, cell_unit in enumerate(cell_units))
+    return Geometry(size, box_size, tuple(units), cell_units, peers, boxes)
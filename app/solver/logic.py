@@ -0,0 +1,394 @@
+""" Human-style Sudoku solver, applying graded techniques in order of cost on candidate bitsets. """
+from itertools import combinations, islice
+from . import dlx
+from .sudoku_solver import Board
+
+# Weight of every technique, in the order they are tried
+TECHNIQUES = {
+    'naked_single': 1,
+    'hidden_single': 2,
+    'locked_candidates': 4,
+    'naked_pair': 6,
+    'hidden_pair': 8,
+    'naked_triple': 10,
+    'hidden_triple': 12,
+    'x_wing': 16,
+    'swordfish': 20,
+    'xy_wing': 24,
+}
+
+# Difficulty of a puzzle by the weight of the hardest technique it needs
+LEVELS = ((1, 'easy'), (2, 'medium'), (12, 'hard'), (24, 'expert'))
+
+
+def popcount(bits: int) -> int:
+    """ Helper function to return the number of candidates in a bitset. """
+    return bin(bits).count('1')
+
+
+def values(bits: int) -> list[int]:
+    """ Helper function to return the values of a bitset in ascending order. """
+    return [number for number in range(bits.bit_length()) if bits >> number & 1]
+
+
+class LogicSolver:
+    """ Class to solve a Board step by step with human-style techniques.
+    Every step applies the cheapest technique which places a value or eliminates candidates,
+    then starts over from the singles. Candidates are kept as bitsets like the Board mask,
+    bit n set meaning value n is still possible, 0 for filled cells.
+
+    Attributes
+    ----------
+    board : Board
+        Board to solve, values are placed on it directly.
+    candidates : list[int]
+        Candidate bitset of every cell in row major order, 0 for filled cells.
+    steps : list[dict]
+        Technique, cells, values and number of eliminated candidates of every step.
+    techniques : dict[str, int]
+        Number of times each technique was applied.
+    pruned : int
+        Number of candidates eliminated.
+    contradiction : bool
+        True if a cell was left without candidates.
+
+    Methods
+    -------
+    step(self)
+        Applies the cheapest technique which makes progress.
+    run(self)
+        Applies techniques until the board is solved or none makes progress.
+    score(self)
+        Returns the sum of the weights of the steps taken.
+    difficulty(self)
+        Returns the difficulty level of the hardest technique applied.
+    create_mask(self)
+        Returns the candidates in the Board mask format.
+
+    """
+    def __init__(self, board: Board):
+        self.board = board
+        self.size = board.size
+        self.units = board.geometry.units
+        self.cell_units = board.geometry.cell_units
+        self.peers = board.geometry.peers
+        self.candidates = [0 if number else bits for number, bits in zip(board.cells, board.mask)]
+        self.steps = []
+        self.techniques = dict.fromkeys(TECHNIQUES, 0)
+        self.pruned = 0
+        self.contradiction = False
+
+    def record(self, technique: str, cells, bits: int, eliminated: int = None):
+        """ Method to count a technique and add its step to the trace. """
+        self.techniques[technique] += 1
+        step = {"technique": technique, "cells": list(cells), "values": values(bits)}
+        if eliminated is not None:
+            step["eliminated"] = eliminated
+        self.steps.append(step)
+
+    def place(self, cell: int, bit: int, technique: str):
+        """ Method to fix a value in a cell and remove it from the candidates of its peers. """
+        self.record(technique, (cell,), bit)
+        self.candidates[cell] = 0
+        self.board.place(bit.bit_length() - 1, divmod(cell, self.size))
+        self.eliminate(self.peers[cell], bit)
+
+    def eliminate(self, cells, bits: int) -> int:
+        """ Method to remove candidates from cells, returning the number removed. """
+        removed = 0
+        for cell in cells:
+            found = self.candidates[cell] & bits
+            if found:
+                removed += popcount(found)
+                self.candidates[cell] ^= found
+                if not self.candidates[cell]:
+                    self.contradiction = True
+        self.pruned += removed
+        return removed
+
+    def naked_single(self) -> bool:
+        """ Method to place the value of a cell with a single candidate. """
+        for cell, bits in enumerate(self.candidates):
+            if bits and not bits & (bits - 1):
+                self.place(cell, bits, 'naked_single')
+                return True
+        return False
+
+    def hidden_single(self) -> bool:
+        """ Method to place a value which has a single possible cell in a unit. """
+        for cells in self.units:
+            once = twice = 0
+            for cell in cells:
+                twice |= once & self.candidates[cell]
+                once |= self.candidates[cell]
+            hidden = once & ~twice
+            if hidden:
+                bit = hidden & -hidden
+                cell = next(cell for cell in cells if self.candidates[cell] & bit)
+                self.place(cell, bit, 'hidden_single')
+                return True
+        return False
+
+    def locked_candidates(self) -> bool:
+        """ Method to eliminate a value confined to one line of a box from the rest of the line,
+            or confined to one box of a line from the rest of the box. """
+        boxes = 2 * self.size
+        for unit, cells in enumerate(self.units):
+            union = 0
+            for cell in cells:
+                union |= self.candidates[cell]
+            while union:
+                bit = union & -union
+                union ^= bit
+                holders = [cell for cell in cells if self.candidates[cell] & bit]
+                for kind in ((0, 1) if unit >= boxes else (2,)):
+                    targets = {self.cell_units[cell][kind] for cell in holders}
+                    if len(targets) != 1:
+                        continue
+                    others = [cell for cell in self.units[targets.pop()] if cell not in holders]
+                    eliminated = self.eliminate(others, bit)
+                    if eliminated:
+                        self.record('locked_candidates', holders, bit, eliminated)
+                        return True
+        return False
+
+    def naked_subset(self, count: int, technique: str) -> bool:
+        """ Method to eliminate the values of count cells of a unit, which hold only
+            count candidates between them, from the rest of the unit. """
+        for cells in self.units:
+            unsolved = [cell for cell in cells if self.candidates[cell]]
+            if len(unsolved) <= count:
+                continue
+            small = [cell for cell in unsolved if popcount(self.candidates[cell]) <= count]
+            for subset in combinations(small, count):
+                union = 0
+                for cell in subset:
+                    union |= self.candidates[cell]
+                if popcount(union) != count:
+                    continue
+                eliminated = self.eliminate([cell for cell in unsolved if cell not in subset],
+                                            union)
+                if eliminated:
+                    self.record(technique, subset, union, eliminated)
+                    return True
+        return False
+
+    def hidden_subset(self, count: int, technique: str) -> bool:
+        """ Method to eliminate the other candidates of count cells of a unit,
+            which are the only possible cells of count values. """
+        for cells in self.units:
+            unsolved = [cell for cell in cells if self.candidates[cell]]
+            if len(unsolved) <= count:
+                continue
+            # Cells of every value as a bitset of positions in the unit
+            positions = {}
+            for index, cell in enumerate(unsolved):
+                for number in values(self.candidates[cell]):
+                    positions[1 << number] = positions.get(1 << number, 0) | 1 << index
+            digits = [bit for bit, held in positions.items() if popcount(held) <= count]
+            for subset in combinations(digits, count):
+                held = bits = 0
+                for bit in subset:
+                    held |= positions[bit]
+                    bits |= bit
+                if popcount(held) != count:
+                    continue
+                hidden = [unsolved[index] for index in values(held)]
+                eliminated = self.eliminate(hidden, ~bits)
+                if eliminated:
+                    self.record(technique, hidden, bits, eliminated)
+                    return True
+        return False
+
+    def fish(self, count: int, technique: str) -> bool:
+        """ Method to eliminate a value from count columns, if its only possible cells
+            in count rows lie in those columns, and the same with rows and columns swapped. """
+        size = self.size
+        for number in range(1, size + 1):
+            bit = 1 << number
+            for base, cover in ((0, 1), (1, 0)):
+                lines = []
+                for line in range(size):
+                    held = 0
+                    for cell in self.units[base * size + line]:
+                        if self.candidates[cell] & bit:
+                            held |= 1 << (self.cell_units[cell][cover] - cover * size)
+                    if 2 <= popcount(held) <= count:
+                        lines.append((line, held))
+                for subset in combinations(lines, count):
+                    covered = 0
+                    for _, held in subset:
+                        covered |= held
+                    if popcount(covered) != count:
+                        continue
+                    bases = {line for line, _ in subset}
+                    others = [cell for index in values(covered)
+                              for cell in self.units[cover * size + index]
+                              if self.cell_units[cell][base] - base * size not in bases]
+                    eliminated = self.eliminate(others, bit)
+                    if eliminated:
+                        corners = [cell for line in sorted(bases)
+                                for cell in self.units[base * size + line]
+                                if self.candidates[cell] & bit]
+                        self.record(technique, corners, bit, eliminated)
+                        return True
+        return False
+
+    def xy_wing(self) -> bool:
+        """ Method to eliminate value c from the cells seeing both wings of a pivot with
+            candidates ab, when the pivot sees a wing with candidates ac and one with bc. """
+        for pivot, pair in enumerate(self.candidates):
+            if popcount(pair) != 2:
+                continue
+            wings = [cell for cell in self.peers[pivot]
+                     if popcount(self.candidates[cell]) == 2
+                     and popcount(self.candidates[cell] & pair) == 1]
+            for first, second in combinations(wings, 2):
+                bit = self.candidates[first] & ~pair
+                if bit != self.candidates[second] & ~pair \
+                        or self.candidates[first] & pair == self.candidates[second] & pair:
+                    continue
+                seen = set(self.peers[first]).intersection(self.peers[second])
+                seen.discard(pivot)
+                eliminated = self.eliminate(sorted(seen), bit)
+                if eliminated:
+                    self.record('xy_wing', (pivot, first, second), pair | bit, eliminated)
+                    return True
+        return False
+
+    def step(self) -> bool:
+        """ Method to apply the cheapest technique which places a value or eliminates candidates.
+            Returns False if none does. """
+        return (self.naked_single() or self.hidden_single() or self.locked_candidates()
+                or self.naked_subset(2, 'naked_pair') or self.hidden_subset(2, 'hidden_pair')
+                or self.naked_subset(3, 'naked_triple') or self.hidden_subset(3, 'hidden_triple')
+                or self.fish(2, 'x_wing') or self.fish(3, 'swordfish') or self.xy_wing())
+
+    def run(self) -> bool:
+        """ Method to apply techniques until the board is solved or none makes progress.
+            Returns True if the board was solved.
+            Raises BudgetExceeded if the budget of the Board runs out of time. """
+        while 0 in self.board.cells and not self.contradiction:
+            if self.board.budget is not None:
+                self.board.budget.spend(0)
+            if not self.step():
+                break
+        return 0 not in self.board.cells and not self.contradiction
+
+    def score(self) -> int:
+        """ Method to return the sum of the weights of the steps taken. """
+        return sum(TECHNIQUES[name] * count for name, count in self.techniques.items())
+
+    def difficulty(self) -> str:
+        """ Method to return the difficulty level of the hardest technique applied,
+            expert if the board is left unsolved. """
+        if 0 in self.board.cells:
+            return LEVELS[-1][1]
+        hardest = max((TECHNIQUES[name] for name, count in self.techniques.items() if count),
+                      default=0)
+        return next(level for weight, level in LEVELS if hardest <= weight)
+
+    def create_mask(self) -> list[int]:
+        """ Method to return the candidates in the Board mask format,
+            the bit of the placed value for filled cells, the candidate bitset otherwise. """
+        return [1 << number if number else candidates
+                for number, candidates in zip(self.board.cells, self.candidates)]
+
+
+def solve(board: Board) -> bool:
+    """ Function to solve Board in place with the techniques, then with backtracking
+        over the candidates left if the techniques do not finish it. """
+    solver = LogicSolver(board)
+    solved = solver.run()
+    for name, count in solver.techniques.items():
+        if count:
+            board.rules[name] = board.rules.get(name, 0) + count
+    board.pruned += solver.pruned
+    if solved or solver.contradiction:
+        return solved
+    board.mask = solver.create_mask()
+    board.order = None
+    return board.solve()
+
+
+def grade(board: Board) -> dict:
+    """ Function to grade Board by solving it with the techniques alone, Board is filled in place.
+
+        Returns
+        -------
+        dict
+            Whether the techniques solved the board, its difficulty and score,
+            the number of times each technique was applied and the step trace.
+
+        """
+    solver = LogicSolver(board)
+    solved = solver.run()
+    return {
+        "solved": solved,
+        "difficulty": solver.difficulty(),
+        "score": solver.score(),
+        "techniques": {name: count for name, count in solver.techniques.items() if count},
+        "steps": solver.steps
+    }
+
+
+def unique_solution(board: Board, budget: int = None) -> list[int] or None:
+    """ Function to return the cells of the solution of Board in row major order,
+        or None if it has no solution or more than one, or if the search visited budget nodes
+        before deciding. Board is left unchanged. """
+    matrix = dlx.create_matrix(board)
+    matrix.max_iterations = budget
+    solutions = list(islice(matrix.solutions(), 2))
+    if matrix.exhausted or len(solutions) != 1:
+        return None
+    cells = list(board.cells)
+    for i, j, number in solutions[0]:
+        cells[i * board.size + j] = number
+    return cells
+
+
+def hint(board: Board, marks: list[int] = None, budget: int = None) -> dict or None:
+    """ Function to find the next deduction on Board, stopping at the first technique which
+        places a value or eliminates candidates. Pencil marks, candidate bitsets of every cell,
+        narrow the candidates first. The marks ruling out candidates are checked against the
+        solution first when it is unique and found within budget search nodes, a deduction
+        from marks ruling out the solution would be wrong. Board is left unchanged.
+
+        Returns
+        -------
+        dict
+            Step of the technique, with the eliminated candidates of every cell under "removed",
+            or a contradiction step with the cells whose marks exclude their solution value
+            or the cells left without candidates.
+        None
+            If no technique makes progress.
+
+        """
+    solver = LogicSolver(board)
+    if marks is not None:
+        narrowed = [cell for cell, (bits, mark) in enumerate(zip(solver.candidates, marks))
+                    if bits & ~mark]
+        solution = unique_solution(board, budget) if narrowed else None
+        if solution is not None:
+            wrong = [cell for cell in narrowed if not marks[cell] >> solution[cell] & 1]
+            if wrong:
+                return {"technique": 'contradiction', "cells": wrong,
+                        "values": [solution[cell] for cell in wrong],
+                        "reason": "Pencil marks exclude the solution."}
+        solver.candidates = [bits & mark for bits, mark in zip(solver.candidates, marks)]
+    empty = [cell for cell, (number, bits) in enumerate(zip(board.cells, solver.candidates))
+             if not number and not bits]
+    if empty:
+        return {"technique": 'contradiction', "cells": empty, "values": []}
+    before = solver.candidates[:]
+    state = board.snapshot()
+    try:
+        if not solver.step():
+            return None
+    finally:
+        board.restore(state)
+    step = solver.steps[-1]
+    if "eliminated" in step:
+        step["removed"] = [[cell, values(bits & ~solver.candidates[cell])]
+                           for cell, bits in enumerate(before) if bits & ~solver.candidates[cell]]
+    return step
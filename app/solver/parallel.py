@@ -0,0 +1,282 @@
+""" Parallel search of a single board, splitting its search tree across a process pool. """
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import Array, parent_process
+from os import cpu_count
+from threading import Lock
+from . import dlx
+from .budget import Budget, BudgetExceeded, SearchCancelled
+from .sudoku_solver import Board
+
+SLOTS = 64
+TASKS_PER_WORKER = 4
+POLL_INTERVAL = 0.05
+
+FLAGS = None
+
+
+class SharedFlag:
+    """ Class to read a cancellation flag shared by the pool processes, like an Event. """
+    def __init__(self, flags, slot: int):
+        self.flags = flags
+        self.slot = slot
+
+    def is_set(self) -> bool:
+        """ Method to return True once the flag is set. """
+        return bool(self.flags[self.slot])
+
+
+def init_worker(flags):
+    """ Function run by every pool process on start, to keep the shared flags. """
+    global FLAGS  # pylint: disable=global-statement
+    FLAGS = flags
+
+
+def subtree_board(cells: bytes, size: int, box_size: int, slot: int,
+                  max_iterations: int = None, timeout: float = None) -> Board:
+    """ Function to create the Board of a subtree in a pool process,
+        with a budget cancelled through the shared flag of its search. """
+    board = Board(cells, size, box_size, (1, size + 1))
+    board.budget = Budget(max_iterations, timeout, SharedFlag(FLAGS, slot))
+    return board
+
+
+def search_subtree(cells: bytes, size: int, box_size: int, solver, slot: int,
+                   max_iterations: int = None, timeout: float = None) -> tuple[str, bytes, int]:
+    """ Function run in a pool process to solve the subtree below a partial board.
+        Returns the outcome, solved, failed, cancelled or exhausted,
+        the solved cells and the iterations spent. """
+    board = subtree_board(cells, size, box_size, slot, max_iterations, timeout)
+    try:
+        board.preprocess_board()
+        if solver(board):
+            return 'solved', bytes(board.cells), board.iterations
+        return 'failed', None, board.iterations
+    except SearchCancelled:
+        return 'cancelled', None, board.iterations
+    except BudgetExceeded:
+        return 'exhausted', None, board.iterations
+
+
+def count_subtree(cells: bytes, size: int, box_size: int, slot: int, limit: int,
+                  budget: int = None, timeout: float = None) -> tuple[str, int, int]:
+    """ Function run in a pool process to count the solutions below a partial board,
+        stopping once limit is reached. Returns the outcome, the count and the iterations spent. """
+    board = subtree_board(cells, size, box_size, slot, timeout=timeout)
+    try:
+        count = dlx.count_solutions(board, limit, budget)
+    except SearchCancelled:
+        return 'cancelled', 0, board.iterations
+    except BudgetExceeded:
+        return 'exhausted', 0, board.iterations
+    return ('exhausted' if count is None else 'counted'), count or 0, board.iterations
+
+
+class SearchPool:
+    """ Class to search the subtrees of a board in a lazily started pool of processes.
+    Every search running on the pool holds one slot of a shared flag array,
+    setting its flag stops the subtrees still being searched once one of them is solved.
+
+    Attributes
+    ----------
+    workers : int
+        Number of worker processes, 0 means one per CPU, 1 searches in process
+        without starting the processes or the flags.
+    executor : ProcessPoolExecutor
+        Executor running the subtrees, started on first use.
+    flags : Array
+        Cancellation flag of every slot, shared with the pool processes.
+    free : list[int]
+        Slots not held by a running search.
+
+    Methods
+    -------
+    acquire(self)
+        Returns a free slot, or None if there is none.
+    release(self, slot)
+        Clears the flag of a slot and frees it.
+    run(self, func, tasks, slot, done, budget)
+        Runs func on the tasks until done says the search is over, cancelling the rest.
+    shutdown(self)
+        Stops the worker processes.
+
+    """
+    def __init__(self, workers: int = 0):
+        self.workers = workers or cpu_count() or 1
+        self.executor = None
+        self.flags = None
+        self.free = list(range(SLOTS))
+        self.lock = Lock()
+
+    def acquire(self) -> int or None:
+        """ Method to return a free slot, starting the processes on first use,
+            or None if every slot is held. """
+        with self.lock:
+            if self.executor is None:
+                self.flags = Array('b', SLOTS, lock=False)
+                self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                    initializer=init_worker,
+                                                    initargs=(self.flags,))
+            return self.free.pop() if self.free else None
+
+    def release(self, slot: int):
+        """ Method to clear the flag of a slot and free it. """
+        with self.lock:
+            self.flags[slot] = 0
+            self.free.append(slot)
+
+    def run(self, func, tasks: list[tuple], slot: int, done,
+            budget: Budget = None) -> list[tuple]:
+        """ Method to run func on the argument tuples of the tasks in the pool processes,
+            until done returns True for the results so far. The rest of the tasks are then
+            cancelled. The budget of the search is checked every POLL_INTERVAL seconds
+            while waiting, so a cancelled job stops its subtrees.
+            Returns the results in completion order.
+            Raises SearchCancelled or BudgetExceeded when the budget says so. """
+        pending = {self.executor.submit(func, *task) for task in tasks}
+        results = []
+        try:
+            while pending:
+                finished, pending = wait(pending, timeout=POLL_INTERVAL,
+                                         return_when=FIRST_COMPLETED)
+                results.extend(future.result() for future in finished)
+                if done(results):
+                    break
+                if budget is not None:
+                    budget.spend(0)
+        finally:
+            self.flags[slot] = 1
+            for future in pending:
+                future.cancel()
+            wait(pending)
+        return results
+
+    def shutdown(self):
+        """ Method to stop the worker processes. """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+pool = SearchPool()
+
+
+def configure(workers: int = 0) -> SearchPool:
+    """ Function to replace the pool used by default with one of the given number of workers,
+        like the SOLVER_WORKERS setting of the app. Stops the processes of the old pool. """
+    global pool  # pylint: disable=global-statement
+    pool.shutdown()
+    pool = SearchPool(workers)
+    return pool
+
+
+def split(board: Board, tasks: int) -> tuple[list[bytes], list[bytes]]:
+    """ Function to expand the top of the search tree breadth first, branching on the fields
+        picked by find_min_empty_new and their valid values in the order of most common clues,
+        until there are at least tasks partial boards. The board is restored afterwards.
+
+        Returns
+        -------
+        tuple[list[bytes], list[bytes]]
+            Cells of the partial boards left to search and of the solved boards found.
+
+        """
+    state = board.snapshot()
+    frontier = deque([state])
+    solved = []
+    while frontier and len(frontier) < tasks:
+        board.restore(frontier.popleft())
+        pick = board.find_min_empty_new()
+        if pick is None:
+            solved.append(bytes(board.cells))
+            continue
+        for number in board.most_common_clues:
+            if board.valid(number, pick):
+                board.place(number, pick)
+                frontier.append(board.snapshot())
+                board.remove(pick)
+    board.restore(state)
+    return [cells for cells, *_ in frontier], solved
+
+
+def limits(board: Board) -> tuple[int or None, float or None]:
+    """ Helper function to return the iterations and seconds left in the budget of a board. """
+    budget = board.budget
+    if budget is None:
+        return None, None
+    max_iterations = None
+    if budget.max_iterations is not None:
+        max_iterations = max(0, budget.max_iterations - budget.iterations)
+    timeout = None if budget.timeout is None else max(0.0, budget.timeout - budget.elapsed())
+    return max_iterations, timeout
+
+
+def solve(board: Board, solver=Board.solve, search_pool: SearchPool = None) -> bool:
+    """ Function to solve Board in place, searching the subtrees below its top branch points
+        in parallel with the given sequential solver. The first solution found wins.
+        Falls back to the sequential solver inside pool processes or without free slots.
+        The iteration limit of the budget applies to every subtree.
+        Raises BudgetExceeded if no solution is found and a subtree used up its budget. """
+    search_pool = search_pool or pool
+    slot = None
+    if parent_process() is None and search_pool.workers > 1:
+        slot = search_pool.acquire()
+    if slot is None:
+        return solver(board)
+    try:
+        tasks, solved = split(board, search_pool.workers * TASKS_PER_WORKER)
+        if not solved:
+            max_iterations, timeout = limits(board)
+            results = search_pool.run(
+                search_subtree,
+                [(cells, board.size, board.box_size, solver, slot, max_iterations, timeout)
+                 for cells in tasks],
+                slot, lambda results: any(result[0] == 'solved' for result in results),
+                board.budget)
+            board.iterations += sum(result[2] for result in results)
+            solved = [result[1] for result in results if result[0] == 'solved']
+            if not solved and any(result[0] == 'exhausted' for result in results):
+                raise BudgetExceeded(board.iterations, board.budget.elapsed())
+    finally:
+        search_pool.release(slot)
+    if not solved:
+        return False
+    for cell, number in enumerate(solved[0]):
+        if board.cells[cell] == 0:
+            board.place(number, divmod(cell, board.size))
+    return True
+
+
+def count_solutions(board: Board, limit: int = 2, budget: int = None,
+                    search_pool: SearchPool = None) -> int or None:
+    """ Function to count the solutions of Board, counting the subtrees below its top
+        branch points in parallel with Dancing Links and adding up their counts,
+        stopping once limit is reached. The node budget applies to every subtree.
+        Returns None if a subtree used up its node budget before a verdict was reached. """
+    search_pool = search_pool or pool
+    slot = None
+    if parent_process() is None and search_pool.workers > 1:
+        slot = search_pool.acquire()
+    if slot is None:
+        return dlx.count_solutions(board, limit, budget)
+    try:
+        tasks, solved = split(board, search_pool.workers * TASKS_PER_WORKER)
+        count = len(solved)
+        results = []
+        if tasks and count < limit:
+            timeout = limits(board)[1]
+            results = search_pool.run(
+                count_subtree,
+                [(cells, board.size, board.box_size, slot, limit, budget, timeout)
+                 for cells in tasks],
+                slot, lambda results: count + sum(result[1] for result in results) >= limit,
+                board.budget)
+            board.iterations += sum(result[2] for result in results)
+            count += sum(result[1] for result in results)
+    finally:
+        search_pool.release(slot)
+    if count >= limit:
+        return limit
+    if any(result[0] != 'counted' for result in results):
+        return None
+    return count
@@ -0,0 +1,176 @@
+""" Work queue driven constraint propagation for Sudoku boards. """
+from collections import deque
+from itertools import combinations
+
+RULES = ('naked_single', 'hidden_single', 'naked_pair', 'naked_triple')
+
+
+class Propagator:
+    """ Class to propagate constraints on a Board incrementally.
+    Candidates are kept as bitsets, bit n set meaning value n is still possible.
+    When a cell is fixed only its peers are revisited, and only the units
+    which changed are searched for hidden singles and naked pairs/triples.
+
+    Attributes
+    ----------
+    board : Board
+        Board to propagate, filled cells are placed on it directly.
+    candidates : list[int]
+        Candidate bitset of every cell in row major order, 0 for filled cells.
+    units : tuple[tuple[int]]
+        Cells of every row, column and box, shared with the geometry of the board.
+    cell_units : tuple[tuple[int, int, int]]
+        Row, column and box unit of every cell, shared with the geometry of the board.
+    peers : tuple[tuple[int]]
+        Cells sharing a unit with every cell, shared with the geometry of the board.
+    rules : dict[str, int]
+        Number of times each rule fired.
+    pruned : int
+        Number of candidates eliminated.
+    contradiction : bool
+        True if propagation found a cell or unit without candidates.
+
+    Methods
+    -------
+    assign(self, cell, num)
+        Fixes a value in a cell and queues it for propagation.
+    eliminate(self, cell, bits)
+        Removes candidates from a cell.
+    run(self)
+        Propagates until no rule fires and returns the number of passes.
+    create_mask(self)
+        Returns the candidates in the Board mask format.
+
+    """
+    def __init__(self, board):
+        self.board = board
+        size = board.size
+        self.size = size
+        self.units = board.geometry.units
+        self.cell_units = board.geometry.cell_units
+        self.peers = board.geometry.peers
+        self.candidates = [0 if number else board.candidates(divmod(cell, size))
+                           for cell, number in enumerate(board.cells)]
+        self.rules = dict.fromkeys(RULES, 0)
+        self.pruned = 0
+        self.contradiction = False
+        self.queue = deque()
+        self.dirty = set(range(len(self.units)))
+        for cell, candidates in enumerate(self.candidates):
+            self.check_cell(cell, candidates)
+
+    def check_cell(self, cell: int, candidates: int):
+        """ Method to queue naked singles and flag cells without candidates. """
+        if candidates and not candidates & (candidates - 1):
+            self.queue.append((cell, candidates.bit_length() - 1))
+        elif not candidates and not self.board.cells[cell]:
+            self.contradiction = True
+
+    def assign(self, cell: int, num: int):
+        """ Method to fix a value in a cell and queue it for propagation. """
+        self.candidates[cell] = 0
+        self.board.place(num, divmod(cell, self.size))
+        self.dirty.update(self.cell_units[cell])
+        bit = 1 << num
+        for peer in self.peers[cell]:
+            if self.candidates[peer] & bit:
+                self.eliminate(peer, bit)
+
+    def eliminate(self, cell: int, bits: int):
+        """ Method to remove candidates from a cell. """
+        candidates = self.candidates[cell] & ~bits
+        self.pruned += bin(self.candidates[cell] & bits).count('1')
+        self.candidates[cell] = candidates
+        self.dirty.update(self.cell_units[cell])
+        self.check_cell(cell, candidates)
+
+    def propagate_singles(self):
+        """ Method to place queued naked singles until the queue is empty. """
+        while self.queue and not self.contradiction:
+            cell, num = self.queue.popleft()
+            if self.candidates[cell] != 1 << num:
+                # Already placed, or emptied by a conflicting single
+                if not self.board.cells[cell]:
+                    self.contradiction = True
+                continue
+            self.rules['naked_single'] += 1
+            self.assign(cell, num)
+
+    def used(self, unit: int) -> int:
+        """ Method to return the bitset of values already placed in a unit. """
+        if unit < self.size:
+            return self.board.rows_used[unit]
+        if unit < 2 * self.size:
+            return self.board.cols_used[unit - self.size]
+        return self.board.boxes_used[unit - 2 * self.size]
+
+    def hidden_singles(self, unit: int):
+        """ Method to place values which have a single possible cell in a unit. """
+        once = twice = 0
+        for cell in self.units[unit]:
+            twice |= once & self.candidates[cell]
+            once |= self.candidates[cell]
+        used = self.used(unit)
+        full = ((1 << (self.size + 1)) - 1) ^ 1
+        if (once | used) != full:
+            self.contradiction = True
+            return
+        hidden = once & ~twice & ~used
+        while hidden and not self.contradiction:
+            bit = hidden & -hidden
+            hidden ^= bit
+            for cell in self.units[unit]:
+                if self.candidates[cell] == bit:
+                    # Already queued as a naked single
+                    break
+                if self.candidates[cell] & bit:
+                    self.rules['hidden_single'] += 1
+                    self.candidates[cell] = bit
+                    self.queue.append((cell, bit.bit_length() - 1))
+                    break
+
+    def naked_subsets(self, unit: int):
+        """ Method to eliminate naked pairs and triples from the rest of a unit. """
+        cells = [cell for cell in self.units[unit] if self.candidates[cell]]
+        for count, rule in ((2, 'naked_pair'), (3, 'naked_triple')):
+            small = [cell for cell in cells if bin(self.candidates[cell]).count('1') <= count]
+            for subset in combinations(small, count):
+                union = 0
+                for cell in subset:
+                    union |= self.candidates[cell]
+                if bin(union).count('1') != count:
+                    continue
+                fired = False
+                for cell in cells:
+                    if cell not in subset and self.candidates[cell] & union:
+                        fired = True
+                        self.eliminate(cell, union)
+                if fired:
+                    self.rules[rule] += 1
+
+    def run(self) -> int:
+        """ Method to propagate until no rule fires.
+            Returns the number of passes over the changed units. """
+        passes = 0
+        while (self.queue or self.dirty) and not self.contradiction:
+            passes += 1
+            if self.board.budget is not None:
+                self.board.budget.spend(0)
+            self.propagate_singles()
+            units, self.dirty = self.dirty, set()
+            for unit in units:
+                if not self.contradiction:
+                    self.hidden_singles(unit)
+            if self.queue or self.contradiction:
+                # Place the hidden singles before looking for subsets
+                self.dirty.update(units)
+                continue
+            for unit in units:
+                self.naked_subsets(unit)
+        return passes
+
+    def create_mask(self) -> list[int]:
+        """ Method to return the candidates in the Board mask format,
+            the bit of the placed value for filled cells, the candidate bitset otherwise. """
+        return [1 << number if number else candidates
+                for number, candidates in zip(self.board.cells, self.candidates)]
@@ -0,0 +1,389 @@
+""" Backtracking search with pluggable branching and value ordering strategies. """
+from collections import namedtuple
+from heapq import heapify, heappop, heappush
+from random import Random
+
+BRANCHING = ('first', 'static', 'mrv', 'mrv_degree', 'wdeg')
+VALUE_ORDERS = ('common', 'lcv', 'random')
+RESTART_BASE = 32
+STALE_LIMIT = 4
+
+Strategy = namedtuple('Strategy', ['branching', 'values', 'restarts'])
+Strategy.__doc__ = """ Configuration of the backtracking search.
+
+    Attributes
+    ----------
+    branching : str
+        How the next cell is picked, one of BRANCHING:
+        first empty cell, the static order of Board.find_min_empty_new, fewest candidates,
+        fewest candidates with ties broken by most empty peers, or fewest candidates
+        relative to the weight of the units which caused dead ends.
+    values : str
+        Order the values of the cell are tried in, one of VALUE_ORDERS:
+        most common clues first, least constraining value first, or random.
+    restarts : bool
+        Whether the search restarts from the root after a growing number of dead ends,
+        only with the wdeg branching or the random value order.
+
+    """
+
+DEFAULT_STRATEGY = Strategy('wdeg', 'common', False)
+
+
+class Restart(Exception):
+    """ Exception raised to unwind the search to the root once its dead end limit is reached. """
+
+
+def parse_strategy(spec: str) -> Strategy:
+    """ Function to parse a strategy written as slash separated parts, like "wdeg/lcv/restarts".
+        Every part is a branching heuristic, a value order or "restarts", in any order,
+        parts left out keep the value of DEFAULT_STRATEGY.
+        Raises ValueError on an unknown part. """
+    branching, values, restarts = DEFAULT_STRATEGY
+    for part in filter(None, spec.split('/')):
+        if part in BRANCHING:
+            branching = part
+        elif part in VALUE_ORDERS:
+            values = part
+        elif part == 'restarts':
+            restarts = True
+        else:
+            raise ValueError(f"Unknown search strategy {part!r}.")
+    return Strategy(branching, values, restarts)
+
+
+def luby(index: int) -> int:
+    """ Function to return the term of the Luby sequence 1, 1, 2, 1, 1, 2, 4, ... at index,
+        counting from 0. """
+    size, power = 1, 0
+    while size < index + 1:
+        size, power = 2 * size + 1, power + 1
+    while size - 1 != index:
+        size, power = (size - 1) >> 1, power - 1
+        index %= size
+    return 1 << power
+
+
+class Search:
+    """ Class to solve a Board with backtracking configured by a Strategy.
+    The candidates of every empty cell are kept up to date as values are placed and removed,
+    only the peers of the cell change, so the search checks forward for free: a placement
+    leaving a peer without candidates is undone at once. The strategies pick from counters
+    maintained the same way, so no node rescans the board or sorts the mask: cells are bucketed
+    by their number of candidates, and also by their degree for mrv_degree, so mrv and
+    mrv_degree take the first cell of the first bucket which is not empty. The wdeg ratios
+    change with every dead end, they are kept in a heap whose stale entries are dropped when
+    they surface, a logarithmic cost amortized over the updates.
+
+    Attributes
+    ----------
+    board : Board
+        Board to solve, values are placed on it directly.
+    strategy : Strategy
+        Branching heuristic, value order and restart policy.
+    random : Random
+        Source of the random value order.
+    candidates : list[int]
+        Candidate bitset of every cell in row major order, 0 for the cells filled beforehand.
+    counts : list[int]
+        Number of candidates of every cell.
+    buckets : list[set[int]]
+        Empty cells by their number of candidates.
+    degree : list[int]
+        Number of empty peers of every cell.
+    ties : list[list[set[int]]]
+        Empty cells by their number of candidates and their degree, only for mrv_degree.
+    cell_weights : list[int]
+        Sum of the weights of the units of every cell, the weight of a unit grows
+        every time one of its cells runs out of candidates.
+    heap : list[tuple[float, int, int]]
+        Ratio of candidates to weight, stamp and cell of the empty cells, only for wdeg.
+    stamps : list[int]
+        Stamp of the current heap entry of every cell, older entries are stale.
+    pushes : int
+        Number of heap entries pushed, the stamp of the last one.
+    support : list[list[int]]
+        Number of empty cells of every unit with each value as a candidate.
+    open : int
+        Number of empty cells.
+    failures : int
+        Number of dead ends since the last restart.
+    limit : int
+        Number of dead ends allowed before restarting, None without restarts.
+    restarts : int
+        Number of restarts.
+
+    Methods
+    -------
+    reset(self)
+        Recomputes the candidates and counters from the board.
+    pick(self)
+        Returns the empty cell to branch on.
+    values(self, cell)
+        Returns the candidates of a cell in the order to try them.
+    place(self, cell, num)
+        Places a value and removes it from the candidates of the peers.
+    undo(self, cell, num, changed)
+        Removes a value placed by place and restores the candidates of the peers.
+    touch(self, cell, count, degree)
+        Moves a cell whose number of candidates or degree changed for the branching heuristic.
+    push(self, cell)
+        Queues an empty cell in the wdeg heap under its current ratio.
+    update_support(self, cell, delta)
+        Adds delta to the support of the candidates of a cell.
+    conflict(self, cell)
+        Records a dead end at a cell without candidates.
+    search(self, depth)
+        Solves the board with recursive backtracking.
+    run(self)
+        Solves the board, restarting if the strategy asks for it.
+
+    """
+    def __init__(self, board, strategy: Strategy = DEFAULT_STRATEGY, seed: int = None):
+        self.board = board
+        self.strategy = strategy
+        self.random = Random(seed)
+        self.cell_weights = [3] * len(board.cells)
+        self.pushes = 0
+        self.failures = 0
+        self.limit = None
+        self.restarts = 0
+        self.reset()
+
+    def reset(self):
+        """ Method to recompute the candidates and counters from the board, the weights
+            of the cells are kept so a restart branches on the cells which failed before. """
+        board = self.board
+        cells, size, peers = board.cells, board.size, board.geometry.peers
+        self.candidates = [board.mask[cell] & board.candidates(divmod(cell, size)) if not number
+                           else 0 for cell, number in enumerate(cells)]
+        self.counts = [bin(bits).count('1') for bits in self.candidates]
+        self.degree = [sum(1 for peer in peers[cell] if not cells[peer])
+                       for cell in range(len(cells))]
+        empty = [cell for cell, number in enumerate(cells) if not number]
+        self.buckets = [set() for _ in range(size + 1)]
+        for cell in empty:
+            self.buckets[self.counts[cell]].add(cell)
+        self.ties = None
+        if self.strategy.branching == 'mrv_degree':
+            self.ties = [[set() for _ in range(len(peers[0]) + 1)] for _ in range(size + 1)]
+            for cell in empty:
+                self.ties[self.counts[cell]][self.degree[cell]].add(cell)
+        self.heap = []
+        self.stamps = [0] * len(cells)
+        if self.strategy.branching == 'wdeg':
+            for cell in empty:
+                self.push(cell)
+        self.support = [[0] * (size + 1) for _ in board.geometry.units]
+        if self.strategy.values == 'lcv':
+            for cell, bits in enumerate(self.candidates):
+                for unit in board.geometry.cell_units[cell]:
+                    for num in range(1, size + 1):
+                        self.support[unit][num] += bits >> num & 1
+        self.open = len(empty)
+
+    def pick(self) -> int:
+        """ Method to return the empty cell to branch on, following the branching heuristic.
+            Only called with empty cells left, none of them without candidates. """
+        branching = self.strategy.branching
+        if branching == 'first':
+            return self.board.cells.find(0)
+        if branching == 'static':
+            row, col = self.board.find_min_empty_new()
+            return row * self.board.size + col
+        if branching == 'wdeg':
+            heap, stamps, cells = self.heap, self.stamps, self.board.cells
+            while True:
+                _, stamp, cell = heap[0]
+                if stamps[cell] == stamp and not cells[cell]:
+                    return cell
+                heappop(heap)
+        count = next(count for count, bucket in enumerate(self.buckets) if bucket)
+        if branching == 'mrv_degree':
+            return next(iter(next(tie for tie in reversed(self.ties[count]) if tie)))
+        return next(iter(self.buckets[count]))
+
+    def values(self, cell: int) -> list[int]:
+        """ Method to return the candidates of a cell in the order of the value strategy. """
+        bits = self.candidates[cell]
+        values = [num for num in self.board.most_common_clues if bits >> num & 1]
+        order = self.strategy.values
+        if order == 'lcv':
+            # The value left as a candidate by the fewest other cells of its units goes first
+            support, units = self.support, self.board.geometry.cell_units[cell]
+            values.sort(key=lambda num: sum(support[unit][num] for unit in units))
+        elif order == 'random':
+            self.random.shuffle(values)
+        return values
+
+    def place(self, cell: int, num: int) -> list[int]:
+        """ Method to place a value in an empty cell and remove it from the candidates
+            of the empty peers. Returns the peers which lost the value, for undo. """
+        board = self.board
+        cells, candidates, counts, buckets = board.cells, self.candidates, self.counts, self.buckets
+        degree, support, cell_units = self.degree, self.support, board.geometry.cell_units
+        lcv = self.strategy.values == 'lcv'
+        touch = self.touch if self.strategy.branching in ('mrv_degree', 'wdeg') else None
+        bit = 1 << num
+        buckets[counts[cell]].discard(cell)
+        if self.ties is not None:
+            self.ties[counts[cell]][degree[cell]].discard(cell)
+        if lcv:
+            self.update_support(cell, -1)
+        changed = []
+        for peer in board.geometry.peers[cell]:
+            if cells[peer]:
+                continue
+            count = counts[peer]
+            degree[peer] -= 1
+            if candidates[peer] & bit:
+                candidates[peer] ^= bit
+                buckets[count].discard(peer)
+                buckets[count - 1].add(peer)
+                counts[peer] = count - 1
+                changed.append(peer)
+                if lcv:
+                    for unit in cell_units[peer]:
+                        support[unit][num] -= 1
+            if touch is not None:
+                touch(peer, count, degree[peer] + 1)
+        board.place(num, divmod(cell, board.size))
+        self.open -= 1
+        return changed
+
+    def undo(self, cell: int, num: int, changed: list[int]):
+        """ Method to remove a value placed by place and give it back to the peers
+            which lost it. Placements are undone in the reverse order. """
+        board = self.board
+        candidates, counts, buckets = self.candidates, self.counts, self.buckets
+        support, cell_units = self.support, board.geometry.cell_units
+        lcv = self.strategy.values == 'lcv'
+        touch = self.touch if self.strategy.branching in ('mrv_degree', 'wdeg') else None
+        bit = 1 << num
+        board.remove(divmod(cell, board.size))
+        self.open += 1
+        cells, degree = board.cells, self.degree
+        lost = set(changed)
+        for peer in board.geometry.peers[cell]:
+            if cells[peer]:
+                continue
+            count = counts[peer]
+            degree[peer] += 1
+            if peer in lost:
+                candidates[peer] |= bit
+                buckets[count].discard(peer)
+                buckets[count + 1].add(peer)
+                counts[peer] = count + 1
+                if lcv:
+                    for unit in cell_units[peer]:
+                        support[unit][num] += 1
+            if touch is not None:
+                touch(peer, count, degree[peer] - 1)
+        buckets[counts[cell]].add(cell)
+        if self.ties is not None:
+            self.ties[counts[cell]][degree[cell]].add(cell)
+        if self.strategy.branching == 'wdeg':
+            self.push(cell)
+        if lcv:
+            self.update_support(cell, 1)
+
+    def touch(self, cell: int, count: int, degree: int):
+        """ Helper method to move an empty cell which had count candidates and degree empty
+            peers to the bucket of its current ones, or to queue it again in the wdeg heap. """
+        if self.ties is not None:
+            self.ties[count][degree].discard(cell)
+            self.ties[self.counts[cell]][self.degree[cell]].add(cell)
+        elif count != self.counts[cell]:
+            self.push(cell)
+
+    def push(self, cell: int):
+        """ Helper method to queue an empty cell in the wdeg heap under its current ratio of
+            candidates to weight. Its older entries become stale, the heap is rebuilt from the
+            current entries once the stale ones outnumber the cells STALE_LIMIT times. """
+        self.pushes += 1
+        self.stamps[cell] = self.pushes
+        heappush(self.heap, (self.counts[cell] / self.cell_weights[cell], self.pushes, cell))
+        if len(self.heap) > STALE_LIMIT * len(self.stamps):
+            stamps, cells = self.stamps, self.board.cells
+            self.heap = [entry for entry in self.heap
+                         if stamps[entry[2]] == entry[1] and not cells[entry[2]]]
+            heapify(self.heap)
+
+    def update_support(self, cell: int, delta: int):
+        """ Helper method to add delta to the support of the candidates of a cell in its units. """
+        bits = self.candidates[cell]
+        for unit in self.board.geometry.cell_units[cell]:
+            counts = self.support[unit]
+            for num in range(1, self.board.size + 1):
+                if bits >> num & 1:
+                    counts[num] += delta
+
+    def conflict(self, cell: int):
+        """ Method to record a dead end at a cell left without candidates.
+            The weights of its units grow for the weighted degree heuristic,
+            and the search restarts once the dead end limit is reached. """
+        if self.strategy.branching == 'wdeg':
+            cells, cell_weights = self.board.cells, self.cell_weights
+            units, heavier = self.board.geometry.units, set()
+            for unit in self.board.geometry.cell_units[cell]:
+                for member in units[unit]:
+                    cell_weights[member] += 1
+                    if not cells[member]:
+                        heavier.add(member)
+            for member in heavier:
+                self.push(member)
+        self.failures += 1
+        if self.limit is not None and self.failures >= self.limit:
+            raise Restart()
+
+    def search(self, depth: int = 0) -> bool:
+        """ Method to solve the board with backtracking, depth is the number of values placed.
+            Raises BudgetExceeded if the budget of the Board is used up. """
+        board = self.board
+        board.iterations += 1
+        if depth > board.max_depth:
+            board.max_depth = depth
+        if board.budget is not None:
+            board.budget.spend()
+        if not self.open:
+            return True
+        if self.buckets[0]:
+            self.conflict(next(iter(self.buckets[0])))
+            return False
+
+        cell = self.pick()
+        for num in self.values(cell):
+            changed = self.place(cell, num)
+            if self.buckets[0]:
+                self.conflict(next(iter(self.buckets[0])))
+            elif self.search(depth + 1):
+                return True
+            self.undo(cell, num, changed)
+        return False
+
+    def run(self) -> bool:
+        """ Method to solve the board, returns True if solved, False otherwise.
+            With restarts the search starts over from the initial board every time the number
+            of dead ends reaches RESTART_BASE times the next term of the Luby sequence,
+            keeping the unit weights and drawing a new random value order. Other strategies
+            would repeat the same search after a restart, so they never restart. """
+        strategy = self.strategy
+        varies = strategy.branching == 'wdeg' or strategy.values == 'random'
+        if not strategy.restarts or not varies:
+            return self.search()
+        state = self.board.snapshot()
+        while True:
+            self.limit = RESTART_BASE * luby(self.restarts)
+            self.failures = 0
+            try:
+                return self.search()
+            except Restart:
+                self.restarts += 1
+                self.board.restore(state)
+                self.reset()
+
+
+def solve(board, strategy: Strategy = DEFAULT_STRATEGY, seed: int = None) -> bool:
+    """ Function to solve Board in place with the backtracking search configured by strategy.
+        Returns True if solved, False otherwise. """
+    return Search(board, strategy, seed).run()
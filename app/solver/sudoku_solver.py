@@ -1,36 +1,76 @@
 """ Sudoku board Class and solver logic. """
-from copy import deepcopy
-from random import choice
+from random import getrandbits
+from ..codec import DIGITS
+from . import search
+from .geometry import geometry
+from .propagation import Propagator
 
 
 class Board:
     """ Class to represent Sudoku board, with various attributes and methods necessary for solving.
+    The cells are kept in a flat row major bytearray and the candidates as bitsets,
+    bit n set meaning value n is possible, so a board is a handful of compact objects
+    which can be saved and restored without copying nested lists.
+    Boards are created from a list of rows or from a flat row major sequence of cells.
 
     Attributes
     ----------
-    board : list[list[int]]
-        2D list representing the Sudoku board.
+    cells : bytearray
+        Values of the cells in row major order, 0 for empty cells.
     size : int
         Size of the board.
     box_size : int
         Size of the box.
+    geometry : Geometry
+        Peer and unit index tables shared by every board of the same size.
     dimensions : tuple[int]
         Dimensions of the board.
+    full : int
+        Bitset of every value allowed on the board.
     iterations : int
         Number of iterations the solver has gone through.
     clues : dict[int, int]
         Dictionary of clues on the board.
     most_common_clues : list[int]
         List of most common clues on the board.
-    mask : list[list[list[int]]]
-        2D list representing the possible valid values mask of the board.
+    mask : list[int]
+        Bitsets of the possible valid values of every cell in row major order,
+        the bit of the value for filled cells.
+    order : list[int]
+        Cells in the order they are picked by find_min_empty_new, None until first needed.
+    rows_used : list[int]
+        Bitsets of the values already used in each row.
+    cols_used : list[int]
+        Bitsets of the values already used in each column.
+    boxes_used : list[int]
+        Bitsets of the values already used in each box.
+    rules : dict[str, int]
+        Number of times each propagation rule fired during preprocessing.
+    pruned : int
+        Number of candidates eliminated during preprocessing.
+    max_depth : int
+        Deepest level reached by the search.
+    budget : Budget
+        Iteration and time limit of the solver run, None for no limit.
 
     Methods
     -------
     __repr__(self)
         Returns a string representation of the board.
+    board(self)
+        Returns the rows of the board as lists.
     valid(self, num, pos)
         Checks if a given value is valid for the current position.
+    candidates(self, pos)
+        Returns the bitset of values which are valid for the current position.
+    place(self, num, pos)
+        Places a value on the board and marks it as used in its row, column and box.
+    remove(self, pos)
+        Removes a value from the board and releases it in its row, column and box.
+    snapshot(self)
+        Returns the cells and used value bitsets of the board.
+    restore(self, state)
+        Restores the cells and used value bitsets returned by snapshot.
     find_empty(self)
         Finds the empty field on the board.
     find_min_empty(self)
@@ -41,36 +81,64 @@ class Board:
         Sets the clues on the board.
     set_most_common_clues(self)
         Finds and sets the most common clues on the board.
+    create_used_sets(self)
+        Creates the row, column and box bitsets of used values.
     create_mask(self)
         Creates the mask of possible valid values for the board.
+    solve(self)
+        Solves the board with recursive backtracking.
+    solve_iterative(self)
+        Solves the board with backtracking on an explicit stack.
 
     """
-    def __init__(self, board: list[list[int]], size: int, box_size: int, dimensions: tuple[int]):
-        self.board = board
+    __slots__ = ('cells', 'size', 'box_size', 'geometry', 'dimensions', 'full', 'iterations',
+                 'rows_used', 'cols_used', 'boxes_used', 'clues', 'most_common_clues',
+                 'mask', 'order', 'rules', 'pruned', 'max_depth', 'budget')
+
+    def __init__(self, board: list, size: int, box_size: int, dimensions: tuple[int]):
+        if board and isinstance(board[0], list):
+            board = [number for row in board for number in row]
+        self.cells = bytearray(board)
         self.size = size
         self.box_size = box_size
+        self.geometry = geometry(size, box_size)
         self.dimensions = dimensions
+        self.full = ((1 << dimensions[1]) - 1) ^ ((1 << dimensions[0]) - 1)
         self.iterations = 0
+        self.rows_used, self.cols_used, self.boxes_used = self.create_used_sets()
         self.clues = self.set_clues()
         self.most_common_clues = self.set_most_common_clues()
         self.mask = self.create_mask()
+        self.order = None
+        self.rules = {}
+        self.pruned = 0
+        self.max_depth = 0
+        self.budget = None
 
     def __repr__(self):
+        # One character per value, base-36 digits above 9, so boxes line up on every size
+        width = 2 * self.size - 1 + 3 * (self.box_size - 1)
         to_print = str()
-        for i in range(self.size):
+        for i, row in enumerate(self.board):
             if i % self.box_size == 0 and i != 0:
-                to_print += '- - - - - - - - - - - -\n'
+                to_print += ('- ' * width)[:width] + '\n'
 
-            for j in range(self.size):
+            for j, number in enumerate(row):
                 if j % self.box_size == 0 and j != 0:
                     to_print += ' | '
 
                 if j == (self.size - 1):
-                    to_print += str(self.board[i][j]) + '\n'
+                    to_print += DIGITS[number] + '\n'
                 else:
-                    to_print += str(self.board[i][j]) + ' '
+                    to_print += DIGITS[number] + ' '
         return to_print
 
+    @property
+    def board(self) -> list[list[int]]:
+        """ Rows of the board as lists, a copy of the cells. """
+        size = self.size
+        return [list(self.cells[i * size:(i + 1) * size]) for i in range(size)]
+
     def valid(self, num: int, pos: tuple[int, int]) -> bool:
         """ Method to check if a given value is valid for the current position.
             Returns True if valid, False otherwise.
@@ -88,24 +156,61 @@ class Board:
                 True if valid, False otherwise.
 
             """
-        # Check row
-        if num in self.board[pos[0]]:
-            return False
+        bit = 1 << num
+        return not bit & (self.rows_used[pos[0]]
+                          | self.cols_used[pos[1]]
+                          | self.boxes_used[self.box_index(pos)])
 
-        # Check column
-        if num in [item[pos[1]] for item in self.board]:
-            return False
+    def box_index(self, pos: tuple[int, int]) -> int:
+        """ Method to return the index of the box containing the given position. """
+        return self.geometry.boxes[pos[0] * self.size + pos[1]]
 
-        # Check box
-        box_x = pos[1] // self.box_size
-        box_y = pos[0] // self.box_size
+    def candidates(self, pos: tuple[int, int]) -> int:
+        """ Method to return the bitset of values which are valid for the given position.
+            Bit n is set if value n can be placed at the position.
 
-        for i in range(box_y * self.box_size, box_y * self.box_size + self.box_size):
-            if num in self.board[i][box_x * self.box_size: box_x * self.box_size + self.box_size] \
-                    and (i, self.board[i].index(num)) != pos:
-                return False
+            Parameters
+            ----------
+            pos : tuple[int, int]
+                Position to check.
 
-        return True
+            Returns
+            -------
+            int
+                Bitset of valid values.
+
+            """
+        return self.full & ~(self.rows_used[pos[0]]
+                             | self.cols_used[pos[1]]
+                             | self.boxes_used[self.box_index(pos)])
+
+    def place(self, num: int, pos: tuple[int, int]):
+        """ Method to place a value on the board and mark it as used
+            in the row, column and box of the given position. """
+        bit = 1 << num
+        self.cells[pos[0] * self.size + pos[1]] = num
+        self.rows_used[pos[0]] |= bit
+        self.cols_used[pos[1]] |= bit
+        self.boxes_used[self.box_index(pos)] |= bit
+
+    def remove(self, pos: tuple[int, int]):
+        """ Method to remove the value at the given position from the board
+            and release it in the row, column and box of the position. """
+        cell = pos[0] * self.size + pos[1]
+        bit = ~(1 << self.cells[cell])
+        self.cells[cell] = 0
+        self.rows_used[pos[0]] &= bit
+        self.cols_used[pos[1]] &= bit
+        self.boxes_used[self.box_index(pos)] &= bit
+
+    def snapshot(self) -> tuple:
+        """ Method to save the cells and used value bitsets of the board,
+            to be restored after trying placements. """
+        return bytes(self.cells), self.rows_used[:], self.cols_used[:], self.boxes_used[:]
+
+    def restore(self, state: tuple):
+        """ Method to restore the cells and used value bitsets saved by snapshot. """
+        self.cells[:], self.rows_used[:], self.cols_used[:], self.boxes_used[:] = state
 
     def find_empty(self) -> tuple[int, int] or None:
         """ Method to find empty field on board.
@@ -118,10 +223,10 @@ class Board:
                 If no empty field found.
 
             """
-        for i, row in enumerate(self.board):
-            if 0 in row:
-                return i, row.index(0)  # row, column
-        return None
+        cell = self.cells.find(0)
+        if cell < 0:
+            return None
+        return divmod(cell, self.size)  # row, column
 
     def find_min_empty(self) -> tuple[int, int] or None:
         """ Method to find empty field where the number of possible valid values is the smallest.
@@ -134,27 +239,38 @@ class Board:
                 If no empty field found.
 
             """
-        def is_list(item):
-            return bool(isinstance(item, list))
-
-        min_len_list = [0, list(range(1, self.size + 1))]
-        for i, row in enumerate(self.mask):
-            if len(list(filter(is_list, row))) >= 1:
-                sorted_sets = sorted(filter(is_list, row), key=len)
-                for j, shortest in enumerate(sorted_sets):
-                    if self.board[i][row.index(shortest)] == 0:
-                        if len(min_len_list[1]) > len(sorted_sets[j]):
-                            min_len_list[0] = i
-                            min_len_list[1] = sorted_sets[j]
-                            break
-
-        if min_len_list != [0, list(range(1, self.size + 1))]:
-            return min_len_list[0], self.mask[min_len_list[0]].index(min_len_list[1])  # row, col
+        best, best_count = None, self.size + 1
+        for cell, number in enumerate(self.cells):
+            if number == 0 and self.mask[cell]:
+                count = bin(self.mask[cell]).count('1')
+                if count < best_count:
+                    best, best_count = cell, count
+        if best is not None:
+            return divmod(best, self.size)  # row, col
         return self.find_empty()
 
+    def search_order(self) -> list[int]:
+        """ Method to order the cells with possible values for find_min_empty_new.
+            Rows come in ascending order of the longest mask in them, cells within a row in
+            descending order of mask length. Only the first of equal masks in a row is kept. """
+        size = self.size
+        order = []
+        for i in range(size):
+            masks = self.mask[i * size:(i + 1) * size]
+            row = [i * size + j for j, bits in enumerate(masks)
+                   if bits and not self.cells[i * size + j] and masks.index(bits) == j]
+            if row:
+                counts = {cell: bin(self.mask[cell]).count('1') for cell in row}
+                order.append((max(counts.values()), sorted(row, key=counts.get, reverse=True)))
+        order.sort(key=lambda item: item[0])
+        return [cell for _, row in order for cell in row]
+
     def find_min_empty_new(self) -> tuple[int, int] or None:
         """ Method to find empty location to be filled in Sudoku,
             where the number of possible values is optimal.
+            The order of the cells is computed once from the mask and reused until it changes.
+            Boards larger than 9x9 pick the cell with the fewest valid values at every step,
+            a fixed order leaves too many of their values unconstrained.
 
             Returns
             -------
@@ -164,189 +280,212 @@ class Board:
                 If no empty field found.
 
             """
+        if self.size > 9:
+            return self.find_fewest_candidates()
+        if self.order is None:
+            self.order = self.search_order()
+        cells = self.cells
+        for cell in self.order:
+            if not cells[cell]:
+                return divmod(cell, self.size)
 
-        def not_zero_element_list(item) -> bool:
-            """ Returns True if item is a list with at least one element. """
-            return bool(isinstance(item, list) and len(item) != 0)
-
-        shortest_cue_lists = {}
-        for y_pos, row in enumerate(self.mask):
-            sorted_lists = sorted(filter(not_zero_element_list, row), key=len, reverse=True)
-            if len(sorted_lists) >= 1:
-                for item in sorted_lists:
-                    shortest_cue_lists[(y_pos, row.index(item))] = len(sorted_lists[0])
+        return self.find_empty()
 
-        shortest_cue_lists = dict(sorted(shortest_cue_lists.items(), key=lambda item: item[1]))
+    def find_fewest_candidates(self) -> tuple[int, int] or None:
+        """ Method to find the empty field with the fewest values which are valid
+            in the current position and allowed by the mask.
 
-        for coordinate in shortest_cue_lists.keys():
-            if self.board[coordinate[0]][coordinate[1]] == 0:
-                return coordinate[0], coordinate[1]
+            Returns
+            -------
+            tuple[int, int]
+                Row, col of empty field.
+            None
+                If no empty field found.
 
-        return self.find_empty()
+            """
+        size, cells, mask = self.size, self.cells, self.mask
+        rows_used, cols_used, boxes_used = self.rows_used, self.cols_used, self.boxes_used
+        boxes = self.geometry.boxes
+        best, best_count = None, size + 1
+        for cell, number in enumerate(cells):
+            if not number:
+                row, col = divmod(cell, size)
+                count = bin(mask[cell] & ~(rows_used[row] | cols_used[col]
+                                           | boxes_used[boxes[cell]])).count('1')
+                if count < best_count:
+                    best, best_count = cell, count
+                    if count <= 1:
+                        break
+        return divmod(best, size) if best is not None else None
 
     def set_clues(self) -> dict[int: int]:
         """ Method to set clues for Board.
             Returns a dictionary with clues and clue counts. """
-        clues = []
-        clue_dict = {}
-        for row in self.board:
-            for number in row:
-                if number != 0:
-                    clues.append(number)
-        for i in range(self.dimensions[0], self.dimensions[1]):
-            clue_dict[i] = clues.count(i)
-        return clue_dict
+        counts = [0] * max(self.dimensions[1], max(self.cells, default=0) + 1)
+        for number in self.cells:
+            counts[number] += 1
+        return {i: counts[i] for i in range(self.dimensions[0], self.dimensions[1])}
 
     def set_most_common_clues(self) -> list[int]:
         """ Method to calculate most common clues on the Board. """
-        mc_clues = []
-        for item in sorted(self.clues.items(), key=lambda x: x[1], reverse=True):
-            mc_clues.append(item[0])
-        if len(mc_clues) < 9:
-            missing = set(range(1, self.dimensions[1])).difference(mc_clues)
-            print(f"Missing: {missing}")
-            mc_clues += missing
-        return mc_clues
-
-    def create_mask(self) -> list[list[list[int]]]:
+        return sorted(self.clues, key=self.clues.get, reverse=True)
+
+    def create_used_sets(self) -> tuple[list[int], list[int], list[int]]:
+        """ Method to create the bitsets of values used in each row, column and box. """
+        rows_used = [0] * self.size
+        cols_used = [0] * self.size
+        boxes_used = [0] * self.size
+        for cell, number in enumerate(self.cells):
+            if number != 0:
+                i, j = divmod(cell, self.size)
+                bit = 1 << number
+                rows_used[i] |= bit
+                cols_used[j] |= bit
+                boxes_used[self.box_index((i, j))] |= bit
+        return rows_used, cols_used, boxes_used
+
+    def create_mask(self) -> list[int]:
         """ Method to create Mask of possible valid values for quicker solving. """
-        mask = deepcopy(self.board)
-        for i, row in enumerate(mask):
-            if 0 in row:
-                while 0 in row:
-                    zero_index = row.index(0)
-                    mask[i][zero_index] = []
-                    for number in range(self.dimensions[0], self.dimensions[1]):
-                        if self.valid(number, (i, zero_index)):
-                            mask[i][zero_index].append(number)
-            else:
-                for number in row:
-                    if number != 0:
-                        mask[i][row.index(number)] = [number]
-        return mask
+        return [1 << number if number else self.candidates(divmod(cell, self.size))
+                for cell, number in enumerate(self.cells)]
 
     def update_mask(self):
         """ Method to update Mask of possible values based on actual Board status. """
-        def is_more_than_one_long_list(item):
-            return bool(isinstance(item, list) and len(item) > 1)
-
-        for y_pos, row in enumerate(self.mask):
-            for numbers in filter(is_more_than_one_long_list, row):
-                x_pos = row.index(numbers)
-                to_mask = list()
-                to_remove = set()
-                for number in numbers:
-                    if not self.valid(number, (y_pos, x_pos)):
-                        to_remove.add(number)
-                for num in to_remove:
-                    self.mask[y_pos][x_pos].remove(num)
-                for num in self.most_common_clues:
-                    if num in self.mask[y_pos][x_pos]:
-                        to_mask.append(num)
-                self.mask[y_pos][x_pos] = to_mask
+        for cell, number in enumerate(self.cells):
+            if not number:
+                self.mask[cell] &= self.candidates(divmod(cell, self.size))
+        self.order = None
 
     def update_board(self):
         """ Method to update Board based on Mask of possible valid values. """
-        def masking(item):
-            return bool(isinstance(item, list) and len(item) == 1)
-
-        for i, row in enumerate(self.mask):
-            for number in filter(masking, row):
-                x_pos = row.index(number)
-                num = number.pop()
-                self.board[i][x_pos] = num
-                self.mask[i][x_pos] = num
-
-    def preprocess_board(self):
-        """ Method to preprocess Board before solving with backtracking. """
-        temp_board = deepcopy(self)
-        temp_board.mask = None
-        passes = 0
-        while temp_board.mask != self.mask:
-            passes += 1
-            temp_board = deepcopy(self)
-            self.update_board()
-            self.update_mask()
-
+        for cell, bits in enumerate(self.mask):
+            if not self.cells[cell] and bits and not bits & (bits - 1):
+                self.place(bits.bit_length() - 1, divmod(cell, self.size))
+
+    def preprocess_board(self) -> int:
+        """ Method to preprocess Board before solving with backtracking.
+            Applies naked singles, hidden singles and naked pairs/triples with a work queue,
+            so only the peers of fixed cells and the changed units are revisited.
+            Returns the number of propagation passes.
+            Raises BudgetExceeded if the budget of the Board runs out of time. """
+        propagator = Propagator(self)
+        passes = propagator.run()
+        self.rules = propagator.rules
+        self.pruned = propagator.pruned
+        self.mask = propagator.create_mask()
+        self.order = None
         return passes
 
-    def solve(self):
-        """ Method to solve Board with backtracking. """
+    def solve(self, depth: int = 0):
+        """ Method to solve Board with backtracking, depth is the number of values placed by it.
+            Raises BudgetExceeded if the budget of the Board is used up. """
         self.iterations += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+        if self.budget is not None:
+            self.budget.spend()
         pick = self.find_min_empty_new()
         if not pick:
             return True
         row, col = pick
 
-        for number in self.mask[row][col]:
+        bits = self.mask[row * self.size + col]
+        for number in self.most_common_clues:
             # ^ Only check for numbers in mask, in the order of most common cues
-            if self.valid(number, (row, col)):
-                self.board[row][col] = number
-                if self.solve():
+            if bits >> number & 1 and self.valid(number, (row, col)):
+                self.place(number, (row, col))
+                if self.solve(depth + 1):
                     return True
-                self.board[row][col] = 0
+                self.remove((row, col))
         return False
 
-    def generate(self):
-        """ Method to generate filled Board with backtracking. """
-        self.iterations += 1
-        pick = self.find_empty()
-        if not pick:
-            return True
-        row, col = pick
+    def solve_iterative(self) -> bool:
+        """ Method to solve Board with backtracking on an explicit stack instead of recursion,
+            so the search depth is not bound by the recursion limit on large boards.
+            The stack doubles as the undo trail: every entry holds a filled position
+            and the values still left to try there, backtracking removes the placement.
+            The empty field with the fewest valid values allowed by the mask is picked
+            at every step, values are tried in the order of most common clues.
 
-        for _ in self.mask[row][col]:
-            num = choice(list(self.mask[row][col]))
-            if self.valid(num, (row, col)):
-                self.board[row][col] = num
-                if self.solve():
-                    return True
-                self.board[row][col] = 0
-        return False
+            Returns
+            -------
+            bool
+                True if solved, False otherwise.
+
+            """
+        empty = [divmod(cell, self.size) for cell, number in enumerate(self.cells) if number == 0]
+        order = self.most_common_clues[::-1]
+        cells, mask = self.cells, self.mask
+        size = self.size
+        trail = []
+        while True:
+            self.iterations += 1
+            if self.budget is not None:
+                self.budget.spend()
+            depth = len(trail)
+            if depth > self.max_depth:
+                self.max_depth = depth
+            if depth == len(empty):
+                return True
+
+            best, best_count, best_candidates = depth, self.size + 1, 0
+            for k in range(depth, len(empty)):
+                row, col = empty[k]
+                candidates = mask[row * size + col] & self.candidates(empty[k])
+                count = bin(candidates).count('1')
+                if count < best_count:
+                    best, best_count, best_candidates = k, count, candidates
+                    if count <= 1:
+                        break
+            empty[depth], empty[best] = empty[best], empty[depth]
+            trail.append((empty[depth], [num for num in order if best_candidates >> num & 1]))
+
+            while trail:
+                pos, values = trail[-1]
+                if cells[pos[0] * size + pos[1]] != 0:
+                    self.remove(pos)
+                if values:
+                    self.place(values.pop(), pos)
+                    break
+                trail.pop()
+            else:
+                return False
+
+    def generate(self) -> bool:
+        """ Method to generate filled Board with backtracking,
+            trying the values of every field in random order, seeded from the random module. """
+        return search.solve(self, search.Strategy('mrv', 'random', False), seed=getrandbits(64))
 
     def validate_clue(self, num: int, pos: tuple[int, int]) -> bool:
         """ Method to check if a given clue is valid
             for the given position on the board.
-        
+
             Parameters
             ----------
             num : int
                 Clue to check.
             pos : tuple[int, int]
                 Position to check.
-            
+
             Returns
             -------
             bool
                 True if clue is valid, False otherwise.
-            
-            """
-        # Check row
-        if self.board[pos[0]].count(num) > 1:
-            return False
-
-        # Check column
-        column = [item[pos[1]] for item in self.board]
-        del column[pos[0]]
-        if num in column:
-            return False
-
-        # Check box
-        box_x = pos[1] // self.box_size
-        box_y = pos[0] // self.box_size
-
-        for i in range(box_y * self.box_size, box_y * self.box_size + self.box_size):
-            if num in self.board[i][box_x * self.box_size: box_x * self.box_size + self.box_size] \
-                    and (i, self.board[i].index(num)) != pos:
-                return False
 
-        return True
+            """
+        cells = self.cells
+        return all(cells[peer] != num for peer in self.geometry.peers[pos[0] * self.size + pos[1]])
 
     def check_solvable(self):
-        """ Method to check if a sudoku is possibly solvable. - To be improved!"""
-        for i, row in enumerate(self.board):
-            for j, value in enumerate(row):
-                if value in list(range(1, self.size + 1)):
-                    if not self.validate_clue(value, (i, j)):
+        """ Method to check if a sudoku is possibly solvable,
+            no value may appear twice in a row, column or box. """
+        cells = self.cells
+        for unit in self.geometry.units:
+            seen = 0
+            for cell in unit:
+                number = cells[cell]
+                if 1 <= number <= self.size:
+                    if seen >> number & 1:
                         return False
+                    seen |= 1 << number
         return True
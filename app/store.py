@@ -0,0 +1,250 @@
+""" Read-mostly on-disk store of known 9x9 solutions, memory-mapped and shared by every process. """
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+from itertools import islice
+from operator import itemgetter
+from threading import Lock
+
+MAGIC = b'SUDOKUS1'
+HEADER = struct.Struct('<8sQ')
+SIZE = 9
+PACKED = (SIZE * SIZE + 1) // 2
+RECORD = 2 * PACKED
+RUN = 1 << 16
+
+
+class StoreUnavailable(Exception):
+    """ Exception raised when the configured solution store cannot be opened. """
+
+
+def pack(cells) -> bytes:
+    """ Function to pack the 81 cells of a 9x9 board into 41 bytes, two cells per byte. """
+    cells = bytes(cells) + b'\0'
+    return bytes(high << 4 | low for high, low in zip(cells[0::2], cells[1::2]))
+
+
+def unpack(data: bytes) -> list[int]:
+    """ Function to unpack the cells of a 9x9 board packed by pack. """
+    cells = []
+    for byte in data:
+        cells += (byte >> 4, byte & 15)
+    return cells[:SIZE * SIZE]
+
+
+class SolutionStore:
+    """ Class to look up solutions in a file of packed puzzles and solutions in canonical form,
+    sorted by puzzle so a lookup is a binary search. The file is memory-mapped read only,
+    every process opening it shares the same pages, and is only written by write.
+
+    Attributes
+    ----------
+    path : str
+        Path of the store file.
+    count : int
+        Number of puzzles in the store.
+    hits : int
+        Number of lookups found in the store.
+    misses : int
+        Number of lookups not found in the store.
+
+    Methods
+    -------
+    get(self, form)
+        Returns the solution of a canonical 9x9 board, or None.
+    records(self)
+        Yields the stored puzzles and solutions.
+    packed(self)
+        Yields the stored puzzles and solutions as packed bytes.
+    stats(self)
+        Returns the store size and counters.
+    close(self)
+        Unmaps the file.
+
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.lock = Lock()
+        with open(path, 'rb') as file:
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = HEADER.unpack_from(self.mmap)
+        if magic != MAGIC or len(self.mmap) != HEADER.size + self.count * RECORD:
+            self.mmap.close()
+            raise ValueError(f"{path} is not a solution store.")
+
+    def get(self, form) -> list[int] or None:
+        """ Method to return the solution of a board in canonical form, or None if not stored. """
+        if len(form) != SIZE * SIZE:
+            return None
+        key = pack(form)
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            offset = HEADER.size + middle * RECORD
+            if self.mmap[offset:offset + PACKED] < key:
+                low = middle + 1
+            else:
+                high = middle
+        offset = HEADER.size + low * RECORD
+        found = low < self.count and self.mmap[offset:offset + PACKED] == key
+        with self.lock:
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return unpack(self.mmap[offset + PACKED:offset + RECORD]) if found else None
+
+    def records(self):
+        """ Generator of the stored puzzles and solutions in canonical form, in key order. """
+        for index in range(self.count):
+            offset = HEADER.size + index * RECORD
+            yield (unpack(self.mmap[offset:offset + PACKED]),
+                   unpack(self.mmap[offset + PACKED:offset + RECORD]))
+
+    def packed(self):
+        """ Generator of the stored puzzles and solutions packed as in the file, in key order,
+            without unpacking them. """
+        for index in range(self.count):
+            offset = HEADER.size + index * RECORD
+            yield self.mmap[offset:offset + PACKED], self.mmap[offset + PACKED:offset + RECORD]
+
+    def stats(self) -> dict:
+        """ Method to return the store size and counters. """
+        return {
+            "path": self.path,
+            "size": self.count,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def close(self):
+        """ Method to unmap the file. """
+        self.mmap.close()
+
+
+def open_store(path: str = None) -> SolutionStore or None:
+    """ Function to open the solution store if a path is given and the file exists. """
+    return SolutionStore(path) if path and os.path.exists(path) else None
+
+
+class LazyStore:
+    """ Class to stand in for the solution store at a path, opening it on the first lookup,
+    so a missing or corrupt file fails the lookups and not the import of the views.
+    Until the file exists every lookup misses, a file which is not a store raises
+    StoreUnavailable on every lookup until it is replaced.
+
+    Attributes
+    ----------
+    path : str
+        Path of the store file.
+    store : SolutionStore
+        The store once opened, None before.
+    lock : Lock
+        Lock serializing the opening of the store.
+
+    Methods
+    -------
+    open(self)
+        Returns the store, opening it on the first call.
+    get(self, form)
+        Returns the solution of a canonical 9x9 board, or None.
+    stats(self)
+        Returns the store size and counters.
+    close(self)
+        Unmaps the file if it was opened.
+
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.store = None
+        self.lock = Lock()
+
+    def open(self) -> SolutionStore or None:
+        """ Method to return the store, opening it on the first call, None if the file is missing.
+            Raises StoreUnavailable if the file cannot be read as a store. """
+        with self.lock:
+            if self.store is None:
+                try:
+                    self.store = open_store(self.path)
+                except (OSError, ValueError) as error:
+                    raise StoreUnavailable(str(error)) from error
+            return self.store
+
+    def get(self, form) -> list[int] or None:
+        """ Method to return the solution of a board in canonical form, or None if not stored. """
+        store = self.open()
+        return store.get(form) if store is not None else None
+
+    def stats(self) -> dict:
+        """ Method to return the store size and counters, 0 while the file is missing. """
+        store = self.open()
+        if store is None:
+            return {"path": self.path, "size": 0, "hits": 0, "misses": 0}
+        return store.stats()
+
+    def close(self):
+        """ Method to unmap the file if it was opened. """
+        if self.store is not None:
+            self.store.close()
+
+
+def write(path: str, records) -> int:
+    """ Function to write a store of (puzzle, solution) pairs of 9x9 boards in canonical form,
+        keeping the first solution of repeated puzzles. Returns the number stored. """
+    return merge(path, ((pack(puzzle), pack(solution)) for puzzle, solution in records))
+
+
+def read_run(file):
+    """ Generator of the packed (puzzle, solution) pairs of a sorted run written by merge. """
+    file.seek(0)
+    while record := file.read(RECORD):
+        yield record[:PACKED], record[PACKED:]
+
+
+def merge(path: str, records, store: SolutionStore = None, run: int = RUN) -> int:
+    """ Function to write a store of packed (puzzle, solution) pairs, merged with the records
+        of an open store in a single streaming pass over its sorted file. The records are
+        consumed as they come, sorted in runs of at most run records written to temporary files,
+        so memory use does not grow with the records or the store. Repeated puzzles keep the
+        first solution, the one of records over the one of the store. The header count is
+        written once the records are, and the file is replaced atomically, so processes
+        which mapped the old file, the store among them, keep reading it.
+        Returns the number stored. """
+    directory = os.path.dirname(os.path.abspath(path))
+    records = iter(records)
+    runs = []
+    try:
+        while True:
+            packed = {}
+            for puzzle, solution in islice(records, run):
+                packed.setdefault(puzzle, solution)
+            if not packed:
+                break
+            file = tempfile.TemporaryFile(dir=directory)
+            runs.append(file)
+            for puzzle in sorted(packed):
+                file.write(puzzle + packed[puzzle])
+        merged = heapq.merge(*map(read_run, runs),
+                             store.packed() if store is not None else (), key=itemgetter(0))
+        temporary = f"{path}.tmp"
+        count = 0
+        previous = None
+        with open(temporary, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, 0))
+            for puzzle, solution in merged:
+                if puzzle == previous:
+                    continue
+                file.write(puzzle + solution)
+                previous = puzzle
+                count += 1
+            file.seek(0)
+            file.write(HEADER.pack(MAGIC, count))
+    finally:
+        for file in runs:
+            file.close()
+    os.replace(temporary, path)
+    return count
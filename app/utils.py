@@ -1,47 +1,313 @@
-from math import sqrt
-from random import randint
+import json
+from functools import partial
+from math import isqrt
+from time import perf_counter
+from .codec import PayloadError, parse, parse_marks, serialize
+from .solver import dlx, generator, logic, parallel, search
+from .solver.budget import Budget, BudgetExceeded
 from .solver.sudoku_solver import Board
 
 
-def parse_payload(data: str) -> Board:
-    """ Helper function to parse incoming payload. """
-    size = int(sqrt(len(data)))
-    box_size = int(sqrt(size))
-    dimensions = (1, size + 1)
-    board = []
-    row = []
-    for i, item in enumerate(data):
-        row.append(int(item))
-        if (i + 1) % size == 0:
-            board.append(row)
-            row = []
-    return Board(board, size, box_size, dimensions)
-
-
-def generate_sudoku(size: int) -> tuple[str, int]:
-    """ Function to generate size*size square Sudoku puzzle. """
-    box_size = int(sqrt(size))
-    dimensions = (1, size + 1)
-    solvable = False
-    iterations = 0
-    while not solvable:
-        iterations += 1
-
-        board = [[0 for _ in range(0, 9)] for _ in range(0, 9)]
-        temp_board = Board(board, size, box_size, dimensions)
-        temp_board.generate()
-
-        for i, row in enumerate(temp_board.board):
-            for j, number in enumerate(row):
-                choice = randint(0, 1)
-                if choice:
-                    temp_board.board[i][j] = 0
-
-        number_of_clues = len([x for x in row if x != 0 for row in temp_board.board])
-        if number_of_clues < 17 or number_of_clues > 30:
+def solve_auto(board: Board) -> bool:
+    """ Function to solve Board with backtracking below 9x9 and with Dancing Links from 9x9 on,
+        where exact cover also branches on the cells of a value in a unit. Backtracking
+        on cells alone blows up on minimal and pathological 9x9 boards. """
+    if board.size >= 9:
+        return dlx.solve(board)
+    return board.solve()
+
+
+ENGINES = {
+    'auto': solve_auto,
+    'backtracking': Board.solve,
+    'iterative': Board.solve_iterative,
+    'dlx': dlx.solve,
+    'parallel': parallel.solve,
+    'logic': logic.solve,
+    'search': search.solve,
+}
+
+DEFAULT_ENGINE = 'auto'
+
+
+def engine_solver(engine: str):
+    """ Helper function to return the solver of an engine, or None if the engine is unknown.
+        Besides the names of ENGINES, "search:<strategy>" configures the search engine,
+        like "search:mrv/lcv/restarts", see search.parse_strategy. """
+    if not isinstance(engine, str):
+        return None
+    if engine in ENGINES:
+        return ENGINES[engine]
+    name, _, spec = engine.partition(':')
+    if name != 'search':
+        return None
+    try:
+        return partial(search.solve, strategy=search.parse_strategy(spec))
+    except ValueError:
+        return None
+
+
+CHECK_VERDICTS = {
+    0: (0, "No solution."),
+    1: (1, "Looks good."),
+    2: ("many", "Multiple solutions."),
+    None: ("unknown", "Search budget exhausted."),
+}
+
+
+def parse_payload(data: str or list) -> Board:
+    """ Helper function to parse incoming payload.
+        Raises PayloadError if it is not a well formed board. """
+    cells, size, box_size = parse(data)
+    return Board(cells, size, box_size, (1, size + 1))
+
+
+def serialize_board(board: Board, as_list: bool = False) -> str or list[int]:
+    """ Helper function to turn a Board into a payload string, or a list if as_list is set. """
+    return serialize(board.cells, as_list)
+
+
+def lap(timings: dict, stage: str, clock: float) -> float:
+    """ Helper function to record the seconds spent in a stage since clock.
+        Returns the current time, the start of the next stage. """
+    now = perf_counter()
+    timings[stage] = now - clock
+    return now
+
+
+def solver_stats(board: Board, passes: int, timings: dict) -> dict:
+    """ Helper function to collect the stage timings and search statistics of a solver run. """
+    return {
+        "timings": timings,
+        "passes": passes,
+        "max_depth": board.max_depth,
+        "pruned": board.pruned
+    }
+
+
+def solve_payload(submitted: str or list, engine: str = DEFAULT_ENGINE, max_iterations: int = None,
+                  timeout: float = None, budget: Budget = None) -> tuple[dict, int]:
+    """ Function to run the solving pipeline on a payload, within the iteration and time limits,
+        or within the given budget.
+        Returns the response and its status code, the response holds the stage timings
+        and search statistics under "debug" when the search was run.
+        Solutions are returned in the encoding of the payload, a string or a list. """
+    timings = {}
+    clock = perf_counter()
+    try:
+        challenge = parse_payload(submitted)
+    except PayloadError as error:
+        response = {
+            "error": str(error),
+            "original": submitted,
+            "solvable": False
+        }
+        return response, 400
+    clock = lap(timings, "parse", clock)
+
+    solver = engine_solver(engine)
+    if solver is None:
+        response = {
+            "error": "Unknown engine.",
+            "original": submitted,
+            "engines": list(ENGINES)
+        }
+        return response, 400
+
+    solvable = challenge.check_solvable()
+    clock = lap(timings, "check", clock)
+    if not solvable:
+        response = {
+            "error": "Invalid clues.",
+            "original": submitted,
+            "solvable": solvable
+        }
+        return response, 400
+
+    if budget is not None:
+        challenge.budget = budget
+    elif max_iterations is not None or timeout is not None:
+        challenge.budget = Budget(max_iterations, timeout)
+    passes = 0
+    try:
+        passes = challenge.preprocess_board()
+        clock = lap(timings, "preprocess", clock)
+        solved = solver(challenge)
+        clock = lap(timings, "search", clock)
+    except BudgetExceeded as exceeded:
+        response = {
+            "error": "Solver budget exhausted.",
+            "original": submitted,
+            "partial": serialize_board(challenge, isinstance(submitted, list)),
+            "iterations": challenge.iterations,
+            "elapsed": exceeded.elapsed,
+            "debug": solver_stats(challenge, passes, timings)
+        }
+        return response, 422
+    if not solved:
+        response = {
+            "error": "No solution.",
+            "original": submitted,
+            "solvable": False,
+            "iterations": challenge.iterations,
+            "debug": solver_stats(challenge, passes, timings)
+        }
+        return response, 422
+
+    solved = serialize_board(challenge, isinstance(submitted, list))
+    lap(timings, "serialize", clock)
+    response = {
+        "original": submitted,
+        "solved": solved,
+        "iterations": challenge.iterations,
+        "passes": passes,
+        "rules": challenge.rules,
+        "debug": solver_stats(challenge, passes, timings)
+    }
+    return response, 200
+
+
+def check_payload(submitted: str or list, budget: int = None) -> dict:
+    """ Function to check a payload by counting its solutions, up to two.
+        Constraint propagation decides most boards, search is limited to budget nodes. """
+    try:
+        challenge = parse_payload(submitted)
+    except PayloadError as error:
+        return {
+            "original": submitted,
+            "solvable": False,
+            "reason": str(error)
+        }
+
+    if not challenge.check_solvable():
+        return {
+            "original": submitted,
+            "solvable": False,
+            "solutions": 0,
+            "reason": "Invalid clues."
+        }
+
+    challenge.preprocess_board()
+    count = dlx.count_solutions(challenge, 2, budget)
+    solutions, reason = CHECK_VERDICTS[count]
+    return {
+        "original": submitted,
+        "solvable": None if count is None else bool(count),
+        "solutions": solutions,
+        "iterations": challenge.iterations,
+        "reason": reason
+    }
+
+
+def grade_payload(submitted: str or list, budget: int = None) -> tuple[dict, int]:
+    """ Function to grade a payload with the human-style techniques.
+        Only boards with a unique solution are graded, counting them is limited to budget nodes.
+        Returns the response and its status code. """
+    try:
+        challenge = parse_payload(submitted)
+    except PayloadError as error:
+        response = {
+            "error": str(error),
+            "original": submitted,
+            "solvable": False
+        }
+        return response, 400
+
+    if not challenge.check_solvable():
+        response = {
+            "error": "Invalid clues.",
+            "original": submitted,
+            "solvable": False
+        }
+        return response, 400
+
+    count = dlx.count_solutions(challenge, 2, budget)
+    if count != 1:
+        solutions, reason = CHECK_VERDICTS[count]
+        response = {
+            "error": reason,
+            "original": submitted,
+            "solvable": None if count is None else bool(count),
+            "solutions": solutions
+        }
+        return response, 422
+
+    response = {
+        "original": submitted,
+        **logic.grade(challenge),
+        "partial": serialize_board(challenge, isinstance(submitted, list))
+    }
+    return response, 200
+
+
+def hint_payload(submitted: str or list, marks: list = None,
+                 budget: int = None) -> tuple[dict, int]:
+    """ Function to find the next deduction on a payload, optionally narrowed by pencil marks,
+        without solving the rest of the board. The marks are checked against the solution
+        when search finds it within budget nodes. Returns the response and its status code. """
+    try:
+        challenge = parse_payload(submitted)
+        if marks is not None:
+            marks = parse_marks(marks, challenge.size)
+    except PayloadError as error:
+        response = {
+            "error": str(error),
+            "original": submitted,
+            "solvable": False
+        }
+        return response, 400
+
+    if not challenge.check_solvable():
+        response = {
+            "error": "Invalid clues.",
+            "original": submitted,
+            "solvable": False
+        }
+        return response, 400
+
+    response = {"original": submitted}
+    if 0 not in challenge.cells:
+        response["hint"], response["reason"] = None, "Board is already solved."
+        return response, 200
+    step = logic.hint(challenge, marks, budget)
+    if step is None:
+        response["hint"], response["reason"] = None, "No deduction found with the known techniques."
+    else:
+        response["hint"] = step
+    return response, 200
+
+
+def solve_lines(lines, engine: str = DEFAULT_ENGINE,
+                max_iterations: int = None, timeout: float = None, observe=None):
+    """ Generator to solve newline delimited payloads one by one.
+        Lines are consumed lazily and every result is yielded as an NDJSON line
+        as soon as it is solved, so memory use does not grow with the input.
+        Every response is passed to observe first, if given, then stripped of its statistics. """
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode(errors='replace')
+        submitted = line.strip()
+        if not submitted:
             continue
-        challenge = ''
-        for row in temp_board.board:
-            for number in row:
-                challenge += (str(number))
-        return challenge, iterations
+        response, status = solve_payload(submitted, engine, max_iterations, timeout)
+        if observe is not None:
+            observe(response)
+        response.pop("debug", None)
+        response["status"] = status
+        yield json.dumps(response) + '\n'
+
+
+def generate_sudoku(size: int, difficulty: str = None, min_clues: int = None,
+                    max_clues: int = None, max_iterations: int = None,
+                    timeout: float = None) -> tuple[str, int, str]:
+    """ Function to generate size*size square Sudoku puzzle with a unique solution,
+        the clue range defaults to the one of the size.
+        Returns the puzzle, the number of attempts and its difficulty.
+        Raises BudgetExceeded if the iteration or time limit is reached. """
+    box_size = isqrt(size)
+    budget = None
+    if max_iterations is not None or timeout is not None:
+        budget = Budget(max_iterations, timeout)
+    cells, iterations, level = generator.generate(size, box_size, difficulty,
+                                                  min_clues, max_clues, budget=budget)
+    return serialize(cells), iterations, level
@@ -0,0 +1,340 @@
+""" Views of the Sudoku Solver API, imported on the first request to one of them.
+The solver engines, job queue and caches are only loaded with this module. """
+from functools import partial
+from flask import Response, abort, request, stream_with_context
+from app import app
+from app.cache import SolutionCache
+from app.codec import PayloadError, parse, serialize
+from app.jobs import JobQueue, create_store
+from app.metrics import observe_solve
+from app.puzzles import PuzzlePool
+from app.solver import parallel
+from app.solver.budget import BudgetExceeded
+from app.solver.generator import CLUES, DIFFICULTIES
+from app.solver.geometry import geometry
+from app.store import LazyStore, StoreUnavailable
+from app.utils import DEFAULT_ENGINE, ENGINES, check_payload, engine_solver, generate_sudoku, \
+    grade_payload, hint_payload, solve_lines, solve_payload
+from app.workers import WorkerPool
+
+solver_pool = WorkerPool(app.config['SOLVER_WORKERS'])
+search_pool = parallel.configure(app.config['SOLVER_WORKERS'])
+solution_cache = SolutionCache(app.config['SOLUTION_CACHE_SIZE'], app.config['SOLUTION_CACHE_TTL'],
+                               LazyStore(app.config['SOLUTION_STORE'])
+                               if app.config['SOLUTION_STORE'] else None)
+puzzle_pool = PuzzlePool(app.config['PUZZLE_POOL_DEPTH'], app.config['PUZZLE_POOL_LOW_WATER'],
+                         sizes=app.config['PUZZLE_POOL_SIZES'])
+
+
+def solve_job(submitted: str, engine: str, budget) -> tuple[dict, int]:
+    """ Helper to solve a payload of a job like /v1/solve, through the solution cache. """
+    solver = partial(solve_payload, budget=budget)
+    response, status = solution_cache.solve(submitted, engine, solver)
+    observe_solve(response)
+    return response, status
+
+
+def store_unavailable(error: StoreUnavailable) -> tuple[dict, int]:
+    """ Helper to return the response of a view whose solution store lookup failed. """
+    response = {
+        "error": "Solution store unavailable.",
+        "reason": str(error)
+    }
+    return response, 503
+
+
+job_queue = JobQueue(create_store(app.config['JOB_STORE']), app.config['JOB_WORKERS'], solve_job,
+                     app.config['JOB_MAX_ITERATIONS'], app.config['JOB_TIMEOUT'],
+                     app.config['JOB_TTL'])
+
+
+def solver_limits(max_iterations, timeout) -> tuple[int or None, float or None]:
+    """ Helper to apply the iteration and time limits requested by the client,
+        they can only lower the configured ones. """
+    def lower(configured, requested):
+        if isinstance(requested, bool) or not isinstance(requested, (int, float)) \
+                or requested < 0:
+            return configured
+        return requested if configured is None else min(configured, requested)
+
+    return (lower(app.config['SOLVER_MAX_ITERATIONS'], max_iterations),
+            lower(app.config['SOLVER_TIMEOUT'], timeout))
+
+
+def solve():
+    """ Route to return solved Sudoku puzzle.
+        With "debug": true the cache is bypassed and the stage timings are returned. """
+    data = request.get_json(silent=True)
+    if not request.json or 'payload' not in request.json:
+        abort(400)
+
+    submitted = data["payload"]
+    engine = data.get("engine", DEFAULT_ENGINE)
+    max_iterations, timeout = solver_limits(data.get("max_iterations"), data.get("timeout"))
+    solver = partial(solve_payload, max_iterations=max_iterations, timeout=timeout)
+    if data.get("debug") is True:
+        response, status = solver(submitted, engine)
+    else:
+        try:
+            response, status = solution_cache.solve(submitted, engine, solver)
+        except StoreUnavailable as error:
+            return store_unavailable(error)
+    debug = observe_solve(response)
+    if data.get("debug") is True and debug is not None:
+        response["debug"] = debug
+    return response, status
+
+
+def solve_batch():
+    """ Route to return solved Sudoku puzzles for a list of payloads,
+        solved in parallel by the worker processes. """
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data.get('payloads'), list):
+        abort(400)
+    if len(data['payloads']) > app.config['BATCH_MAX_SIZE']:
+        response = {
+            "error": "Too many payloads.",
+            "limit": app.config['BATCH_MAX_SIZE']
+        }
+        return response, 400
+
+    engine = data.get("engine", DEFAULT_ENGINE)
+    submitted = []
+    engines = []
+    for item in data['payloads']:
+        if isinstance(item, dict) and 'payload' in item:
+            submitted.append(item['payload'])
+            engines.append(item.get("engine", engine))
+        elif isinstance(item, (str, list)):
+            submitted.append(item)
+            engines.append(engine)
+        else:
+            abort(400)
+
+    entries = [solution_cache.key(*item) for item in zip(submitted, engines)]
+    results = []
+    misses = []
+    for i, entry in enumerate(entries):
+        try:
+            cached = solution_cache.get(entry) if entry else None
+        except StoreUnavailable as error:
+            return store_unavailable(error)
+        if cached is None:
+            misses.append(i)
+        else:
+            cached = {"original": submitted[i], **cached, "status": 200}
+        results.append(cached)
+
+    max_iterations, timeout = solver_limits(data.get("max_iterations"), data.get("timeout"))
+    solved = solver_pool.map(solve_payload, [submitted[i] for i in misses],
+                             [engines[i] for i in misses],
+                             [max_iterations] * len(misses), [timeout] * len(misses))
+    for i, (response, status) in zip(misses, solved):
+        if entries[i] is not None and status == 200:
+            solution_cache.put(entries[i], response)
+        observe_solve(response)
+        response["status"] = status
+        results[i] = response
+    return {"results": results}
+
+
+def cache_stats():
+    """ Route to return the solution cache size and hit/miss counters. """
+    try:
+        return solution_cache.stats()
+    except StoreUnavailable as error:
+        return store_unavailable(error)
+
+
+def solve_bulk():
+    """ Route to solve a list of 9x9 payloads with the NumPy vectorized engine,
+        only the boards left unresolved by propagation are searched. """
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data.get('payloads'), list) \
+            or not all(isinstance(item, (str, list)) for item in data['payloads']):
+        abort(400)
+    if len(data['payloads']) > app.config['BULK_MAX_SIZE']:
+        response = {
+            "error": "Too many payloads.",
+            "limit": app.config['BULK_MAX_SIZE']
+        }
+        return response, 400
+    engine = data.get("engine", DEFAULT_ENGINE)
+    solver = engine_solver(engine)
+    if solver is None:
+        response = {
+            "error": "Unknown engine.",
+            "engines": list(ENGINES)
+        }
+        return response, 400
+    try:
+        from app.solver import vectorized  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return {"error": "The vectorized engine requires NumPy."}, 501
+
+    submitted = data['payloads']
+    supported = {}
+    for i, item in enumerate(submitted):
+        try:
+            cells, size, _ = parse(item)
+        except PayloadError:
+            continue
+        if size == 9:
+            supported[i] = serialize(cells)
+    max_iterations, timeout = solver_limits(data.get("max_iterations"), data.get("timeout"))
+    solved = vectorized.solve_many(list(supported.values()), solver,
+                                   max_iterations, timeout)
+    results = [{
+        "original": item,
+        "error": "Only 9x9 payloads are supported.",
+        "status": 400
+    } for item in submitted]
+    for i, (result, status) in zip(supported, solved):
+        results[i] = {"original": submitted[i], **result, "status": status}
+    return {"results": results}
+
+
+def solve_stream():
+    """ Route to solve newline delimited payloads from the request body,
+        streaming the results back as NDJSON while the body is still being read. """
+    engine = request.args.get("engine", DEFAULT_ENGINE)
+    max_iterations, timeout = solver_limits(request.args.get("max_iterations", type=int),
+                                            request.args.get("timeout", type=float))
+    lines = iter(request.stream.readline, b'')
+    results = solve_lines(lines, engine, max_iterations, timeout, observe_solve)
+    return Response(stream_with_context(results), mimetype='application/x-ndjson')
+
+
+def create_job():
+    """ Route to queue a payload, or a list of payloads, to be solved in the background.
+        Returns the id of the job at once, to be polled at /v1/jobs/<id>. """
+    data = request.get_json(silent=True)
+    if not data or not ('payload' in data or isinstance(data.get('payloads'), list)):
+        abort(400)
+    payloads = data['payloads'] if 'payloads' in data else [data['payload']]
+    if len(payloads) > app.config['BATCH_MAX_SIZE']:
+        response = {
+            "error": "Too many payloads.",
+            "limit": app.config['BATCH_MAX_SIZE']
+        }
+        return response, 400
+    if not all(isinstance(item, (str, list)) for item in payloads):
+        abort(400)
+
+    job = {"engine": data.get("engine", DEFAULT_ENGINE)}
+    if 'payloads' in data:
+        job["payloads"] = payloads
+    else:
+        job["payload"] = data['payload']
+    job = job_queue.submit(job)
+    return job_queue.describe(job["id"]), 202
+
+
+def get_job(job_id):
+    """ Route to return the status, iterations so far and result of a job. """
+    response = job_queue.describe(job_id)
+    if response is None:
+        abort(404)
+    return response
+
+
+def delete_job(job_id):
+    """ Route to cancel a queued or running job, or remove a finished one. """
+    response = job_queue.cancel(job_id)
+    if response is None:
+        abort(404)
+    return response
+
+
+def check():
+    """ Route to check if a board has no, exactly one or many solutions.
+        The search is limited to the configured node budget, or a smaller one from the request. """
+    data = request.get_json(silent=True)
+    if not request.json or 'payload' not in request.json:
+        abort(400)
+
+    submitted = data['payload']
+    budget = app.config['CHECK_NODE_BUDGET']
+    if isinstance(data.get('budget'), int):
+        budget = max(0, min(budget, data['budget']))
+    return check_payload(submitted, budget)
+
+
+def grade():
+    """ Route to grade a board by the human-style techniques needed to solve it,
+        returning its difficulty, score and step trace. """
+    data = request.get_json(silent=True)
+    if not request.json or 'payload' not in request.json:
+        abort(400)
+
+    return grade_payload(data['payload'], app.config['CHECK_NODE_BUDGET'])
+
+
+def hint():
+    """ Route to return the next deducible placement or elimination on a board,
+        optionally narrowed by the pencil marks of the client, with the technique used. """
+    data = request.get_json(silent=True)
+    if not request.json or 'payload' not in request.json:
+        abort(400)
+
+    return hint_payload(data['payload'], data.get('marks'), app.config['CHECK_NODE_BUDGET'])
+
+
+def generate():
+    """ Route to return a random Sudoku puzzle with a unique solution.
+        The size, difficulty and clue range can be requested with query parameters,
+        values above 9 are written as base-36 digits. """
+    size = request.args.get('size', 9, type=int)
+    if size not in CLUES:
+        response = {
+            "error": "Unsupported board size.",
+            "sizes": list(CLUES)
+        }
+        return response, 400
+    difficulty = request.args.get('difficulty')
+    min_clues = request.args.get('min_clues', CLUES[size][0], type=int)
+    max_clues = request.args.get('max_clues', CLUES[size][1], type=int)
+    if (difficulty is not None and difficulty not in DIFFICULTIES) \
+            or not 0 <= min_clues <= max_clues <= size * size:
+        response = {
+            "error": "Invalid difficulty or clue range.",
+            "difficulties": list(DIFFICULTIES)
+        }
+        return response, 400
+
+    puzzle = None
+    if 'min_clues' not in request.args and 'max_clues' not in request.args:
+        # Only puzzles with the default clue range are pre-generated
+        puzzle = puzzle_pool.pop(size, difficulty)
+    if puzzle is None:
+        max_iterations, timeout = solver_limits(request.args.get("max_iterations", type=int),
+                                                request.args.get("timeout", type=float))
+        try:
+            puzzle = generate_sudoku(size, difficulty, min_clues, max_clues,
+                                     max_iterations, timeout)
+        except BudgetExceeded as exceeded:
+            response = {
+                "error": "Generator budget exhausted.",
+                "iterations": exceeded.iterations,
+                "elapsed": exceeded.elapsed
+            }
+            return response, 422
+    challenge, iterations, level = puzzle
+    response = {
+        "sudoku": challenge,
+        "iterations": iterations,
+        "difficulty": level,
+        "clues": sum(1 for number in challenge if number != '0')
+    }
+    return response
+
+
+def generate_pool():
+    """ Route to return the depth of the pre-generated puzzle pools and their refill rate. """
+    return puzzle_pool.stats()
+
+
+def warm_up():
+    """ Function to build the index tables of 9x9 boards ahead of the first request,
+        importing this module also starts the job queue and creates the caches. """
+    geometry(9, 3)
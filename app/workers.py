@@ -0,0 +1,54 @@
+""" Process pool for CPU bound solver work. """
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from math import ceil
+from os import cpu_count
+
+
+class WorkerPool:
+    """ Class to fan out CPU bound work to a lazily started pool of processes.
+    Threads would not help, the solvers hold the GIL for the whole run.
+
+    Attributes
+    ----------
+    workers : int
+        Number of worker processes, 0 means one per CPU, 1 runs everything in process.
+    executor : ProcessPoolExecutor
+        Executor running the work, started on first use.
+
+    Methods
+    -------
+    map(self, func, *iterables)
+        Returns the results of func applied to the items of the iterables, in order.
+    imap(self, func, iterable, batch)
+        Yields the results of func applied to the items of the iterable, a batch at a time.
+    shutdown(self)
+        Stops the worker processes.
+
+    """
+    def __init__(self, workers: int = 0):
+        self.workers = workers or cpu_count() or 1
+        self.executor = None
+
+    def map(self, func, *iterables) -> list:
+        """ Method to apply func to the items of the iterables in the worker processes. """
+        items = list(zip(*iterables))
+        if self.workers == 1 or len(items) <= 1:
+            return [func(*item) for item in items]
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        chunksize = max(1, ceil(len(items) / (self.workers * 4)))
+        return list(self.executor.map(func, *zip(*items), chunksize=chunksize))
+
+    def imap(self, func, iterable, batch: int = 1024):
+        """ Generator applying func to the items of the iterable in the worker processes,
+            taking batch items at a time, so memory use does not grow with the input. """
+        items = iter(iterable)
+        while chunk := list(islice(items, batch)):
+            yield from self.map(func, chunk)
+
+    def shutdown(self):
+        """ Method to stop the worker processes. """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
@@ -7,3 +7,22 @@ class Config:
     SECRET_KEY = environ.get('SECRET_KEY') or 'nobody-gonna-guess-it'
     STATIC_PATH = './app/static'
     DEBUG = False
+    SOLVER_MAX_ITERATIONS = int(environ.get('SOLVER_MAX_ITERATIONS') or 0) or None
+    SOLVER_TIMEOUT = float(environ.get('SOLVER_TIMEOUT') or 20) or None
+    SOLVER_WORKERS = int(environ.get('SOLVER_WORKERS') or 0)
+    BATCH_MAX_SIZE = int(environ.get('BATCH_MAX_SIZE') or 1000)
+    BULK_MAX_SIZE = int(environ.get('BULK_MAX_SIZE') or 100000)
+    SOLUTION_CACHE_SIZE = int(environ.get('SOLUTION_CACHE_SIZE') or 1024)
+    SOLUTION_CACHE_TTL = float(environ.get('SOLUTION_CACHE_TTL') or 3600)
+    SOLUTION_STORE = environ.get('SOLUTION_STORE')
+    PUZZLE_POOL_DEPTH = int(environ.get('PUZZLE_POOL_DEPTH') or 10)
+    PUZZLE_POOL_LOW_WATER = int(environ.get('PUZZLE_POOL_LOW_WATER') or 3)
+    PUZZLE_POOL_SIZES = tuple(int(size)
+                              for size in (environ.get('PUZZLE_POOL_SIZES') or '9').split(','))
+    CHECK_NODE_BUDGET = int(environ.get('CHECK_NODE_BUDGET') or 10000)
+    JOB_WORKERS = int(environ.get('JOB_WORKERS') or 1)
+    JOB_STORE = environ.get('JOB_STORE')
+    JOB_MAX_ITERATIONS = int(environ.get('JOB_MAX_ITERATIONS') or 0) or None
+    JOB_TIMEOUT = float(environ.get('JOB_TIMEOUT') or 600) or None
+    JOB_TTL = float(environ.get('JOB_TTL') or 86400)
+    WARM_UP = bool(int(environ.get('WARM_UP') or 0))
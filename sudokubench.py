@@ -0,0 +1,202 @@
+""" Sudoku Solver benchmark, timing the engines and the generator on the bundled puzzle corpus. """
+import argparse
+import json
+import sys
+import tracemalloc
+from itertools import product
+from math import ceil, sqrt
+from pathlib import Path
+from time import perf_counter
+from app.solver import generator, search
+from app.solver.budget import Budget, BudgetExceeded
+from app.utils import ENGINES, engine_solver
+
+CORPUS = Path(__file__).parent / 'benchmarks'
+
+
+def parse_line(line: str) -> list[int]:
+    """ Helper function to parse a corpus line, digits with 0 or . for blanks,
+        or comma separated cells for boards larger than 9x9. """
+    if ',' in line:
+        return [int(item) for item in line.split(',')]
+    return [0 if item == '.' else int(item) for item in line]
+
+
+def load_corpus(path: Path) -> dict[str, list[list[int]]]:
+    """ Function to load every .txt file of the corpus directory, skipping blank and # lines.
+        Returns the puzzles of every file, by file name. """
+    corpus = {}
+    for file in sorted(path.glob('*.txt')):
+        with open(file, encoding='utf-8') as lines:
+            corpus[file.stem] = [parse_line(line.strip()) for line in lines
+                                 if line.strip() and not line.startswith('#')]
+    return corpus
+
+
+def percentile(values: list[float], percent: int) -> float:
+    """ Helper function to return the nearest-rank percentile of the values,
+        the smallest value with at least percent of the values at or below it. """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(max(ceil(percent * len(ordered) / 100) - 1, 0), len(ordered) - 1)]
+
+
+def solve(cells: list[int], engine: str, max_iterations: int = None,
+          timeout: float = None) -> tuple[bool, int]:
+    """ Function to solve a puzzle the way the API does, propagation first then search.
+        Returns whether it was solved within the limits and the iterations used. """
+    size = int(sqrt(len(cells)))
+    board = generator.create_board(cells, size, int(sqrt(size)), Budget(max_iterations, timeout))
+    try:
+        board.preprocess_board()
+        solved = engine_solver(engine)(board)
+    except BudgetExceeded:
+        solved = False
+    return bool(solved), board.iterations
+
+
+def engine_name(value: str) -> str:
+    """ Helper function to check an engine argument, a name of ENGINES or "search:<strategy>". """
+    if engine_solver(value) is None:
+        raise argparse.ArgumentTypeError(f"unknown engine {value!r}, "
+                                         f"choose from {', '.join(ENGINES)} or search:<strategy>")
+    return value
+
+
+def strategy_engines() -> list[str]:
+    """ Function to return the search engine with every combination of strategies. """
+    return [f"search:{branching}/{values}" + ("/restarts" if restarts else "")
+            for branching, values, restarts
+            in product(search.BRANCHING, search.VALUE_ORDERS, (False, True))]
+
+
+def peak_memory(func, items) -> int:
+    """ Function to return the peak bytes allocated while calling func on every item. """
+    tracemalloc.start()
+    try:
+        for item in items:
+            func(item)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def summarize(latencies: list[float], **stats) -> dict:
+    """ Helper function to summarize latencies as throughput and percentiles in seconds. """
+    total = sum(latencies)
+    return {
+        **stats,
+        "rate": len(latencies) / total if total else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+    }
+
+
+def bench_engine(puzzles: list[list[int]], engine: str, max_iterations: int = None,
+                 timeout: float = None, memory: bool = True) -> dict:
+    """ Function to time an engine on a list of puzzles.
+        Puzzles not solved within the limits count as failed, at the time they took. """
+    latencies = []
+    iterations = []
+    solved = 0
+    for cells in puzzles:
+        start = perf_counter()
+        ok, used = solve(cells, engine, max_iterations, timeout)
+        latencies.append(perf_counter() - start)
+        iterations.append(used)
+        solved += ok
+    peak = peak_memory(lambda cells: solve(cells, engine, max_iterations, timeout),
+                       puzzles) if memory else None
+    return summarize(latencies, puzzles=len(puzzles), solved=solved,
+                     iterations_mean=sum(iterations) / len(iterations) if iterations else 0,
+                     iterations_max=max(iterations, default=0), peak_memory=peak)
+
+
+def bench_generator(count: int, difficulty: str, memory: bool = True) -> dict:
+    """ Function to time the generation of count 9x9 puzzles of a difficulty. """
+    latencies = []
+    for _ in range(count):
+        start = perf_counter()
+        generator.generate(9, 3, difficulty)
+        latencies.append(perf_counter() - start)
+    peak = peak_memory(lambda _: generator.generate(9, 3, difficulty),
+                       range(min(count, 1))) if memory else None
+    return summarize(latencies, puzzles=count, peak_memory=peak)
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """ Function to compare the throughput of a report to a baseline report.
+        Returns a message for every benchmark slower than the baseline by more than tolerance. """
+    regressions = []
+    for section in ('engines', 'generator'):
+        for name, results in baseline.get(section, {}).items():
+            for corpus, expected in results.items():
+                current = report.get(section, {}).get(name, {}).get(corpus)
+                if current is None or not expected["rate"]:
+                    continue
+                if current["rate"] < expected["rate"] * (1 - tolerance):
+                    regressions.append(f"{section} {name} {corpus}: {current['rate']:.2f}/s, "
+                                       f"baseline {expected['rate']:.2f}/s")
+    return regressions
+
+
+def main():
+    """ Run the benchmarks, write the JSON report and fail on throughput regressions. """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--corpus', type=Path, default=CORPUS,
+                        help='Directory of puzzle files, the bundled corpus by default.')
+    parser.add_argument('-e', '--engine', action='append', type=engine_name,
+                        help='Solver engine to benchmark, can be repeated, all by default. '
+                             'The search engine takes a strategy, like search:mrv/lcv/restarts.')
+    parser.add_argument('--strategies', action='store_true',
+                        help='Benchmark the search engine with every strategy instead.')
+    parser.add_argument('--max-iterations', type=int, default=None,
+                        help='Iteration limit per puzzle.')
+    parser.add_argument('--timeout', type=float, default=5.0,
+                        help='Time limit per puzzle in seconds.')
+    parser.add_argument('-g', '--generate', type=int, default=3,
+                        help='Puzzles to generate per difficulty, 0 skips the generator.')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='Skip the peak memory pass, which runs every benchmark again.')
+    parser.add_argument('-o', '--output', type=argparse.FileType('w'), default=sys.stdout,
+                        help='File to write the JSON report to, standard output by default.')
+    parser.add_argument('--baseline', type=argparse.FileType('r'),
+                        help='JSON report to compare throughput against.')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Fraction of baseline throughput which may be lost, 0.2 by default.')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    report = {"engines": {}, "generator": {}}
+    engines = strategy_engines() if args.strategies else args.engine or list(ENGINES)
+    for engine in engines:
+        report["engines"][engine] = {}
+        for name, puzzles in corpus.items():
+            result = bench_engine(puzzles, engine, args.max_iterations, args.timeout,
+                                  not args.no_memory)
+            report["engines"][engine][name] = result
+            print(f"{engine:>12} {name:>14} {result['solved']}/{result['puzzles']} solved "
+                  f"{result['rate']:10.2f}/s p50 {result['p50'] * 1000:9.2f}ms "
+                  f"p99 {result['p99'] * 1000:9.2f}ms", file=sys.stderr)
+    if args.generate:
+        report["generator"]["9x9"] = {}
+        for difficulty in generator.DIFFICULTIES:
+            result = bench_generator(args.generate, difficulty, not args.no_memory)
+            report["generator"]["9x9"][difficulty] = result
+            print(f"{'generator':>12} {difficulty:>14} {result['rate']:10.2f}/s "
+                  f"p50 {result['p50'] * 1000:9.2f}ms", file=sys.stderr)
+    json.dump(report, args.output, indent=2)
+    args.output.write('\n')
+
+    if args.baseline:
+        regressions = compare(report, json.load(args.baseline), args.tolerance)
+        for message in regressions:
+            print(f"Regression: {message}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
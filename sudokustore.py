@@ -0,0 +1,96 @@
+""" Sudoku solution store builder, solving a puzzle file into a memory-mapped solution store. """
+import argparse
+import sys
+from app.codec import PayloadError, parse
+from app.solver import dlx
+from app.solver.canonical import canonical_form
+from app.solver.sudoku_solver import Board
+from app.store import SolutionStore, merge, pack
+from app.workers import WorkerPool
+
+
+def solve_form(form: tuple) -> list[int] or None:
+    """ Function to solve a 9x9 board in canonical form with Dancing Links,
+        returning the solution or None if it has none. """
+    board = Board(list(form), 9, 3, (1, 10))
+    if not board.check_solvable() or not dlx.solve(board):
+        return None
+    return list(board.cells)
+
+
+def solve_line(line: str) -> tuple[str, bytes or None, bytes or None]:
+    """ Function run in a worker process to bring the 9x9 puzzle of a line to canonical form
+        and solve it. Returns the outcome, stored, skipped or unsolvable,
+        and the packed puzzle and solution when stored. """
+    try:
+        cells, size, box_size = parse(line)
+    except PayloadError:
+        return 'skipped', None, None
+    if size != 9:
+        return 'skipped', None, None
+    form = canonical_form(list(cells), size, box_size)[0]
+    solution = solve_form(form)
+    if solution is None:
+        return 'unsolvable', None, None
+    return 'stored', pack(form), pack(solution)
+
+
+def puzzle_lines(lines):
+    """ Generator of the puzzle lines of a file, skipping blank and # lines. """
+    for line in lines:
+        if line.strip() and not line.startswith('#'):
+            yield line.strip()
+
+
+def stored(results, outcomes: dict[str, int]):
+    """ Generator of the packed puzzles and solutions of the stored results,
+        counting the outcome of every result in outcomes. """
+    for outcome, puzzle, solution in results:
+        outcomes[outcome] += 1
+        if outcome == 'stored':
+            yield puzzle, solution
+
+
+def build(path: str, lines, workers: int = 0, merge_store: bool = False) -> dict[str, int]:
+    """ Function to solve the puzzles of the lines in worker processes and write them to the
+        store at path as they are solved, merged with the puzzles already stored there
+        if merge_store is set. Lines are read a batch at a time, so memory use does not grow
+        with the input. Returns the number of lines of every outcome and the number stored. """
+    outcomes = {"stored": 0, "skipped": 0, "unsolvable": 0}
+    pool = WorkerPool(workers)
+    store = None
+    if merge_store:
+        try:
+            store = SolutionStore(path)
+        except FileNotFoundError:
+            pass
+    try:
+        results = pool.imap(solve_line, puzzle_lines(lines))
+        outcomes["total"] = merge(path, stored(results, outcomes), store)
+    finally:
+        pool.shutdown()
+        if store is not None:
+            store.close()
+    return outcomes
+
+
+def main():
+    """ Solve the puzzles of the input and write them with their solutions to the store. """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('input', nargs='?', type=argparse.FileType('r'), default=sys.stdin,
+                        help='File with one 9x9 puzzle per line, standard input by default.')
+    parser.add_argument('-o', '--output', required=True,
+                        help='Path of the solution store to write.')
+    parser.add_argument('-m', '--merge', action='store_true',
+                        help='Keep the puzzles of an existing store at the output path.')
+    parser.add_argument('-w', '--workers', type=int, default=0,
+                        help='Number of worker processes, one per CPU by default.')
+    args = parser.parse_args()
+
+    outcomes = build(args.output, args.input, args.workers, args.merge)
+    print(f"Stored {outcomes['total']} puzzles, {outcomes['skipped']} lines skipped, "
+          f"{outcomes['unsolvable']} unsolvable.", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,27 @@
+""" Sudoku Solver command line, solving newline delimited puzzles into NDJSON. """
+import argparse
+import sys
+from app.utils import DEFAULT_ENGINE, ENGINES, engine_solver, solve_lines
+
+
+def main():
+    """ Read puzzles from the input line by line and write the results as they are solved. """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('input', nargs='?', type=argparse.FileType('r'), default=sys.stdin,
+                        help='File with one puzzle per line, standard input by default.')
+    parser.add_argument('-o', '--output', type=argparse.FileType('w'), default=sys.stdout,
+                        help='File to write the NDJSON results to, standard output by default.')
+    parser.add_argument('-e', '--engine', default=DEFAULT_ENGINE,
+                        help=f"Solver engine to use, one of {', '.join(ENGINES)} "
+                             "or search:<strategy>.")
+    args = parser.parse_args()
+    if engine_solver(args.engine) is None:
+        parser.error(f"unknown engine {args.engine!r}")
+
+    for result in solve_lines(args.input, args.engine):
+        args.output.write(result)
+        args.output.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+from flask import json
+from app import app
+
+app.testing = True
+
+
+def test_solve_batch_ok():
+    """Test for /v1/solve/batch endpoint."""
+    with app.app_context():
+        test_batch = {
+            "payloads": [
+                "900000000060000000027008000000000307890300000301020580000100800080075602010600009",
+                {
+                    "payload": "800000000003600000070090200050007000000045700000100030001000068008500010090000400",
+                    "engine": "dlx"
+                },
+                "999900000060000000027008000000000307890300000301020580000100800080075602010600009",
+            ]
+            }
+        response = app.test_client().post('/v1/solve/batch', json=test_batch)
+        results = json.loads(response.get_data(as_text=True))["results"]
+
+        assert response.status_code == 200
+        assert [result["status"] for result in results] == [200, 200, 400]
+        assert results[0]["solved"] == \
+            "938764125564291738127538964245816397896357241371429586659142873483975612712683459"
+        assert results[1]["solved"] == \
+            "812753649943682175675491283154237896369845721287169534521974368438526917796318452"
+        assert results[2]["error"] == "Invalid clues."
+
+
+def test_solve_batch_invalid_payload():
+    """Test for /v1/solve/batch endpoint."""
+    with app.app_context():
+        response = app.test_client().post('/v1/solve/batch', json={"payloads": "9000"})
+
+        assert response.status_code == 400
+        assert dict(json.loads(response.get_data(as_text=True))) == {
+            'error': 'The client provided incorrect input.'
+            }
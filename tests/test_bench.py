@@ -0,0 +1,34 @@
+from sudokubench import bench_engine, compare, load_corpus, percentile
+
+PUZZLE = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+
+
+def test_bench_engine(tmp_path):
+    """Test for the benchmark of an engine on a corpus file."""
+    (tmp_path / "sample.txt").write_text("# Comment\n" + PUZZLE + "\n" + PUZZLE.replace('0', '.'))
+    corpus = load_corpus(tmp_path)
+    assert corpus["sample"][0] == corpus["sample"][1]
+
+    result = bench_engine(corpus["sample"], "dlx")
+    assert result["puzzles"] == 2
+    assert result["solved"] == 2
+    assert result["rate"] > 0
+    assert result["p50"] <= result["p95"] <= result["p99"]
+    assert result["peak_memory"] > 0
+
+
+def test_bench_compare():
+    """Test for the throughput regression check against a baseline report."""
+    baseline = {"engines": {"dlx": {"hard": {"rate": 100.0}}}}
+    assert not compare({"engines": {"dlx": {"hard": {"rate": 90.0}}}}, baseline, 0.2)
+    assert compare({"engines": {"dlx": {"hard": {"rate": 70.0}}}}, baseline, 0.2)
+
+
+def test_percentile():
+    """Test for the nearest-rank percentile of an odd number of values."""
+    values = [5.0, 1.0, 4.0, 2.0, 3.0]
+    assert percentile(values, 50) == 3.0
+    assert percentile(values, 70) == 4.0
+    assert percentile(values, 99) == 5.0
+    assert percentile(values, 0) == 1.0
+    assert percentile([], 50) == 0.0
@@ -0,0 +1,92 @@
+from pathlib import Path
+from flask import json
+from app import app
+from app.codec import parse, serialize
+from app.solver.generator import count_solutions
+from app.utils import parse_payload, solve_payload
+from sudokubench import load_corpus
+
+app.testing = True
+
+CORPUS = load_corpus(Path(__file__).parent.parent / 'benchmarks')
+
+
+def valid_solution(puzzle: list[int], solution: list[int], size: int) -> bool:
+    """Helper function to check a solution keeps the clues and fills every unit."""
+    units = parse_payload(solution).geometry.units
+    return (all(clue in (0, value) for clue, value in zip(puzzle, solution))
+            and all(len({solution[cell] for cell in unit}) == size
+                    for unit in units))
+
+
+def test_solve_16x16_expert():
+    """Test for /v1/solve endpoint with the default engine on every 16x16 expert puzzle."""
+    with app.app_context():
+        for puzzle in CORPUS['16x16-expert']:
+            response = app.test_client().post('/v1/solve', json={"payload": puzzle})
+            solution = json.loads(response.get_data(as_text=True))["solved"]
+
+            assert response.status_code == 200
+            assert valid_solution(puzzle, solution, 16)
+
+
+def test_backtracking_16x16_expert():
+    """Test for the backtracking engine picking the cell with fewest candidates on 16x16."""
+    puzzle = CORPUS['16x16-expert'][0]
+    response, status = solve_payload(serialize(bytearray(puzzle), as_list=True), 'backtracking')
+
+    assert status == 200
+    assert valid_solution(puzzle, response["solved"], 16)
+
+
+def test_solve_25x25():
+    """Test for the default engine on every 25x25 puzzle."""
+    for puzzle in CORPUS['25x25']:
+        response, status = solve_payload(serialize(bytearray(puzzle), as_list=True))
+
+        assert status == 200
+        assert valid_solution(puzzle, response["solved"], 25)
+
+
+def test_generate_16x16():
+    """Test for /v1/generate endpoint with a 16x16 board."""
+    with app.app_context():
+        response = app.test_client().get('/v1/generate?size=16&difficulty=easy&max_clues=120')
+        data = json.loads(response.get_data(as_text=True))
+        cells, size, box_size = parse(data["sudoku"])
+
+        assert response.status_code == 200
+        assert size == 16 and len(data["sudoku"]) == 256
+        assert data["clues"] == sum(1 for cell in cells if cell)
+        assert count_solutions(list(cells), size, box_size) == 1
+
+
+def test_generate_25x25():
+    """Test for /v1/generate endpoint with a 25x25 board within the default limits."""
+    with app.app_context():
+        response = app.test_client().get('/v1/generate?size=25')
+        data = json.loads(response.get_data(as_text=True))
+        cells, size, box_size = parse(data["sudoku"])
+
+        assert response.status_code == 200
+        assert size == 25 and 151 <= data["clues"] <= 313
+        assert count_solutions(list(cells), size, box_size) == 1
+
+
+def test_generate_invalid_size():
+    """Test for /v1/generate endpoint with an unsupported board size."""
+    with app.app_context():
+        response = app.test_client().get('/v1/generate?size=7')
+        data = json.loads(response.get_data(as_text=True))
+
+        assert response.status_code == 400
+        assert data["error"] == "Unsupported board size."
+        assert data["sizes"] == [4, 9, 16, 25]
+
+
+def test_repr_16x16():
+    """Test for printing a 16x16 board with one digit per value."""
+    lines = repr(parse_payload(CORPUS['16x16-expert'][0])).splitlines()
+
+    assert len(lines) == 16 + 3
+    assert len({len(line) for line in lines}) == 1
@@ -0,0 +1,105 @@
+from app.solver import dlx
+from app.solver.geometry import geometry
+from app.solver.sudoku_solver import Board
+from app.utils import parse_payload
+
+PUZZLE = "900000000060000000027008000000000307890300000301020580000100800080075602010600009"
+
+
+def test_geometry():
+    """Test for peer and unit tables shared by boards of the same geometry."""
+    tables = geometry(9, 3)
+    assert parse_payload(PUZZLE).geometry is tables
+    assert len(tables.units) == 27
+    assert tables.units[18] == (0, 1, 2, 9, 10, 11, 18, 19, 20)
+    assert tables.cell_units[80] == (8, 17, 26)
+    assert all(len(peers) == 20 for peers in tables.peers)
+    assert all(len(peers) == 3 * 15 - 6 for peers in geometry(16, 4).peers)
+
+
+def test_used_sets():
+    """Test for Board row, column and box bitsets."""
+    board = parse_payload(PUZZLE)
+
+    assert board.rows_used[0] == 1 << 9
+    assert board.cols_used[0] == (1 << 9) | (1 << 8) | (1 << 3)
+    assert board.boxes_used[0] == (1 << 9) | (1 << 6) | (1 << 2) | (1 << 7)
+
+
+def test_place_and_remove():
+    """Test for incremental Board updates on place and remove."""
+    board = parse_payload(PUZZLE)
+    candidates = board.candidates((0, 1))
+
+    assert board.valid(4, (0, 1))
+    board.place(4, (0, 1))
+    assert board.board[0][1] == 4
+    assert not board.valid(4, (0, 5))
+    assert not board.valid(4, (8, 1))
+    assert not board.valid(4, (2, 0))
+
+    board.remove((0, 1))
+    assert board.board[0][1] == 0
+    assert board.valid(4, (0, 5))
+    assert board.candidates((0, 1)) == candidates
+
+
+def test_snapshot_restore():
+    """Test for restoring a Board saved before placing values."""
+    board = parse_payload(PUZZLE)
+    state = board.snapshot()
+    board.preprocess_board()
+    assert 0 not in board.cells
+
+    board.restore(state)
+    assert board.cells == bytearray(int(item) for item in PUZZLE)
+    assert board.rows_used == parse_payload(PUZZLE).rows_used
+    assert board.candidates((0, 1)) == parse_payload(PUZZLE).candidates((0, 1))
+
+
+def test_preprocess_board():
+    """Test for Board preprocessing with constraint propagation."""
+    board = parse_payload(PUZZLE)
+    passes = board.preprocess_board()
+
+    assert passes == 2
+    assert board.rules["hidden_single"] == 9
+    assert all(all(row) for row in board.board)
+    assert board.check_solvable()
+
+
+def test_preprocess_board_naked_subsets():
+    """Test for naked pair and triple elimination during preprocessing."""
+    solution = "938764125564291738127538964245816397896357241371429586659142873483975612712683459"
+    board = parse_payload("900000000000090000000030000005000007000050000071000000000000003083975002000680450")
+    board.preprocess_board()
+
+    assert board.rules["naked_pair"] >= 1
+    assert board.rules["naked_triple"] >= 1
+    for cell, bits in enumerate(board.mask):
+        assert bits >> int(solution[cell]) & 1
+
+
+def test_solve_iterative_16x16():
+    """Test for the iterative solver on a 16x16 board."""
+    full = Board([[0] * 16 for _ in range(16)], 16, 4, (1, 17))
+    dlx.solve(full)
+    puzzle = [[0 if (i * 16 + j) % 2 else number for j, number in enumerate(row)]
+              for i, row in enumerate(full.board)]
+    board = Board(puzzle, 16, 4, (1, 17))
+
+    assert board.solve_iterative()
+    assert all(all(row) for row in board.board)
+    assert board.check_solvable()
+
+
+def test_solve_iterative_mask():
+    """Test that the iterative solver only tries values allowed by the mask."""
+    full = parse_payload(PUZZLE)
+    full.solve()
+    board = parse_payload("0" * 81)
+    board.mask = [1 << number for number in full.cells]
+
+    assert board.solve_iterative()
+    assert board.cells == full.cells
+    assert board.iterations == 82
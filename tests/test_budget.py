@@ -0,0 +1,23 @@
+from threading import Event
+import pytest
+from app.solver.budget import CLOCK_INTERVAL, Budget, BudgetExceeded, SearchCancelled
+
+
+def test_budget_iterations():
+    """Test that a budget is exhausted once max_iterations iterations are spent."""
+    budget = Budget(max_iterations=10)
+    for _ in range(9):
+        budget.spend()
+    with pytest.raises(BudgetExceeded):
+        budget.spend()
+    assert budget.iterations == 10
+
+
+def test_budget_spend_many():
+    """Test that spending several iterations at once still reads the cancellation flag."""
+    cancelled = Event()
+    budget = Budget(cancelled=cancelled)
+    budget.spend(CLOCK_INTERVAL - 1)
+    cancelled.set()
+    with pytest.raises(SearchCancelled):
+        budget.spend(3)
@@ -0,0 +1,35 @@
+import pytest
+from flask import json
+from app import app
+
+pytest.importorskip("numpy")
+
+app.testing = True
+
+
+def test_solve_bulk_ok():
+    """Test for /v1/solve/bulk endpoint."""
+    with app.app_context():
+        test_bulk = {
+            "payloads": [
+                "900000000060000000027008000000000307890300000301020580000100800080075602010600009",
+                "800000000003600000070090200050007000000045700000100030001000068008500010090000400",
+                "999900000060000000027008000000000307890300000301020580000100800080075602010600009",
+                "123456780000000009000000000000000000000000000000000000000000000000000000000000000",
+                "12"
+            ],
+            "engine": "dlx"
+            }
+        response = app.test_client().post('/v1/solve/bulk', json=test_bulk)
+        results = json.loads(response.get_data(as_text=True))["results"]
+
+        assert response.status_code == 200
+        assert [result["status"] for result in results] == [200, 200, 400, 400, 400]
+        assert results[0]["solved"] == \
+            "938764125564291738127538964245816397896357241371429586659142873483975612712683459"
+        assert results[0]["iterations"] == 0
+        assert results[1]["solved"] == \
+            "812753649943682175675491283154237896369845721287169534521974368438526917796318452"
+        assert results[1]["iterations"] > 0
+        assert results[2]["error"] == "Invalid clues."
+        assert results[3]["error"] == "No solution."
@@ -0,0 +1,62 @@
+from flask import json
+from app import app
+from app.cache import SolutionCache
+from app.utils import solve_payload
+
+app.testing = True
+
+PUZZLE = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+SOLUTION = "812753649943682175675491283154237896369845721287169534521974368438526917796318452"
+
+
+def transform(board: str) -> str:
+    """Relabel digits, swap the first two rows and columns, and transpose a 9x9 board."""
+    labels = "0" + "365478912"
+    rows = [[labels[int(board[i * 9 + j])] for j in range(9)] for i in range(9)]
+    rows[0], rows[1] = rows[1], rows[0]
+    for row in rows:
+        row[0], row[1] = row[1], row[0]
+    return ''.join(rows[j][i] for i in range(9) for j in range(9))
+
+
+def test_cache_equivalent_puzzle():
+    """Test for a cached solution mapped back to an equivalent puzzle."""
+    cache = SolutionCache(8)
+    response, status = cache.solve(PUZZLE, "dlx", solve_payload)
+    assert status == 200
+    assert response["solved"] == SOLUTION
+
+    response, status = cache.solve(transform(PUZZLE), "dlx", solve_payload)
+    assert status == 200
+    assert response["original"] == transform(PUZZLE)
+    assert response["solved"] == transform(SOLUTION)
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_eviction():
+    """Test for least recently used eviction and expiry."""
+    now = [0.0]
+    cache = SolutionCache(1, ttl=10, clock=lambda: now[0])
+    cache.solve(PUZZLE, "dlx", solve_payload)
+    cache.solve(PUZZLE, "iterative", solve_payload)
+    assert cache.stats()["size"] == 1
+
+    now[0] = 5.0
+    cache.solve(PUZZLE, "iterative", solve_payload)
+    assert cache.stats()["hits"] == 1
+
+    now[0] = 20.0
+    cache.solve(PUZZLE, "iterative", solve_payload)
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 3
+
+
+def test_cache_stats():
+    """Test for /v1/cache endpoint."""
+    with app.app_context():
+        response = app.test_client().get('/v1/cache')
+
+        assert response.status_code == 200
+        assert set(json.loads(response.get_data(as_text=True))) == \
+            {"size", "maxsize", "ttl", "hits", "misses", "store"}
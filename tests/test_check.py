@@ -12,6 +12,8 @@ def test_check_ok():
         expected_response = {
             "original": "900000000060000000027008000000000307890300000301020580000100800080075602010600009",
             "solvable": True,
+            "solutions": 1,
+            "iterations": 0,
             "reason": "Looks good."
             }
         response = app.test_client().post('/v1/check', json=test_sudoku)
@@ -43,3 +45,46 @@ def test_check_invalid_payload():
             'solvable': False,
             'reason': 'Invalid input length or non square board size.'
             }
+
+
+def test_check_many_solutions():
+    """Test for /v1/check endpoint with a board with many solutions."""
+    with app.app_context():
+        test_sudoku = {
+            "payload": "000000000060000000027008000000000307890300000301020580000100800080075602010600009"
+            }
+        response = app.test_client().post('/v1/check', json=test_sudoku)
+        data = json.loads(response.get_data(as_text=True))
+
+        assert response.status_code == 200
+        assert data["solutions"] == "many"
+        assert data["reason"] == "Multiple solutions."
+
+
+def test_check_no_solution():
+    """Test for /v1/check endpoint with valid clues but no solution."""
+    with app.app_context():
+        test_sudoku = {
+            "payload": "123456780000000009000000000000000000000000000000000000000000000000000000000000000"
+            }
+        response = app.test_client().post('/v1/check', json=test_sudoku)
+        data = json.loads(response.get_data(as_text=True))
+
+        assert response.status_code == 200
+        assert data["solutions"] == 0
+        assert data["solvable"] is False
+
+
+def test_check_budget_exhausted():
+    """Test for /v1/check endpoint with a search budget too small to decide."""
+    with app.app_context():
+        test_sudoku = {
+            "payload": "800000000003600000070090200050007000000045700000100030001000068008500010090000400",
+            "budget": 5
+            }
+        response = app.test_client().post('/v1/check', json=test_sudoku)
+        data = json.loads(response.get_data(as_text=True))
+
+        assert response.status_code == 200
+        assert data["solutions"] == "unknown"
+        assert data["iterations"] == 5
@@ -0,0 +1,80 @@
+import pytest
+from flask import json
+from app import app
+from app.codec import PayloadError, parse, serialize
+
+app.testing = True
+
+PUZZLE = "900000000060000000027008000000000307890300000301020580000100800080075602010600009"
+SOLUTION = "938764125564291738127538964245816397896357241371429586659142873483975612712683459"
+PUZZLE_16 = "000200360d0cb0g0000agd09102ec87f1d00c0008f7g06090904e0f0006b032d7bcf60020030g00090e5" \
+            "0001dc000a074000000020090f0630d0080f7b0020e004bg007e01080dc0538c00g0f00d0000f7000c00" \
+            "g0e20008e100090000a00000080b70000gc4a0d300010000005f000b0000000g00d7e1050007f093ba804c00"
+
+
+def test_parse_encodings():
+    """Test that strings with . blanks, flat lists and rows parse to the same cells."""
+    cells, size, box_size = parse(PUZZLE)
+    rows = [list(cells[row * 9:row * 9 + 9]) for row in range(9)]
+
+    assert (size, box_size) == (9, 3)
+    assert parse(PUZZLE.replace('0', '.'))[0] == cells
+    assert parse(list(cells))[0] == cells
+    assert parse(rows)[0] == cells
+    assert serialize(cells) == PUZZLE
+    assert serialize(cells, as_list=True) == list(cells)
+
+
+def test_parse_base36():
+    """Test that boards larger than 9x9 round trip through base-36 digits."""
+    cells, size, box_size = parse(PUZZLE_16)
+
+    assert (size, box_size) == (16, 4)
+    assert max(cells) == 16
+    assert parse(PUZZLE_16.upper())[0] == cells
+    assert serialize(cells) == PUZZLE_16
+
+
+@pytest.mark.parametrize('payload', [
+    PUZZLE[:80], PUZZLE[:80] + 'a', PUZZLE[:80] + 'x', PUZZLE[:80] + '٠', PUZZLE[:80] + ' ',
+    [0] * 80, [0] * 80 + [10], [0] * 80 + [-1], [0] * 80 + [True], [0] * 80 + ['1'], 81, None, ''
+])
+def test_parse_invalid(payload):
+    """Test that malformed payloads raise PayloadError."""
+    with pytest.raises(PayloadError):
+        parse(payload)
+
+
+@pytest.mark.parametrize('payload', [PUZZLE[:80] + '٠', PUZZLE[:80] + 'x', 81, {"a": 1}])
+def test_solve_malformed_payload(payload):
+    """Test that malformed payloads are rejected by /v1/solve with a 400."""
+    with app.app_context():
+        response = app.test_client().post('/v1/solve', json={"payload": payload})
+
+        assert response.status_code == 400
+        assert json.loads(response.get_data(as_text=True))["solvable"] is False
+
+
+def test_solve_dot_blanks():
+    """Test for /v1/solve endpoint with . for blanks."""
+    with app.app_context():
+        test_sudoku = {"payload": PUZZLE.replace('0', '.')}
+        response = app.test_client().post('/v1/solve', json=test_sudoku)
+
+        assert response.status_code == 200
+        assert json.loads(response.get_data(as_text=True))["solved"] == SOLUTION
+
+
+def test_solve_list_payload():
+    """Test for /v1/solve endpoint with a 16x16 board given as rows of integers."""
+    with app.app_context():
+        cells = list(parse(PUZZLE_16)[0])
+        test_sudoku = {"payload": [cells[row * 16:row * 16 + 16] for row in range(16)],
+                       "engine": "dlx"}
+        response = app.test_client().post('/v1/solve', json=test_sudoku)
+        solved = json.loads(response.get_data(as_text=True))["solved"]
+
+        assert response.status_code == 200
+        assert len(solved) == 256
+        assert all(value == cell for value, cell in zip(solved, cells) if cell)
+        assert sorted(solved[:16]) == list(range(1, 17))
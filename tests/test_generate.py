@@ -0,0 +1,55 @@
+from flask import json
+from app import app
+from app.solver.generator import count_solutions
+
+app.testing = True
+
+
+def test_generate_ok():
+    """Test for /v1/generate endpoint."""
+    with app.app_context():
+        response = app.test_client().get('/v1/generate?difficulty=medium&max_clues=35')
+        data = json.loads(response.get_data(as_text=True))
+
+        assert response.status_code == 200
+        assert len(data["sudoku"]) == 81
+        assert data["clues"] == sum(1 for number in data["sudoku"] if number != '0')
+        assert data["difficulty"] in ("easy", "medium")
+        assert count_solutions([int(number) for number in data["sudoku"]], 9, 3) == 1
+
+
+def test_generate_invalid_difficulty():
+    """Test for /v1/generate endpoint."""
+    with app.app_context():
+        response = app.test_client().get('/v1/generate?difficulty=impossible')
+
+        assert response.status_code == 400
+        assert json.loads(response.get_data(as_text=True))["error"] == \
+            "Invalid difficulty or clue range."
+
+
+def test_generate_pool():
+    """Test for /v1/generate/pool endpoint after a pooled /v1/generate request."""
+    with app.app_context():
+        response = app.test_client().get('/v1/generate?difficulty=easy')
+        assert response.status_code == 200
+        assert json.loads(response.get_data(as_text=True))["difficulty"] == "easy"
+
+        response = app.test_client().get('/v1/generate/pool')
+        data = json.loads(response.get_data(as_text=True))
+
+        pools = {(pool["size"], pool["difficulty"]): pool["ready"] for pool in data["pools"]}
+
+        assert response.status_code == 200
+        assert (9, "easy") in pools
+        assert isinstance(pools[9, "easy"], int) and 0 <= pools[9, "easy"] <= data["depth"]
+
+
+def test_generate_budget_exhausted():
+    """Test for /v1/generate endpoint with an iteration budget too small to finish."""
+    with app.app_context():
+        response = app.test_client().get('/v1/generate?min_clues=20&max_iterations=10')
+        data = json.loads(response.get_data(as_text=True))
+
+        assert response.status_code == 422
+        assert data["error"] == "Generator budget exhausted."
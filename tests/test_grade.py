@@ -0,0 +1,72 @@
+from flask import json
+from app import app
+
+app.testing = True
+
+EASY = "036000050000064708000008039100000000000783501003010046280001005000009000410002307"
+HARD = "067100300000430008005002004070200040210000000000006900000000000300010000000690850"
+
+
+def test_grade_easy():
+    """Test for /v1/grade endpoint with a board solved by naked singles."""
+    with app.app_context():
+        response = app.test_client().post('/v1/grade', json={"payload": EASY})
+        result = json.loads(response.get_data(as_text=True))
+
+        assert response.status_code == 200
+        assert result["solved"] is True
+        assert result["difficulty"] == 'easy'
+        assert result["techniques"] == {"naked_single": EASY.count('0')}
+        assert result["score"] == EASY.count('0')
+        assert '0' not in result["partial"]
+        assert all(step["technique"] == 'naked_single' and len(step["cells"]) == 1
+                   for step in result["steps"])
+
+
+def test_grade_trace():
+    """Test for /v1/grade endpoint with a board needing an XY-wing."""
+    with app.app_context():
+        response = app.test_client().post('/v1/grade', json={"payload": HARD})
+        result = json.loads(response.get_data(as_text=True))
+
+        assert response.status_code == 200
+        assert result["solved"] is True
+        assert result["difficulty"] == 'expert'
+        assert result["techniques"]["xy_wing"] == 1
+        assert '0' not in result["partial"]
+        for technique, count in result["techniques"].items():
+            assert count == sum(1 for step in result["steps"] if step["technique"] == technique)
+        wing = next(step for step in result["steps"] if step["technique"] == 'xy_wing')
+        assert len(wing["cells"]) == 3 and len(wing["values"]) == 3 and wing["eliminated"] > 0
+
+
+def test_grade_invalid_payload():
+    """Test for /v1/grade endpoint with an invalid payload."""
+    with app.app_context():
+        response = app.test_client().post('/v1/grade', json={"payload": EASY[:80]})
+
+        assert response.status_code == 400
+        assert json.loads(response.get_data(as_text=True))["solvable"] is False
+
+
+def test_grade_multiple_solutions():
+    """Test for /v1/grade endpoint with a board without a unique solution."""
+    with app.app_context():
+        response = app.test_client().post('/v1/grade', json={"payload": '0' * 81})
+        result = json.loads(response.get_data(as_text=True))
+
+        assert response.status_code == 422
+        assert result["solutions"] == "many"
+
+
+def test_solve_logic_engine():
+    """Test for /v1/solve endpoint with the logic engine."""
+    with app.app_context():
+        test_sudoku = {"payload": HARD, "engine": "logic", "debug": True}
+        response = app.test_client().post('/v1/solve', json=test_sudoku)
+        result = json.loads(response.get_data(as_text=True))
+        reference = app.test_client().post('/v1/solve', json={"payload": HARD, "engine": "dlx"})
+
+        assert response.status_code == 200
+        assert result["solved"] == json.loads(reference.get_data(as_text=True))["solved"]
+        assert result["rules"]["xy_wing"] == 1
@@ -0,0 +1,112 @@
+from flask import json
+from app import app
+from app.utils import hint_payload
+
+app.testing = True
+
+HARD = "067100300000430008005002004070200040210000000000006900000000000300010000000690850"
+LOCKED = "000062000003510400020094000600200900000000070090400100079020003530080090008040700"
+SOLUTION = "938764125564291738127538964245816397896357241371429586659142873483975612712683459"
+
+
+def test_hint_placement():
+    """Test for /v1/hint endpoint returning a single."""
+    with app.app_context():
+        response = app.test_client().post('/v1/hint', json={"payload": HARD})
+
+        assert response.status_code == 200
+        assert json.loads(response.get_data(as_text=True)) == {
+            "original": HARD,
+            "hint": {"technique": "hidden_single", "cells": [0], "values": [4]}
+        }
+
+
+def test_hint_elimination():
+    """Test for /v1/hint endpoint returning the candidates eliminated by locked candidates."""
+    with app.app_context():
+        response = app.test_client().post('/v1/hint', json={"payload": LOCKED})
+        result = json.loads(response.get_data(as_text=True))
+
+        assert response.status_code == 200
+        assert result["hint"] == {
+            "technique": "locked_candidates",
+            "cells": [31, 40, 49],
+            "values": [3],
+            "eliminated": 4,
+            "removed": [[32, [3]], [39, [3]], [41, [3]], [50, [3]]]
+        }
+
+
+def test_hint_marks():
+    """Test for /v1/hint endpoint with pencil marks leaving a naked single."""
+    with app.app_context():
+        marks = [[] for _ in range(81)]
+        marks[0] = [7]
+        test_sudoku = {"payload": LOCKED, "marks": marks}
+        response = app.test_client().post('/v1/hint', json=test_sudoku)
+
+        assert response.status_code == 200
+        assert json.loads(response.get_data(as_text=True))["hint"] == {
+            "technique": "naked_single", "cells": [0], "values": [7]
+        }
+
+
+def test_hint_marks_exclude_solution():
+    """Test for /v1/hint endpoint with pencil marks ruling out the solution of a cell."""
+    with app.app_context():
+        marks = [[] for _ in range(81)]
+        marks[0] = [4]
+        test_sudoku = {"payload": LOCKED, "marks": marks}
+        response = app.test_client().post('/v1/hint', json=test_sudoku)
+
+        assert response.status_code == 200
+        assert json.loads(response.get_data(as_text=True))["hint"] == {
+            "technique": "contradiction", "cells": [0], "values": [7],
+            "reason": "Pencil marks exclude the solution."
+        }
+
+
+def test_hint_marks_budget():
+    """Test that pencil marks are not checked once the search budget runs out."""
+    marks = [[] for _ in range(81)]
+    marks[0] = [4]
+    response, status = hint_payload(LOCKED, marks, budget=1)
+
+    assert status == 200
+    assert response["hint"] == {"technique": "naked_single", "cells": [0], "values": [4]}
+
+
+def test_hint_contradiction():
+    """Test for /v1/hint endpoint with pencil marks ruling out every candidate of a cell
+    of a board without a unique solution."""
+    with app.app_context():
+        marks = [[] for _ in range(81)]
+        marks[0] = [6]
+        test_sudoku = {"payload": "06" + "0" * 79, "marks": marks}
+        response = app.test_client().post('/v1/hint', json=test_sudoku)
+
+        assert response.status_code == 200
+        assert json.loads(response.get_data(as_text=True))["hint"] == {
+            "technique": "contradiction", "cells": [0], "values": []
+        }
+
+
+def test_hint_solved():
+    """Test for /v1/hint endpoint with a solved board."""
+    with app.app_context():
+        response = app.test_client().post('/v1/hint', json={"payload": SOLUTION})
+        result = json.loads(response.get_data(as_text=True))
+
+        assert response.status_code == 200
+        assert result["hint"] is None
+        assert result["reason"] == "Board is already solved."
+
+
+def test_hint_invalid_marks():
+    """Test for /v1/hint endpoint with malformed pencil marks."""
+    with app.app_context():
+        for marks in ([[1]] * 80, [[10]] * 81, "123"):
+            test_sudoku = {"payload": LOCKED, "marks": marks}
+            response = app.test_client().post('/v1/hint', json=test_sudoku)
+
+            assert response.status_code == 400
@@ -0,0 +1,92 @@
+import time
+from threading import Event
+from flask import json
+from app import app, views
+from app.jobs import JobQueue, SQLiteStore
+
+app.testing = True
+
+PUZZLE = "900000000060000000027008000000000307890300000301020580000100800080075602010600009"
+SOLUTION = "938764125564291738127538964245816397896357241371429586659142873483975612712683459"
+SLOW = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+
+
+def wait(client, job_id: str, statuses=('done', 'failed', 'cancelled')) -> dict:
+    """Poll a job until it reaches one of the given statuses."""
+    for _ in range(200):
+        data = json.loads(client.get(f'/v1/jobs/{job_id}').data)
+        if data["status"] in statuses:
+            return data
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} is still {data['status']}.")
+
+
+def test_job_solve():
+    """Test for a job solving a payload in the background."""
+    with app.app_context():
+        client = app.test_client()
+        response = client.post('/v1/jobs', json={"payload": PUZZLE, "engine": "dlx"})
+        assert response.status_code == 202
+        job = json.loads(response.data)
+        assert job["status"] in ('queued', 'running', 'done')
+
+        data = wait(client, job["id"])
+        assert data["status"] == 'done'
+        assert data["status_code"] == 200
+        assert data["result"]["solved"] == SOLUTION
+
+
+def test_job_batch():
+    """Test for a job solving a list of payloads."""
+    with app.app_context():
+        client = app.test_client()
+        response = client.post('/v1/jobs', json={"payloads": [PUZZLE, "123"], "engine": "dlx"})
+        data = wait(client, json.loads(response.data)["id"])
+        assert data["status"] == 'done'
+        assert [result["status"] for result in data["result"]["results"]] == [200, 400]
+
+
+def test_job_cancel(monkeypatch):
+    """Test for cancelling a running job and removing it once finished."""
+    started = Event()
+
+    def blocking_solve(submitted, engine, budget):
+        """Solver stub running until its job is cancelled."""
+        started.set()
+        assert budget.cancelled.wait(5), f"{submitted} with {engine} was never cancelled."
+        budget.spend(0)
+        raise AssertionError("Cancelled budget did not stop the solver.")
+
+    monkeypatch.setattr(views.job_queue, "solve", blocking_solve)
+    with app.app_context():
+        client = app.test_client()
+        response = client.post('/v1/jobs', json={"payload": SLOW, "engine": "backtracking"})
+        job_id = json.loads(response.data)["id"]
+        assert started.wait(5)
+        assert wait(client, job_id, ('running',))["status"] == 'running'
+        assert client.delete(f'/v1/jobs/{job_id}').status_code == 200
+
+        data = wait(client, job_id)
+        assert data["status"] == 'cancelled'
+        assert client.delete(f'/v1/jobs/{job_id}').status_code == 200
+        assert client.get(f'/v1/jobs/{job_id}').status_code == 404
+
+
+def test_sqlite_store_restart(tmp_path):
+    """Test for unfinished jobs of an SQLite store being run again after a restart."""
+    path = str(tmp_path / "jobs.sqlite3")
+    store = SQLiteStore(path)
+    store.save({"id": "abc", "status": 'running', "request": {"payload": PUZZLE},
+                "result": None, "status_code": None, "iterations": 0,
+                "created": 0.0, "updated": 0.0})
+
+    queue = JobQueue(SQLiteStore(path), 1, lambda submitted, engine, budget: (
+        {"original": submitted, "solved": SOLUTION}, 200))
+    for _ in range(200):
+        if queue.describe("abc")["status"] == 'done':
+            break
+        time.sleep(0.05)
+    queue.shutdown()
+    job = SQLiteStore(path).get("abc")
+    assert job["status"] == 'done'
+    assert job["result"]["solved"] == SOLUTION
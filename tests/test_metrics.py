@@ -0,0 +1,55 @@
+from flask import json
+from app import app
+from app.metrics import Registry
+
+app.testing = True
+
+PUZZLE = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+SOLUTION = "812753649943682175675491283154237896369845721287169534521974368438526917796318452"
+
+
+def test_histogram_render():
+    """Test for cumulative histogram buckets in Prometheus text format."""
+    registry = Registry()
+    histogram = registry.histogram('test_seconds', 'Test histogram.', (1, 10), ('stage',))
+    for value in (0.5, 5, 50):
+        histogram.observe(value, 'parse')
+    lines = registry.render().splitlines()
+    assert lines[:2] == ['# HELP test_seconds Test histogram.', '# TYPE test_seconds histogram']
+    assert 'test_seconds_bucket{stage="parse",le="1"} 1' in lines
+    assert 'test_seconds_bucket{stage="parse",le="10"} 2' in lines
+    assert 'test_seconds_bucket{stage="parse",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{stage="parse"} 3' in lines
+
+
+def test_solve_debug():
+    """Test for the stage timings echoed by /v1/solve with debug enabled."""
+    with app.app_context():
+        client = app.test_client()
+        response = client.post('/v1/solve', json={"payload": PUZZLE, "engine": "dlx"})
+        assert "debug" not in json.loads(response.data)
+
+        response = client.post('/v1/solve',
+                               json={"payload": PUZZLE, "engine": "dlx", "debug": True})
+        data = json.loads(response.data)
+        assert response.status_code == 200
+        assert data["solved"] == SOLUTION
+        assert set(data["debug"]["timings"]) == {"parse", "check", "preprocess",
+                                                 "search", "serialize"}
+        assert data["debug"]["max_depth"] > 0
+        assert data["debug"]["pruned"] == 0
+
+
+def test_metrics():
+    """Test for /metrics endpoint."""
+    with app.app_context():
+        client = app.test_client()
+        client.post('/v1/solve', json={"payload": PUZZLE, "engine": "dlx", "debug": True})
+        client.post('/v1/solve', json={"payload": "123"})
+        response = client.get('/metrics')
+        body = response.data.decode()
+        assert response.status_code == 200
+        assert response.mimetype == 'text/plain'
+        assert 'sudoku_requests_total{endpoint="solve",status="400"}' in body
+        assert 'sudoku_stage_duration_seconds_count{stage="search"}' in body
+        assert '# TYPE sudoku_search_depth histogram' in body
@@ -0,0 +1,107 @@
+import time
+from threading import Event, Timer
+import pytest
+from flask import json
+from app import app
+from app.solver import dlx, parallel
+from app.solver.budget import Budget, SearchCancelled
+from app.solver.sudoku_solver import Board
+from app.utils import parse_payload
+
+app.testing = True
+
+PUZZLE = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+SOLUTION = "812753649943682175675491283154237896369845721287169534521974368438526917796318452"
+
+
+def test_split():
+    """Test for the top branch points expanded breadth first into partial boards."""
+    board = parse_payload(PUZZLE)
+    board.preprocess_board()
+    cells = bytes(board.cells)
+    tasks, solved = parallel.split(board, 8)
+
+    assert len(tasks) >= 8
+    assert not solved
+    assert bytes(board.cells) == cells
+    assert all(sum(1 for number in task if number) > sum(1 for number in cells if number)
+               for task in tasks)
+
+
+def test_parallel_solve_and_count():
+    """Test for solving and counting the subtrees of a board on a process pool."""
+    search_pool = parallel.SearchPool(2)
+    try:
+        board = parse_payload(PUZZLE)
+        board.preprocess_board()
+        assert parallel.solve(board, Board.solve_iterative, search_pool)
+        assert ''.join(map(str, board.cells)) == SOLUTION
+
+        board = parse_payload(PUZZLE)
+        board.preprocess_board()
+        assert parallel.solve(board, dlx.solve, search_pool)
+        assert ''.join(map(str, board.cells)) == SOLUTION
+
+        assert parallel.count_solutions(parse_payload(PUZZLE), search_pool=search_pool) == 1
+        assert parallel.count_solutions(parse_payload("0" * 81), 5, search_pool=search_pool) == 5
+        assert len(search_pool.free) == parallel.SLOTS
+    finally:
+        search_pool.shutdown()
+
+
+def wait_for_flag(slot: int) -> tuple[str, None, int]:
+    """Subtree stub running in a pool process until the flag of its search is set."""
+    while not parallel.FLAGS[slot]:
+        time.sleep(0.01)
+    return 'cancelled', None, 0
+
+
+def test_parallel_cancel():
+    """Test that cancelling the budget of a search stops the subtrees it waits on."""
+    search_pool = parallel.SearchPool(2)
+    cancelled = Event()
+    try:
+        slot = search_pool.acquire()
+        Timer(0.2, cancelled.set).start()
+        with pytest.raises(SearchCancelled):
+            search_pool.run(wait_for_flag, [(slot,), (slot,)], slot, lambda results: False,
+                            Budget(cancelled=cancelled))
+        search_pool.release(slot)
+        assert len(search_pool.free) == parallel.SLOTS
+    finally:
+        search_pool.shutdown()
+
+
+def test_parallel_in_process():
+    """Test that a pool of one worker searches in process without starting the processes."""
+    search_pool = parallel.SearchPool(1)
+    board = parse_payload(PUZZLE)
+    board.preprocess_board()
+
+    assert parallel.solve(board, dlx.solve, search_pool)
+    assert ''.join(map(str, board.cells)) == SOLUTION
+    assert parallel.count_solutions(parse_payload(PUZZLE), search_pool=search_pool) == 1
+    assert search_pool.executor is None and search_pool.flags is None
+
+
+def test_configure_pool():
+    """Test for the default pool replaced by one sized like SOLVER_WORKERS."""
+    default = parallel.pool
+    try:
+        assert parallel.configure(1) is parallel.pool
+        assert parallel.pool.workers == 1
+    finally:
+        parallel.pool = default
+
+
+def test_solve_parallel_engine():
+    """Test for /v1/solve with the parallel engine."""
+    with app.app_context():
+        client = app.test_client()
+        response = client.post('/v1/solve', json={
+            "payload": "100007090030020008009600500005300900010080002600004000300000010040000007007000300",
+            "engine": "parallel"
+        })
+        data = json.loads(response.data)
+        assert response.status_code == 200
+        assert "0" not in data["solved"]
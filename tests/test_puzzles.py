@@ -0,0 +1,40 @@
+from time import sleep
+from app.puzzles import PuzzlePool
+
+
+def fake_generate(size, difficulty):
+    """Generate a placeholder puzzle."""
+    return '0' * size * size, 1, difficulty
+
+
+def test_puzzle_pool_refill():
+    """Test for the background refill of the puzzle pool."""
+    pool = PuzzlePool(depth=3, low_water=1, generate=fake_generate)
+
+    assert pool.pop(9, 'easy') is None
+    for _ in range(100):
+        if pool.stats()["generated"] == 3:
+            break
+        sleep(0.01)
+
+    assert pool.pop(9, 'easy') == ('0' * 81, 1, 'easy')
+    assert pool.stats()["pools"] == [{"size": 9, "difficulty": "easy", "ready": 2}]
+    assert pool.stats()["refill_rate"] > 0
+
+
+def test_puzzle_pool_disabled():
+    """Test for a puzzle pool with zero depth."""
+    pool = PuzzlePool(depth=0, generate=fake_generate)
+
+    assert pool.pop(9, None) is None
+    assert pool.thread is None
+
+
+def test_puzzle_pool_sizes():
+    """Test that sizes which are not pooled are neither popped nor refilled."""
+    pool = PuzzlePool(depth=3, generate=fake_generate)
+
+    assert pool.pop(25, 'expert') is None
+    assert pool.thread is None
+    assert pool.stats()["pools"] == []
+    assert pool.stats()["sizes"] == [9]
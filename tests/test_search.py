@@ -0,0 +1,142 @@
+from itertools import product
+import random
+import pytest
+from flask import json
+from app import app
+from app.solver import search
+from app.utils import engine_solver, parse_payload
+from sudokubench import bench_engine, strategy_engines
+
+app.testing = True
+
+HARD = "004030080500001000700908400807000002006800003000002000061350000400000050008400009"
+SOLUTION = "624735981589241637713968425847593162296814573135672894961357248472189356358426719"
+
+
+def test_parse_strategy():
+    """Test for strategies parsed from slash separated parts."""
+    assert search.parse_strategy("") == search.DEFAULT_STRATEGY
+    assert search.parse_strategy("restarts/lcv/mrv") == search.Strategy("mrv", "lcv", True)
+    assert search.parse_strategy("random") == search.Strategy("wdeg", "random", False)
+    with pytest.raises(ValueError):
+        search.parse_strategy("mrv/fastest")
+
+
+def test_luby():
+    """Test for the Luby sequence of restart limits."""
+    assert [search.luby(index) for index in range(15)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1,
+                                                           2, 4, 8]
+
+
+def test_search_strategies():
+    """Test that every combination of strategies solves a hard board."""
+    for branching, values, restarts in product(search.BRANCHING, search.VALUE_ORDERS,
+                                               (False, True)):
+        board = parse_payload(HARD)
+        board.preprocess_board()
+        assert search.solve(board, search.Strategy(branching, values, restarts), seed=1)
+        assert bytes(board.cells) == bytes(int(number) for number in SOLUTION)
+
+
+def test_search_counters():
+    """Test that the counters are restored once every placement is undone."""
+    board = parse_payload(HARD)
+    searcher = search.Search(board, search.Strategy("wdeg", "lcv", False))
+    counters = (searcher.candidates[:], searcher.counts[:], searcher.degree[:],
+                [unit[:] for unit in searcher.support],
+                [set(bucket) for bucket in searcher.buckets])
+    trail = []
+    for _ in range(5):
+        empty = [cell for cell, number in enumerate(board.cells) if not number]
+        cell = searcher.pick()
+        assert searcher.counts[cell] / searcher.cell_weights[cell] == min(
+            searcher.counts[other] / searcher.cell_weights[other] for other in empty)
+        num = searcher.values(cell)[0]
+        trail.append((cell, num, searcher.place(cell, num)))
+        assert not board.valid(num, divmod(cell, 9))
+    for cell, num, changed in reversed(trail):
+        searcher.undo(cell, num, changed)
+
+    assert bytes(board.cells) == bytes(int(number) for number in HARD)
+    assert (searcher.candidates, searcher.counts, searcher.degree, searcher.support,
+            searcher.buckets) == counters
+
+
+def test_search_ties():
+    """Test that mrv_degree picks from its buckets and restores them once undone."""
+    board = parse_payload(HARD)
+    searcher = search.Search(board, search.Strategy("mrv_degree", "common", False))
+    ties = [[set(tie) for tie in count] for count in searcher.ties]
+    trail = []
+    for _ in range(5):
+        empty = [cell for cell, number in enumerate(board.cells) if not number]
+        best = min((searcher.counts[cell], -searcher.degree[cell]) for cell in empty)
+        cell = searcher.pick()
+        assert (searcher.counts[cell], -searcher.degree[cell]) == best
+        num = searcher.values(cell)[0]
+        trail.append((cell, num, searcher.place(cell, num)))
+    for cell, num, changed in reversed(trail):
+        searcher.undo(cell, num, changed)
+
+    assert searcher.ties == ties
+
+
+def test_search_contradiction():
+    """Test for the search on a board where a cell has no candidates."""
+    board = parse_payload("12345678" + "0" * 72 + "9")
+
+    assert not search.solve(board)
+    assert board.iterations == 1
+
+
+def test_search_generate():
+    """Test that Board.generate fills an empty board in random order."""
+    boards = [parse_payload("0" * 81) for _ in range(2)]
+    for board in boards:
+        assert board.generate()
+        assert 0 not in board.cells and board.check_solvable()
+    assert boards[0].cells != boards[1].cells
+
+
+def test_search_generate_seeded():
+    """Test that Board.generate is reproduced by seeding the random module."""
+    boards = [parse_payload("0" * 81) for _ in range(2)]
+    for board in boards:
+        random.seed(7)
+        assert board.generate()
+    assert boards[0].cells == boards[1].cells
+
+
+def test_engine_solver():
+    """Test for engines resolved by name or with a search strategy."""
+    assert engine_solver("dlx") is not None
+    assert engine_solver("search") is search.solve
+    assert engine_solver("search:mrv/random/restarts").keywords["strategy"] == \
+        search.Strategy("mrv", "random", True)
+    assert engine_solver("search:fastest") is None
+    assert engine_solver("dlx:mrv") is None
+    assert engine_solver(None) is None
+
+
+def test_solve_search_strategy():
+    """Test for /v1/solve endpoint with a search strategy."""
+    with app.app_context():
+        test_sudoku = {"payload": HARD, "engine": "search:mrv_degree/lcv/restarts"}
+        response = app.test_client().post('/v1/solve', json=test_sudoku)
+
+        assert response.status_code == 200
+        assert json.loads(response.get_data(as_text=True))["solved"] == SOLUTION
+
+        test_sudoku["engine"] = "search:fastest"
+        response = app.test_client().post('/v1/solve', json=test_sudoku)
+        assert response.status_code == 400
+        assert "search" in json.loads(response.get_data(as_text=True))["engines"]
+
+
+def test_bench_strategies():
+    """Test for the benchmark of the search engine with a strategy."""
+    assert len(strategy_engines()) == len(search.BRANCHING) * len(search.VALUE_ORDERS) * 2
+    assert "search:wdeg/lcv/restarts" in strategy_engines()
+
+    result = bench_engine([[int(number) for number in HARD]], "search:mrv/lcv", memory=False)
+    assert result["solved"] == 1
@@ -10,9 +10,10 @@ def test_solve_ok():
             "payload": "900000000060000000027008000000000307890300000301020580000100800080075602010600009"
             }
         expected_response = {
-            "iterations": 9399,
+            "iterations": 0,
             "original": "900000000060000000027008000000000307890300000301020580000100800080075602010600009",
-            "passes": 5,
+            "passes": 2,
+            "rules": {"naked_single": 56, "hidden_single": 9, "naked_pair": 0, "naked_triple": 0},
             "solved": "938764125564291738127538964245816397896357241371429586659142873483975612712683459"
             }
         response = app.test_client().post('/v1/solve', json=test_sudoku)
@@ -44,3 +45,89 @@ def test_solve_invalid_payload():
             'original': '9000000000600000000270080000000003078903000003010205800001008000800756020009',
             'solvable': False
             }
+
+
+def test_solve_dlx():
+    """Test for /v1/solve endpoint with the Dancing Links engine."""
+    with app.app_context():
+        test_sudoku = {
+            "payload": "800000000003600000070090200050007000000045700000100030001000068008500010090000400",
+            "engine": "dlx"
+            }
+        response = app.test_client().post('/v1/solve', json=test_sudoku)
+        data = json.loads(response.get_data(as_text=True))
+
+        assert response.status_code == 200
+        assert data["solved"] == "812753649943682175675491283154237896369845721287169534521974368438526917796318452"
+        assert data["iterations"] > 0
+
+
+def test_solve_iterative():
+    """Test for /v1/solve endpoint with the iterative engine."""
+    with app.app_context():
+        test_sudoku = {
+            "payload": "800000000003600000070090200050007000000045700000100030001000068008500010090000400",
+            "engine": "iterative"
+            }
+        response = app.test_client().post('/v1/solve', json=test_sudoku)
+        data = json.loads(response.get_data(as_text=True))
+
+        assert response.status_code == 200
+        assert data["solved"] == "812753649943682175675491283154237896369845721287169534521974368438526917796318452"
+
+
+def test_solve_unknown_engine():
+    """Test for /v1/solve endpoint with an unknown engine."""
+    with app.app_context():
+        test_sudoku = {
+            "payload": "900000000060000000027008000000000307890300000301020580000100800080075602010600009",
+            "engine": "guess"
+            }
+        response = app.test_client().post('/v1/solve', json=test_sudoku)
+
+        assert response.status_code == 400
+        assert json.loads(response.get_data(as_text=True))["error"] == "Unknown engine."
+
+
+def test_solve_auto_minimal():
+    """Test for /v1/solve endpoint with the default engine on boards hard for backtracking."""
+    with app.app_context():
+        for payload in ("520006000000000701300000000000400800600000050000000000041800000000030020008700000",
+                        "800000000003600000070090200050007000000045700000100030001000068008500010090000400"):
+            test_sudoku = {"payload": payload, "max_iterations": 5000, "debug": True}
+            response = app.test_client().post('/v1/solve', json=test_sudoku)
+            solved = json.loads(response.get_data(as_text=True))["solved"]
+
+            assert response.status_code == 200
+            assert all(clue in ('0', value) for clue, value in zip(payload, solved))
+
+
+def test_solve_no_solution():
+    """Test for /v1/solve endpoint with well formed clues leaving a cell without values."""
+    with app.app_context():
+        test_sudoku = {"payload": "12345678" + "0" * 72 + "9", "engine": "dlx"}
+        for _ in range(2):
+            response = app.test_client().post('/v1/solve', json=test_sudoku)
+            data = json.loads(response.get_data(as_text=True))
+
+            assert response.status_code == 422
+            assert data["error"] == "No solution."
+            assert data["solvable"] is False
+            assert "solved" not in data
+
+
+def test_solve_budget_exhausted():
+    """Test for /v1/solve endpoint with an iteration budget too small to finish."""
+    with app.app_context():
+        test_sudoku = {
+            "payload": "100007090030020008009600500005300900010080002600004000300000010040000007007000300",
+            "max_iterations": 10
+            }
+        response = app.test_client().post('/v1/solve', json=test_sudoku)
+        data = json.loads(response.get_data(as_text=True))
+
+        assert response.status_code == 422
+        assert data["error"] == "Solver budget exhausted."
+        assert data["iterations"] == 10
+        assert len(data["partial"]) == 81
+        assert data["elapsed"] >= 0
@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+STARTUP_BUDGET = 0.05
+LAZY_MODULES = ('app.views', 'app.utils', 'app.solver', 'app.jobs', 'app.cache', 'sqlite3',
+                'multiprocessing', 'numpy')
+
+
+def import_profile(**environ) -> dict[str, int]:
+    """Import the app in a fresh interpreter after Flask, returning the cumulative import
+    time of every module it loaded in microseconds."""
+    command = [sys.executable, '-X', 'importtime', '-c', 'import flask; import sudokuapi']
+    result = subprocess.run(command, cwd=ROOT, env={**os.environ, **environ},
+                            capture_output=True, text=True, check=True)
+    profile = {}
+    seen_flask = False
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if seen_flask:
+            profile[name.strip()] = int(cumulative)
+        seen_flask = seen_flask or name.strip() == 'flask'
+    return profile
+
+
+def test_startup_is_lazy():
+    """Test that importing the app loads neither the solver nor the job queue."""
+    profile = import_profile(WARM_UP='0')
+
+    assert 'app.routes' in profile
+    assert not [name for name in profile if name.startswith(LAZY_MODULES)]
+    assert profile['sudokuapi'] / 1e6 < STARTUP_BUDGET
+
+
+def test_startup_warm_up():
+    """Test that WARM_UP imports the views at startup."""
+    profile = import_profile(WARM_UP='1')
+
+    assert 'app.views' in profile
+    assert 'app.solver.geometry' in profile
@@ -0,0 +1,120 @@
+import pytest
+from flask import json
+from app import app, views
+from app.cache import SolutionCache
+from app.codec import parse
+from app.solver.canonical import canonical_form
+from app.store import PACKED, LazyStore, SolutionStore, StoreUnavailable, merge, open_store, \
+    pack, unpack
+from app.utils import solve_payload
+from sudokustore import build
+from tests.test_cache import PUZZLE, SOLUTION, transform
+
+
+def not_called(submitted, engine):
+    """Solver which must not be reached."""
+    raise AssertionError(f"Solver called for {submitted} with {engine}.")
+
+
+def build_store(path, lines) -> SolutionStore:
+    """Build a store from puzzle lines like the builder command and open it."""
+    build(path, lines, workers=1)
+    return SolutionStore(path)
+
+
+def test_pack():
+    """Test that 9x9 boards pack into 41 bytes and back."""
+    cells = list(parse(SOLUTION)[0])
+    assert len(pack(cells)) == PACKED == 41
+    assert unpack(pack(cells)) == cells
+
+
+def test_store_lookup(tmp_path):
+    """Test for solutions looked up in the store in canonical form."""
+    other = "036000050000064708000008039100000000000783501003010046280001005000009000410002307"
+    lines = ["# Comment", PUZZLE, other, PUZZLE[:80], ""]
+    store = build_store(str(tmp_path / "solutions.bin"), lines)
+    assert store.count == 2
+
+    form, _ = canonical_form(list(parse(PUZZLE)[0]), 9, 3)
+    solution = store.get(form)
+    assert solution is not None
+    assert all(value == cell for value, cell in zip(solution, form) if cell)
+    assert store.get([0] * 81) is None
+    assert store.stats()["hits"] == 1 and store.stats()["misses"] == 1
+    puzzles = [puzzle for puzzle, _ in store.records()]
+    assert puzzles == sorted(puzzles)
+
+
+def test_store_merge(tmp_path):
+    """Test for new puzzles merged into an existing store in key order."""
+    path = str(tmp_path / "solutions.bin")
+    other = "036000050000064708000008039100000000000783501003010046280001005000009000410002307"
+    build(path, [PUZZLE, "# Comment"], workers=1)
+    outcomes = build(path, [other, transform(PUZZLE), PUZZLE[:80]], workers=1, merge_store=True)
+    assert outcomes == {"stored": 2, "skipped": 1, "unsolvable": 0, "total": 2}
+
+    store = SolutionStore(path)
+    records = list(store.packed())
+    assert records == sorted(records)
+    assert [pack(puzzle) for puzzle, _ in store.records()] == [key for key, _ in records]
+    assert build(path, [], merge_store=True)["total"] == 2
+
+
+def test_store_runs(tmp_path):
+    """Test for records sorted in runs of one record each and merged without repeats."""
+    path = str(tmp_path / "solutions.bin")
+    records = [(bytes([key]) * PACKED, bytes([value]) * PACKED)
+               for key, value in [(3, 1), (1, 2), (3, 3), (2, 4)]]
+    assert merge(path, records, run=1) == 3
+
+    store = SolutionStore(path)
+    assert [(puzzle[0], solution[0]) for puzzle, solution in store.packed()] == \
+        [(1, 2), (2, 4), (3, 1)]
+
+
+def test_cache_store(tmp_path):
+    """Test that cache misses are served from the store without solving."""
+    cache = SolutionCache(8, store=build_store(str(tmp_path / "solutions.bin"), [PUZZLE]))
+
+    response, status = cache.solve(transform(PUZZLE), "dlx", not_called)
+    assert status == 200
+    assert response["solved"] == transform(SOLUTION)
+    assert cache.solve(PUZZLE, "backtracking", not_called)[0]["solved"] == SOLUTION
+    assert cache.stats()["store"]["hits"] == 2
+
+    with pytest.raises(AssertionError):
+        cache.solve(PUZZLE.replace('8', '0', 1), "dlx", not_called)
+    assert cache.solve(PUZZLE.replace('8', '0', 1), "dlx", solve_payload)[1] == 200
+
+
+def test_open_store(tmp_path):
+    """Test that a missing store is disabled and an invalid one is rejected."""
+    assert open_store(None) is None
+    assert open_store(str(tmp_path / "missing.bin")) is None
+    (tmp_path / "invalid.bin").write_bytes(b"not a store at all")
+    with pytest.raises(ValueError):
+        open_store(str(tmp_path / "invalid.bin"))
+
+
+def test_lazy_store(tmp_path, monkeypatch):
+    """Test that an invalid store only fails the views looking solutions up, with 503."""
+    path = tmp_path / "solutions.bin"
+    store = LazyStore(str(path))
+    assert store.get([0] * 81) is None
+    path.write_bytes(b"not a store at all")
+    with pytest.raises(StoreUnavailable):
+        store.get([0] * 81)
+
+    monkeypatch.setattr(views, "solution_cache", SolutionCache(8, store=store))
+    with app.app_context():
+        response = app.test_client().post('/v1/solve', json={"payload": PUZZLE})
+        assert response.status_code == 503
+        assert json.loads(response.get_data(as_text=True))["error"] == \
+            "Solution store unavailable."
+        assert app.test_client().get('/v1/cache').status_code == 503
+        assert app.test_client().post('/v1/check', json={"payload": PUZZLE}).status_code == 200
+
+        build(str(path), [PUZZLE], workers=1)
+        response = app.test_client().post('/v1/solve', json={"payload": PUZZLE})
+        assert response.status_code == 200
@@ -0,0 +1,25 @@
+from flask import json
+from app import app
+
+app.testing = True
+
+
+def test_solve_stream_ok():
+    """Test for /v1/solve/stream endpoint."""
+    with app.app_context():
+        puzzles = (
+            "900000000060000000027008000000000307890300000301020580000100800080075602010600009\n"
+            "\n"
+            "9000000000600000000270080000000003078903000003010205800001008000800756020009\n"
+            )
+        response = app.test_client().post('/v1/solve/stream?engine=dlx', data=puzzles,
+                                          content_type='text/plain')
+        results = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        assert len(results) == 2
+        assert results[0]["solved"] == \
+            "938764125564291738127538964245816397896357241371429586659142873483975612712683459"
+        assert results[0]["status"] == 200
+        assert results[1]["status"] == 400